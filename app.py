@@ -1,23 +1,114 @@
-from flask import Flask
-from scraper import pipeline
-from typing import Dict
+from flask import Flask, Response, request
+import gzip
+import hashlib
+import json
+import logging
+import os
+from scraper import bay_area_counties, pipeline
+from threading import Lock, Thread
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# How often (in seconds) to re-download the data behind `/scrape`.
+REFRESH_INTERVAL = float(os.getenv('SCRAPE_REFRESH_INTERVAL', 60 * 60))
+
+
+class SnapshotData(NamedTuple):
+    body: bytes
+    gzipped_body: bytes
+    etag: str
+    updated_at: float
+
+
+class Snapshot:
+    """
+    Holds the latest result of a slow function (like ``scraper.pipeline``),
+    encoded and ready to send, and refreshes it in a background thread every
+    ``interval`` seconds. If a refresh fails, the previous result is kept.
+
+    Only one refresh runs at a time: if several requests need data before the
+    first load has finished, they all wait for the same load instead of
+    starting their own.
+    """
+    def __init__(self, load: Callable[[], Dict], interval: float):
+        self.load = load
+        self.interval = interval
+        self.data: Optional[SnapshotData] = None
+        self._refresh_lock = Lock()
+        self._start_lock = Lock()
+        self._worker: Optional[Thread] = None
+
+    def refresh(self, max_age: float = 0) -> None:
+        """
+        Load fresh data, unless the current data is less than ``max_age``
+        seconds old.
+        """
+        if self._refresh_lock.acquire(blocking=False):
+            try:
+                if self.data and time.time() - self.data.updated_at < max_age:
+                    return
+
+                body = json.dumps(self.load()).encode('utf-8')
+                self.data = SnapshotData(body=body,
+                                         gzipped_body=gzip.compress(body),
+                                         etag=hashlib.sha1(body).hexdigest(),
+                                         updated_at=time.time())
+            finally:
+                self._refresh_lock.release()
+        else:
+            # Another thread is already refreshing; wait for it to finish.
+            with self._refresh_lock:
+                pass
+
+    def start(self) -> None:
+        "Start refreshing in the background (if not already started)."
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = Thread(target=self._refresh_periodically,
+                                      name='Snapshot refresh',
+                                      daemon=True)
+                self._worker.start()
+
+    def get(self) -> SnapshotData:
+        "Get the latest data, loading it now if there isn't any yet."
+        self.start()
+        if self.data is None:
+            self.refresh(max_age=float('inf'))
+        if self.data is None:
+            raise RuntimeError('Snapshot could not be loaded')
+        return self.data
+
+    def _refresh_periodically(self) -> None:
+        while True:
+            try:
+                self.refresh(max_age=self.interval)
+            except Exception:
+                logger.exception('Failed to refresh snapshot')
+            time.sleep(min(self.interval, 60))
+
+
+snapshot = Snapshot(lambda: pipeline(bay_area_counties), REFRESH_INTERVAL)
 
 app = Flask(__name__)
 
 @app.route('/scrape')
-def scrape() -> Dict[str, Dict]:
-    bay_area_counties = [
-        'Solano County, California, United States',
-        'Alameda County, California, United States',
-        'Santa Clara County, California, United States',
-        'San Francisco County, California, United States',
-        'Contra Costa County, California, United States',
-        'San Mateo County, California, United States',
-        'Sonoma County, California, United States',
-        'Napa County, California, United States',
-        'Marin County, California, United States'
-    ]
-    return pipeline(bay_area_counties);
+def scrape() -> Response:
+    data = snapshot.get()
+
+    response = Response(mimetype='application/json')
+    response.set_etag(data.etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    if data.etag in request.if_none_match:
+        response.status_code = 304
+    elif request.accept_encodings['gzip']:
+        response.set_data(data.gzipped_body)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response.set_data(data.body)
+
+    return response
 
 if __name__ == '__main__':
     app.run()
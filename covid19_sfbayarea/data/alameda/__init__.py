@@ -18,6 +18,7 @@ from .time_series_cases import TimeSeriesCases
 from .time_series_deaths import TimeSeriesDeaths
 from .time_series_tests import TimeSeriesTests
 
+from ..power_bi import PowerBiBatch
 from ..utils import get_data_model
 
 LANDING_PAGE = 'https://covid-19.acgov.org/data.page'
@@ -28,6 +29,27 @@ def get_county() -> Dict:
     return out
 
 def fetch_data() -> Dict:
+    series: Dict[str, Any] = {
+        'cases': TimeSeriesCases(),
+        'deaths': TimeSeriesDeaths(),
+        'tests': TimeSeriesTests()
+    }
+    case_totals: Dict[str, Any] = {
+        'gender': CasesByGender(),
+        'age_group': CasesByAge(),
+        'race_eth': CasesByEthnicity()
+    }
+    death_totals: Dict[str, Any] = {
+        'gender': DeathsByGender(),
+        'age_group': DeathsByAge(),
+        'race_eth': DeathsByEthnicity()
+    }
+    # Send all the queries together in as few requests as possible.
+    batch = PowerBiBatch()
+    for querier in [*series.values(), *case_totals.values(), *death_totals.values()]:
+        batch.add(*querier.queriers)
+    batch.fetch()
+
     data : Dict = {
         'name': 'Alameda County',
         'source_url': LANDING_PAGE,
@@ -40,21 +62,12 @@ def fetch_data() -> Dict:
             The test cases are on a rolling seven-day average and do not represent the
             exact number of cases on any given day.
         """,
-        'series': {
-            'cases': TimeSeriesCases().get_data(),
-            'deaths': TimeSeriesDeaths().get_data(),
-            'tests': TimeSeriesTests().get_data()
-        },
-        'case_totals': {
-            'gender': CasesByGender().get_data(),
-            'age_group': CasesByAge().get_data(),
-            'race_eth': CasesByEthnicity().get_data()
-        },
-        'death_totals': {
-            'gender': DeathsByGender().get_data(),
-            'age_group': DeathsByAge().get_data(),
-            'race_eth': DeathsByEthnicity().get_data()
-        }
+        'series': {key: querier.get_data()
+                   for key, querier in series.items()},
+        'case_totals': {key: querier.get_data()
+                        for key, querier in case_totals.items()},
+        'death_totals': {key: querier.get_data()
+                         for key, querier in death_totals.items()}
     }
     last_updated = most_recent_case_time(data)
     data.update({ 'update_time': last_updated.isoformat() })
@@ -2,7 +2,7 @@ import json
 from typing import Any, Dict, List
 from .power_bi_querier import PowerBiQuerier
 from covid19_sfbayarea.utils import dig
-from requests import get
+from ..power_bi import get_session
 
 class Meta():
     def get_data(self) -> str:
@@ -11,7 +11,7 @@ class Meta():
             PowerBiQuerier.DEFAULT_POWERBI_RESOURCE_KEY,
             '/modelsAndExploration?preferReadOnlySession=true'
         ])
-        response = get(url, headers = { 'X-PowerBI-ResourceKey': PowerBiQuerier.DEFAULT_POWERBI_RESOURCE_KEY })
+        response = get_session().get(url, headers = { 'X-PowerBI-ResourceKey': PowerBiQuerier.DEFAULT_POWERBI_RESOURCE_KEY })
         return self._extract_meta(response.json())[2:] # First two characters are ': '
 
     def _extract_meta(self, response_json: Dict[str, Any]) -> str:
@@ -1,12 +1,17 @@
-from datetime import datetime
 from typing import Any, Dict, List
 from .time_series_tests_total import TimeSeriesTestsTotal
 from .time_series_tests_percent import TimeSeriesTestsPercent
+from ...utils import timestamp_to_date
 
 class TimeSeriesTests():
+    def __init__(self) -> None:
+        self.total = TimeSeriesTestsTotal()
+        self.percent = TimeSeriesTestsPercent()
+        self.queriers = [self.total, self.percent]
+
     def get_data(self) -> List[Dict[str, Any]]:
-        total_tests = dict(TimeSeriesTestsTotal().get_data()[1:])
-        percent_positive_tests = dict(TimeSeriesTestsPercent().get_data()[1:])
+        total_tests = dict(self.total.get_data()[1:])
+        percent_positive_tests = dict(self.percent.get_data()[1:])
         self._assert_total_and_percent_cases_count_matches(total_tests, percent_positive_tests)
 
         return [{
@@ -27,7 +32,7 @@ class TimeSeriesTests():
         return { 'positive': positive_tests, 'negative': negative_tests }
 
     def _timestamp_to_date(self, timestamp_in_milliseconds: int) -> str:
-        return datetime.utcfromtimestamp(timestamp_in_milliseconds / 1000).strftime('%Y-%m-%d')
+        return timestamp_to_date(timestamp_in_milliseconds)
 
     def _assert_total_and_percent_cases_count_matches(self, daily_cases: Dict[int, int], cumulative_cases: Dict[int, int]) -> None:
         if daily_cases.keys() != cumulative_cases.keys():
@@ -1,7 +1,34 @@
-import requests
-from typing import Any, Dict, Generator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import json
+from typing import Any, Dict, Generator, List, Mapping, TypeVar
 from urllib.parse import urljoin
 from ..errors import BadRequest
+from .arcgis_pbf import decode_feature_collection
+from .cache import cached_session
+
+
+K = TypeVar('K')
+
+
+def statistic(statistic_type: str, field: str, name: str) -> Dict[str, str]:
+    """
+    Create a statistic definition for the ``outStatistics`` parameter of
+    ``ArcGisFeatureServer.query()``.
+
+    Parameters
+    ----------
+    statistic_type : str
+        The kind of statistic: ``'count'``, ``'sum'``, ``'min'``, ``'max'``,
+        ``'avg'``, ``'stddev'``, or ``'var'``.
+    field : str
+        The field to calculate the statistic on.
+    name : str
+        The name of the field the statistic will be returned in.
+    """
+    return {'statisticType': statistic_type,
+            'onStatisticField': field,
+            'outStatisticFieldName': name}
 
 
 class ArcGisFeatureServer:
@@ -15,16 +42,89 @@ class ArcGisFeatureServer:
     base_url : str
         The base URL of the server, including the "Unique Service ID". Example:
         ``'https://services1.arcgis.com/Ko5rxt00spOfjMqj'``
+    cache_ttl : int, optional
+        Number of seconds to treat cached responses as fresh. See
+        ``cache.cached_session`` for details.
+    source : str, optional
+        Name of the data source, used to look up ``cache_ttl`` if it isn't
+        set. See ``cache.SOURCE_TTLS``.
+    use_pbf : bool, optional
+        Request results in ArcGIS's compact Protocol Buffer format instead of
+        JSON. Results are decoded to the same dicts either way. Defaults to
+        ``False``.
+
+    Examples
+    --------
+    Run several queries at the same time:
+    >>> api = ArcGisFeatureServer('https://services1.arcgis.com/Ko5rxt00spOfjMqj')
+    >>> results = api.query_many({
+    >>>     'gender': {'service': 'CaseDataDemographics',
+    >>>                'outFields': 'Sex,COUNT(*) AS count',
+    >>>                'groupByFieldsForStatistics': 'Sex'},
+    >>>     'age': {'service': 'CaseDataDemographics',
+    >>>             'outFields': 'AgeGroup,COUNT(*) AS count',
+    >>>             'groupByFieldsForStatistics': 'AgeGroup'},
+    >>> })
+    >>> results['gender']
+
+    Count cases by sex with a statistics query:
+    >>> api.query('CaseDataDemographics',
+    >>>           outStatistics=[statistic('count', 'ObjectId', 'count')],
+    >>>           groupByFieldsForStatistics='Sex')
     """
-    def __init__(self, base_url: str):
+    # Maximum number of queries to run at once in ``query_many()``.
+    DEFAULT_WORKERS = 6
+
+    def __init__(self, base_url: str, cache_ttl: int = None,
+                 use_pbf: bool = False, source: str = None):
+        # The session keeps connections open, so allow enough of them for
+        # every thread that might be making a query at once.
+        self.session = cached_session(cache_ttl,
+                                      pool_size=2 * self.DEFAULT_WORKERS,
+                                      source=source)
         if not base_url.endswith('/'):
             base_url += '/'
         self.base_url = base_url
         self.service_base_url = urljoin(base_url, 'ArcGIS/rest/services/')
+        self.use_pbf = use_pbf
+
+    def _build_layer_url(self, service: str, table_id: int) -> str:
+        return urljoin(self.service_base_url, f'{service}/FeatureServer/{table_id}')
 
     def _build_query_url(self, service: str, table_id: int) -> str:
-        query_path = f'{service}/FeatureServer/{table_id}/query'
-        return urljoin(self.service_base_url, query_path)
+        return f'{self._build_layer_url(service, table_id)}/query'
+
+    def _get(self, url: str, params: Dict) -> Dict:
+        response = self.session.get(url, params=params)
+        # Errors are always sent as JSON, even if PBF was requested.
+        if 'json' in response.headers.get('Content-Type', 'json'):
+            data = response.json()
+        else:
+            data = decode_feature_collection(response.content)
+
+        if 'error' in data:
+            message = data['error']['message']
+            if 'details' in data['error']:
+                details = ' '.join(data['error']['details'])
+                message = f'{message} ({details})'
+            raise BadRequest(message, response=response)
+
+        return data
+
+    @lru_cache(maxsize=32)
+    def layer_info(self, service: str, table_id: int = 0) -> Dict:
+        """
+        Get information about a table/layer, e.g. its fields and the name of
+        its ``objectIdField``.
+        """
+        return self._get(self._build_layer_url(service, table_id), {'f': 'json'})
+
+    def object_id_field(self, service: str, table_id: int = 0) -> str:
+        """
+        Get the name of the field that uniquely identifies each row in a
+        table/layer. Count this field to count rows in a statistics query.
+        """
+        return self.layer_info(service, table_id)['objectIdField']
 
     def query(
         self,
@@ -33,6 +133,7 @@ class ArcGisFeatureServer:
         *,  # Parameters below must be specified as keywords. -----------------
         where: str = '1=1',
         outFields: str = None,
+        outStatistics: List[Dict[str, str]] = None,
         groupByFieldsForStatistics: str = None,
         orderByFields: str = None,
         **params: Any
@@ -60,6 +161,10 @@ class ArcGisFeatureServer:
             sequential and start from 0.
         where : str
         outFields : str
+        outStatistics : list of dict
+            Statistics to calculate, e.g. ``[statistic('count', 'ObjectId',
+            'count')]``. Use with ``groupByFieldsForStatistics`` to calculate
+            them for each group.
         groupByFieldsForStatistics : str
         orderByFields : str
         **params
@@ -77,24 +182,17 @@ class ArcGisFeatureServer:
         url = self._build_query_url(service, table_id)
         next_params = params.copy()
         next_params.update({
-            'f': 'json',
+            'f': 'pbf' if self.use_pbf else 'json',
             'returnGeometry': False,
             'where': where,
             'outFields': outFields,
+            'outStatistics': json.dumps(outStatistics) if outStatistics else None,
             'groupByFieldsForStatistics': groupByFieldsForStatistics,
             'orderByFields': orderByFields
         })
 
         while True:
-            response = requests.get(url, params=next_params)
-            data = response.json()
-            if 'error' in data:
-                message = data['error']['message']
-                if 'details' in data['error']:
-                    details = ' '.join(data['error']['details'])
-                    message = f'{message} ({details})'
-                raise BadRequest(message, response=response)
-
+            data = self._get(url, next_params)
             for feature in data['features']:
                 yield feature['attributes']
 
@@ -103,3 +201,25 @@ class ArcGisFeatureServer:
 
             offset = next_params.get('resultOffset', 0) + len(data['features'])
             next_params['resultOffset'] = offset
+
+    def query_many(self, queries: Mapping[K, Dict[str, Any]]) -> Dict[K, List[Dict]]:
+        """
+        Run several queries at the same time and return all their results.
+
+        Parameters
+        ----------
+        queries : dict
+            The queries to run. Each value is a dict of keyword arguments for
+            ``query()``, including ``service``.
+
+        Returns
+        -------
+        dict
+            A list of the records from each query, with the same keys as
+            ``queries``.
+        """
+        with ThreadPoolExecutor(max_workers=self.DEFAULT_WORKERS) as executor:
+            futures = {key: executor.submit(lambda kwargs: list(self.query(**kwargs)),
+                                            query)
+                       for key, query in queries.items()}
+            return {key: future.result() for key, future in futures.items()}
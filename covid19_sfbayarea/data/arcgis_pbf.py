@@ -0,0 +1,161 @@
+"""
+Decode ArcGIS FeatureServer query results in the Protocol Buffer format
+(``f=pbf``), which is much smaller and quicker to parse than JSON.
+
+This only decodes the parts we use -- field names and attribute values -- and
+skips everything else (e.g. geometry). The message structure is defined in
+Esri's ``FeatureCollection.proto``:
+https://github.com/Esri/arcgis-pbf/tree/main/proto/FeatureCollection
+
+Rather than depending on the ``protobuf`` package and generated code, this
+reads the Protocol Buffer wire format directly; see:
+https://developers.google.com/protocol-buffers/docs/encoding
+"""
+
+import struct
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+# Wire types
+VARINT = 0
+FIXED64 = 1
+LENGTH_DELIMITED = 2
+FIXED32 = 5
+
+# Field numbers in `FeatureCollectionPBuffer`
+COLLECTION_QUERY_RESULT = 2
+# ...in `QueryResult`
+QUERY_RESULT_FEATURE_RESULT = 1
+# ...in `FeatureResult`
+FEATURE_RESULT_EXCEEDED_TRANSFER_LIMIT = 9
+FEATURE_RESULT_FIELDS = 13
+FEATURE_RESULT_FEATURES = 15
+# ...in `Field`
+FIELD_NAME = 1
+# ...in `Feature`
+FEATURE_ATTRIBUTES = 1
+
+# Field numbers in `Value`, and how to decode each one.
+VALUE_STRING = 1
+VALUE_FLOAT = 2
+VALUE_DOUBLE = 3
+VALUE_SINT = 4
+VALUE_UINT = 5
+VALUE_INT64 = 6
+VALUE_UINT64 = 7
+VALUE_SINT64 = 8
+VALUE_BOOL = 9
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, position
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _read_fields(data: bytes) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Yield the field number, wire type, and raw value of each field in a
+    message. Length-delimited values are yielded as bytes.
+    """
+    position = 0
+    while position < len(data):
+        key, position = _read_varint(data, position)
+        number, wire_type = key >> 3, key & 0x07
+        value: Any
+        if wire_type == VARINT:
+            value, position = _read_varint(data, position)
+        elif wire_type == FIXED64:
+            value = data[position:position + 8]
+            position += 8
+        elif wire_type == LENGTH_DELIMITED:
+            length, position = _read_varint(data, position)
+            value = data[position:position + length]
+            position += length
+        elif wire_type == FIXED32:
+            value = data[position:position + 4]
+            position += 4
+        else:
+            raise ValueError(f'Unsupported protocol buffer wire type: {wire_type}')
+
+        yield number, wire_type, value
+
+
+def _decode_value(data: bytes) -> Any:
+    for number, _, value in _read_fields(data):
+        if number == VALUE_STRING:
+            return value.decode('utf-8')
+        elif number == VALUE_FLOAT:
+            return struct.unpack('<f', value)[0]
+        elif number == VALUE_DOUBLE:
+            return struct.unpack('<d', value)[0]
+        elif number in (VALUE_SINT, VALUE_SINT64):
+            return _zigzag(value)
+        elif number in (VALUE_UINT, VALUE_UINT64):
+            return value
+        elif number == VALUE_INT64:
+            # Negative int64 values are encoded as 64-bit two's complement.
+            return value - (1 << 64) if value >= (1 << 63) else value
+        elif number == VALUE_BOOL:
+            return bool(value)
+
+    # A value with nothing set is null.
+    return None
+
+
+def _decode_feature_result(data: bytes) -> Dict:
+    field_names: List[str] = []
+    features: List[bytes] = []
+    exceeded_transfer_limit = False
+    for number, _, value in _read_fields(data):
+        if number == FEATURE_RESULT_FIELDS:
+            name = next((field_value.decode('utf-8')
+                         for field_number, _, field_value in _read_fields(value)
+                         if field_number == FIELD_NAME), '')
+            field_names.append(name)
+        elif number == FEATURE_RESULT_FEATURES:
+            features.append(value)
+        elif number == FEATURE_RESULT_EXCEEDED_TRANSFER_LIMIT:
+            exceeded_transfer_limit = bool(value)
+
+    decoded_features = []
+    for feature in features:
+        values = [_decode_value(value)
+                  for number, _, value in _read_fields(feature)
+                  if number == FEATURE_ATTRIBUTES]
+        decoded_features.append({'attributes': dict(zip(field_names, values))})
+
+    return {
+        'features': decoded_features,
+        'exceededTransferLimit': exceeded_transfer_limit,
+    }
+
+
+def decode_feature_collection(data: bytes) -> Dict:
+    """
+    Decode a PBF query result into the same structure as a JSON query result
+    (just the ``features`` and ``exceededTransferLimit`` keys, and just the
+    ``attributes`` of each feature).
+
+    Parameters
+    ----------
+    data : bytes
+        The body of a query response with ``f=pbf``.
+    """
+    for number, _, query_result in _read_fields(data):
+        if number == COLLECTION_QUERY_RESULT:
+            for result_number, _, result in _read_fields(query_result):
+                if result_number == QUERY_RESULT_FEATURE_RESULT:
+                    return _decode_feature_result(result)
+
+    return {'features': [], 'exceededTransferLimit': False}
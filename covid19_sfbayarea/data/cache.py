@@ -0,0 +1,249 @@
+"""
+A persistent HTTP cache shared by all the data clients.
+
+Responses are stored in a SQLite database on disk, so they survive between
+runs of the scrapers. When a cached response is stale, CacheControl revalidates
+it with the server using the response's ``ETag`` or ``Last-Modified`` headers,
+so unchanged datasets don't get downloaded again.
+
+Set the ``HTTP_CACHE_DIR`` environment variable to choose where the cache is
+stored. Set it to an empty string to only cache in memory (the cache is then
+thrown away when the process exits).
+
+Each data source can treat its cached responses as fresh for a different
+amount of time (see ``SOURCE_TTLS``). Override a source's TTL with an
+``HTTP_CACHE_TTL_<SOURCE>`` environment variable, e.g. ``HTTP_CACHE_TTL_NAPA``,
+set to a number of seconds (or ``0`` to always follow the server's caching
+headers).
+"""
+
+from cachecontrol.adapter import CacheControlAdapter  # type: ignore
+from cachecontrol.cache import BaseCache, DictCache  # type: ignore
+from cachecontrol.heuristics import ExpiresAfter  # type: ignore
+from datetime import datetime
+from functools import lru_cache
+import logging
+import os
+from pathlib import Path
+import requests
+import sqlite3
+from threading import Lock
+import time
+from typing import Dict, Optional, Union
+from urllib3.util.retry import Retry
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'covid19_sfbayarea'
+
+# How many seconds each source's responses are treated as fresh, regardless of
+# the caching headers the server sent. After that, they are revalidated with
+# the server or downloaded again. The scrapers run hourly and counties update
+# at most a few times a day, so these are all less than an hour: scheduled runs
+# always check for new data, but running a scraper several times in a row
+# (e.g. while developing) doesn't hit the server every time. ``None`` means
+# only follow the server's caching headers.
+SOURCE_TTLS: Dict[str, Optional[int]] = {
+    # CDPH updates the hospital data once a day and it is slow to download.
+    'hospitals': 30 * 60,
+    'marin': 10 * 60,
+    'napa': 10 * 60,
+    # Power BI data is fetched with POST requests, which are never cached.
+    'power_bi': None,
+    'san_francisco': 10 * 60,
+    'san_mateo': 10 * 60,
+    'santa_clara': 10 * 60,
+    'solano': 10 * 60,
+    'sonoma': 10 * 60,
+}
+
+
+def source_ttl(source: str) -> Optional[int]:
+    """
+    Get the number of seconds to treat a source's cached responses as fresh:
+    the ``HTTP_CACHE_TTL_<SOURCE>`` environment variable if it is set,
+    otherwise the source's entry in ``SOURCE_TTLS``.
+    """
+    override = os.getenv(f'HTTP_CACHE_TTL_{source.upper()}')
+    if override:
+        return int(override) or None
+
+    return SOURCE_TTLS.get(source)
+
+
+class SqliteCache(BaseCache):  # type: ignore
+    """
+    A CacheControl cache backed by a SQLite database. It is safe to use from
+    multiple threads and from multiple processes at once.
+
+    Old entries are pruned (see ``prune()``) when the database is opened, so
+    it doesn't grow forever. Expired entries are still returned until they are
+    pruned: CacheControl decides for itself whether a response is fresh, and
+    can revalidate an expired one with the server (using its ``ETag`` or
+    ``Last-Modified`` header) instead of downloading it again.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path to the database file. It will be created if it does not exist.
+    max_entries : int, optional
+        The most responses to keep. When there are more, the least recently
+        stored ones are removed.
+    keep_expired : int, optional
+        How many seconds to keep responses after they expire, so they can
+        still be revalidated. Defaults to a week.
+    """
+    # Most rows to delete each time the cache is pruned, so opening a cache
+    # that has gotten very large doesn't stall a scraper.
+    PRUNE_BATCH_SIZE = 1000
+
+    def __init__(self, path: Union[str, Path], max_entries: int = 5000,
+                 keep_expired: int = 7 * 24 * 60 * 60):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.keep_expired = keep_expired
+        self._lock = Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connect lazily so that merely creating a client doesn't touch disk.
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.path),
+                                               timeout=30,
+                                               check_same_thread=False)
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses '
+                '(key TEXT PRIMARY KEY, value BLOB, expires REAL)'
+            )
+            self._connection.commit()
+            self._prune(self._connection)
+        return self._connection
+
+    def prune(self) -> int:
+        """
+        Remove responses that expired more than ``keep_expired`` seconds ago
+        and, if there are more than ``max_entries``, the least recently stored
+        ones. At most ``PRUNE_BATCH_SIZE`` rows are
+        removed per call. Returns the number of rows removed.
+        """
+        with self._lock:
+            return self._prune(self._connect())
+
+    def _prune(self, connection: sqlite3.Connection) -> int:
+        removed = connection.execute(
+            'DELETE FROM responses WHERE rowid IN '
+            '(SELECT rowid FROM responses WHERE expires < ? LIMIT ?)',
+            (time.time() - self.keep_expired, self.PRUNE_BATCH_SIZE)
+        ).rowcount
+
+        # `INSERT OR REPLACE` gives a replaced row a new rowid, so the lowest
+        # rowids are the least recently stored.
+        count = connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        excess = min(count - self.max_entries, self.PRUNE_BATCH_SIZE - removed)
+        if excess > 0:
+            removed += connection.execute(
+                'DELETE FROM responses WHERE rowid IN '
+                '(SELECT rowid FROM responses ORDER BY rowid LIMIT ?)',
+                (excess,)
+            ).rowcount
+
+        connection.commit()
+        if removed:
+            logger.info(f'Pruned {removed} responses from {self.path}')
+        return removed
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT value FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes,
+            expires: Union[int, datetime, None] = None) -> None:
+        # CacheControl passes `expires` as seconds from now or as a datetime.
+        expires_at: Optional[float] = None
+        if isinstance(expires, datetime):
+            expires_at = expires.timestamp()
+        elif expires is not None:
+            expires_at = time.time() + expires
+
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                'INSERT OR REPLACE INTO responses (key, value, expires) '
+                'VALUES (?, ?, ?)',
+                (key, value, expires_at)
+            )
+            connection.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute('DELETE FROM responses WHERE key = ?', (key,))
+            connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+@lru_cache(maxsize=None)
+def get_cache() -> BaseCache:
+    """
+    Get the cache that all data clients share. This is persisted on disk in
+    ``HTTP_CACHE_DIR`` unless that environment variable is set to an empty
+    string.
+    """
+    directory = os.getenv('HTTP_CACHE_DIR', str(DEFAULT_CACHE_DIR))
+    if not directory:
+        logger.info('HTTP_CACHE_DIR is empty; caching responses in memory')
+        return DictCache()
+
+    return SqliteCache(Path(directory) / 'http_cache.sqlite')
+
+
+def cached_session(ttl: Optional[int] = None,
+                   retries: Union[int, Retry] = 0,
+                   session: requests.Session = None,
+                   pool_size: int = 10,
+                   source: str = None) -> requests.Session:
+    """
+    Create a requests session whose GET responses are stored in the shared
+    cache.
+
+    Parameters
+    ----------
+    ttl : int, optional
+        How many seconds to treat responses as fresh, regardless of what
+        caching headers the server sent. After that, responses are revalidated
+        with the server (if it sent an ``ETag`` or ``Last-Modified`` header) or
+        downloaded again. If not set, the TTL for ``source`` is used, or if
+        that isn't set either, the server's own caching headers are followed.
+    retries : int or urllib3.util.retry.Retry, optional
+        How to retry failed requests. Defaults to no retries.
+    session : requests.Session, optional
+        The session to add caching to. If not set, a new one is created.
+    pool_size : int, optional
+        How many connections to keep open to each host. Set this to at least
+        the number of threads that will use the session at once.
+    source : str, optional
+        Name of the data source (a key in ``SOURCE_TTLS``, e.g. ``'napa'``)
+        the session is for. Used to look up the TTL if ``ttl`` is not set.
+    """
+    if ttl is None and source:
+        ttl = source_ttl(source)
+
+    session = session or requests.Session()
+    heuristic = ExpiresAfter(seconds=ttl) if ttl else None
+    adapter = CacheControlAdapter(cache=get_cache(),
+                                  heuristic=heuristic,
+                                  max_retries=retries,
+                                  pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
@@ -1,10 +1,11 @@
-from cachecontrol import CacheControl  # type: ignore
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 import json
 import logging
-import requests
-from typing import Dict, Any, Generator, Optional
+from typing import Deque, Dict, Any, Generator, Iterator, List, Optional
 from urllib.parse import urljoin
 from ..errors import BadRequest
+from .cache import cached_session
 
 
 logger = logging.getLogger(__name__)
@@ -13,14 +14,30 @@ logger = logging.getLogger(__name__)
 class Ckan:
     """
     Handle access to datasets in a CKAN repository.
+
+    Parameters
+    ----------
+    base_url : str
+        The base URL of the CKAN server, e.g. ``'https://data.chhs.ca.gov'``.
+    cache_ttl : int, optional
+        Number of seconds to treat cached responses as fresh. See
+        ``cache.cached_session`` for details.
+    source : str, optional
+        Name of the data source, used to look up ``cache_ttl`` if it isn't
+        set. See ``cache.SOURCE_TTLS``.
     """
-    def __init__(self, base_url: str):
-        self.session = CacheControl(requests.Session())
+    # Maximum number of pages to load at once when fetching in parallel.
+    DEFAULT_WORKERS = 4
+
+    def __init__(self, base_url: str, cache_ttl: int = None,
+                 source: str = None):
+        self.session = cached_session(cache_ttl, source=source)
         self.base_url = base_url
         self.search_url = urljoin(self.base_url, '/api/3/action/datastore_search')
         self.metadata_url = urljoin(self.base_url, '/api/3/action/resource_show')
 
-    def data(self, resource_id: str, yield_meta: bool = False, **params: Any) -> Generator[Dict, None, None]:
+    def data(self, resource_id: str, yield_meta: bool = False,
+             parallel: bool = False, **params: Any) -> Generator[Dict, None, None]:
         """
         Yield each record from a dataset.
 
@@ -31,6 +48,9 @@ class Ckan:
         yield_meta : bool
             If true, yield metadata from the dataset (e.g. field names and
             types) as the first item.
+        parallel : bool, optional
+            If true, load several pages at once after the first page. Records
+            are still yielded in order. Defaults to ``False``.
         params
             Any other data search arguments. For a full reference, see:
             https://docs.ckan.org/en/2.7/maintaining/datastore.html#ckanext.datastore.logic.action.datastore_search
@@ -41,6 +61,10 @@ class Ckan:
         if isinstance(params.get('filters'), dict):
             params['filters'] = json.dumps(params['filters'])
 
+        if parallel:
+            yield from self._data_parallel(params, yield_meta)
+            return
+
         next_url = self.search_url
         next_params: Optional[Dict] = params
 
@@ -65,10 +89,78 @@ class Ckan:
             for record in data['records']:
                 yield record
 
+            # Skip requesting an empty page after the last one.
+            if count >= total:
+                return
+
             next_url = data.get('_links', {}).get('next')
             next_url = urljoin(self.base_url, next_url)
             next_params = None
 
+    def _data_parallel(self, params: Dict, yield_meta: bool) -> Iterator[Dict]:
+        # Pages can only be loaded independently if every row has a fixed
+        # position, so always break ties in the sort order by row ID.
+        sort = params.get('sort')
+        if not sort:
+            params['sort'] = '_id'
+        elif '_id' not in sort:
+            params['sort'] = f'{sort}, _id'
+
+        data = self.request(self.search_url, params=params)
+        records = data['records']
+        if yield_meta:
+            yield {key: value for key, value in data.items() if key != 'records'}
+
+        yield from records
+        if len(records) == 0:
+            return
+
+        # The first page tells us how many records there are, so we know the
+        # offset of every other page. Servers can cap the number of records
+        # in a page (``ckan.datastore.search.rows_max``), so if there is more
+        # than one page, use the size of the page we actually got rather than
+        # the limit we asked for.
+        total = data['total']
+        start = int(params.get('offset', 0))
+        if len(records) < total - start:
+            limit = len(records)
+        else:
+            limit = int(data.get('limit') or params.get('limit') or len(records))
+        offsets = iter(range(start + limit, total, limit))
+        logger.info(f'Loading {total} results in pages of {limit} ...')
+
+        last_offset = start
+        last_page: List[Dict] = records
+        with ThreadPoolExecutor(max_workers=self.DEFAULT_WORKERS) as executor:
+            # Only keep a few pages ahead of the consumer, so we don't hold
+            # the whole dataset in memory if it is slow to read.
+            pending: Deque['Future[Dict]'] = deque()
+
+            def load_next_page() -> None:
+                offset = next(offsets, None)
+                if offset is not None:
+                    page_params = {**params, 'offset': offset, 'limit': limit}
+                    pending.append(executor.submit(self.request,
+                                                   self.search_url,
+                                                   params=page_params))
+
+            for _ in range(self.DEFAULT_WORKERS * 2):
+                load_next_page()
+
+            while pending:
+                last_page = pending.popleft().result()['records']
+                last_offset += limit
+                load_next_page()
+                yield from last_page
+
+        # If records were added after the first page was loaded, the last page
+        # will be full, so pick up the rest one page at a time.
+        while len(last_page) == limit:
+            last_offset += limit
+            page_params = {**params, 'offset': last_offset, 'limit': limit}
+            last_page = self.request(self.search_url, params=page_params)['records']
+            yield from last_page
+
     def metadata(self, resource_id: str, **params: Any) -> Dict:
         """
         Get metadata about a dataset.
@@ -46,6 +46,7 @@ Vaccines - https://www.coronavirus.cchealth.org/vaccine
 """
 
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from typing import Dict, List
 from ..errors import FormatError
@@ -102,19 +103,29 @@ def get_county() -> Dict:
         # we only get "Female" instead of "Female" + "Femenino").
         api.select_field_value('LabelLanguage', 'English')
 
+        # The Qlik client can have many requests in flight at once, so load
+        # each part of the data at the same time over the one connection.
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            update_time = executor.submit(get_latest_update, api)
+            cases = executor.submit(get_timeseries_cases, api)
+            deaths = executor.submit(get_timeseries_deaths, api)
+            tests = executor.submit(get_timeseries_tests, api)
+            case_totals = executor.submit(get_case_totals, api)
+            death_totals = executor.submit(get_death_totals, api)
+
         return {
             'name': 'Contra Costa',
-            'update_time': get_latest_update(api).isoformat(),
+            'update_time': update_time.result().isoformat(),
             'source_url': 'https://www.coronavirus.cchealth.org/overview',
             'meta_from_source': '',
             'meta_from_baypd': notes,
             'series': {
-                'cases': get_timeseries_cases(api),
-                'deaths': get_timeseries_deaths(api),
-                'tests': get_timeseries_tests(api),
+                'cases': cases.result(),
+                'deaths': deaths.result(),
+                'tests': tests.result(),
             },
-            'case_totals': get_case_totals(api),
-            'death_totals': get_death_totals(api),
+            'case_totals': case_totals.result(),
+            'death_totals': death_totals.result(),
         }
 
 
@@ -122,13 +133,13 @@ def get_latest_update(api: QlikClient) -> datetime:
     return parse_datetime(api.get_app_layout()['qLayout']['qLastReloadTime'])
 
 
-def get_chart_data(api: QlikClient, chart_id: str) -> List[List[Dict]]:
+def get_chart_data(api: QlikClient, chart_id: str, width: int = 2) -> List[List[Dict]]:
     """
     Get the underlying data for a standard chart by its Qlik object ID. This
     does *not* work for "stacked" charts, with multiple overlaid series.
+    ``width`` is the number of columns (dimensions + measures) in the chart.
     """
-    chart = api.get_data(chart_id)
-    return chart['qLayout']['qHyperCube']['qDataPages'][0]['qMatrix']
+    return list(api.get_hypercube_data(chart_id, width=width))
 
 
 def get_timeseries_cases(api: QlikClient) -> List[dict]:
@@ -173,7 +184,7 @@ def get_timeseries_cases(api: QlikClient) -> List[dict]:
 
 
 def get_timeseries_deaths(api: QlikClient) -> List[dict]:
-    data = get_chart_data(api, CHART_IDS['deaths'])
+    data = get_chart_data(api, CHART_IDS['deaths'], width=3)
 
     total = 0
     results = []
@@ -236,8 +247,8 @@ def get_timeseries_tests(api: QlikClient) -> List[dict]:
     # The data is a list of dates, where each has a `qSubNodes` list with one
     # item from each series. Those items each have their own `qSubNodes` list
     # with one item that contains the actual value.
-    positive_rate_chart = api.get_data(CHART_IDS['test_positivity'])
-    positive_rate_data = positive_rate_chart['qLayout']['qHyperCube']['qStackedDataPages'][0]['qData'][0]['qSubNodes']
+    positive_rate_data = api.get_hypercube_stack_data(CHART_IDS['test_positivity'],
+                                                      width=3)
     for node in positive_rate_data:
         day = api.parse_date(node['qValue'])
         # In the first list of subnodes:
@@ -319,7 +330,7 @@ def get_cases_by_age(api: QlikClient) -> List[Dict]:
 
 
 def get_cases_by_race(api: QlikClient, total: int) -> Dict:
-    raw = get_chart_data(api, CHART_IDS['cases_by_race'])
+    raw = get_chart_data(api, CHART_IDS['cases_by_race'], width=3)
     mapping = {
         'asian': 'Asian',
         'black or african american': 'African_Amer',
@@ -344,7 +355,7 @@ def get_cases_by_race(api: QlikClient, total: int) -> Dict:
 
 
 def get_cases_by_ethnicity(api: QlikClient, total: int) -> Dict:
-    raw = get_chart_data(api, CHART_IDS['cases_by_ethnicity'])
+    raw = get_chart_data(api, CHART_IDS['cases_by_ethnicity'], width=3)
     mapping = {
         'hispanic or latino': 'Latinx_or_Hispanic',
         'not hispanic or latino': 'Other',
@@ -4,7 +4,7 @@ import logging
 from datetime import datetime
 from dateutil import tz
 from dateutil.parser import parse
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 from covid19_sfbayarea.utils import friendly_county
 from .ckan import Ckan
@@ -19,7 +19,8 @@ from .ckan import Ckan
 HOSPITALS_LANDING_PAGE = "https://data.chhs.ca.gov/dataset/covid-19-hospital-data"
 CAGOV_BASEURL = "https://data.chhs.ca.gov"
 HOSPITALS_RESOURCE_ID = "47af979d-8685-4981-bced-96a6b79d3ed5"
-RESULTS_LIMIT = 200
+# CKAN's default maximum page size (`ckan.datastore.search.rows_max`).
+RESULTS_LIMIT = 32000
 
 # For the output data
 SERIES_NAME = "CA COVID-19 Hospitalization Data"
@@ -35,7 +36,13 @@ logger = logging.getLogger(__name__)
 
 def truncate_timestamp(timestamp: str) -> str:
     """Truncate a timestamp to an ISO 8601-formatted date"""
-    truncated_timestamp = parse(timestamp).date().isoformat()
+    try:
+        # The API's timestamps are ISO 8601, which is much faster to parse
+        # than the general formats handled by dateutil.
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        parsed = parse(timestamp)
+    truncated_timestamp = parsed.date().isoformat()
     return truncated_timestamp
 
 
@@ -105,20 +112,34 @@ def standardize_data(record: Dict) -> Dict:
     return record
 
 
-def process_data(series: List, counties: List) -> Dict:
+def iter_county_records(series: Iterable[Dict],
+                        counties: List) -> Iterator[Tuple[str, Dict]]:
+    """Yield a (county, standardized record) pair for each record in the
+    series that belongs to one of the given counties. Records are
+    standardized as they are read, so the series can be a generator."""
+    counties_by_name = {friendly_county(county): county for county in counties}
+
+    for record in series:
+        name = record.get("county")
+        if not isinstance(name, str):
+            continue
+
+        county = counties_by_name.get(name)
+        if county is not None:
+            yield county, standardize_data(record)
+
+
+def process_data(series: Iterable[Dict], counties: List) -> Dict:
     """Transform the timeseries data (a list of dicts) into a dict
     with keys for each county name, and a list of dicts with records
-    for that particular county"""
-    processed_series: Dict[str, Union[str, Any]] = {}
+    for that particular county
 
-    for county in counties:
-        county_name = friendly_county(county)
-        county_records = [
-            standardize_data(record) for record in series
-            if record.get("county") == county_name
-        ]
+    This makes a single pass over the series, standardizing each record for
+    one of the requested counties exactly once."""
+    processed_series: Dict[str, List[Dict]] = {county: [] for county in counties}
 
-        processed_series[county] = county_records
+    for county, record in iter_county_records(series, counties):
+        processed_series[county].append(record)
 
     return processed_series
 
@@ -128,8 +149,10 @@ def process_data(series: List, counties: List) -> Dict:
 # ====================
 
 
-def get_timeseries(counties: List) -> Dict:
-    """Fetch all pages of timeseries data from API endpoint"""
+def fetch_records(counties: List) -> Tuple[Dict, Iterator[Dict]]:
+    """Start fetching timeseries data from the API endpoint. Returns the
+    header data (everything except the series) and an iterator over the raw
+    records, which loads pages from the API as it is consumed."""
     timeseries_data: Dict[Any, Any] = {}
 
     now = datetime.now(tz.tzutc()).isoformat(timespec="minutes")
@@ -140,12 +163,16 @@ def get_timeseries(counties: List) -> Dict:
     timeseries_data["source_url"] = HOSPITALS_LANDING_PAGE
     timeseries_data["meta_from_baypd"] = BAYPD_META
 
-    state_api = Ckan(CAGOV_BASEURL)
+    # Only download rows for the requested counties.
+    county_names = [friendly_county(county) for county in counties]
+
+    state_api = Ckan(CAGOV_BASEURL, source='hospitals')
     data_raw = state_api.data(HOSPITALS_RESOURCE_ID,
+                              filters={"county": county_names},
                               limit=RESULTS_LIMIT,
-                              yield_meta=True)
+                              yield_meta=True,
+                              parallel=True)
     meta = next(data_raw)
-    records = list(data_raw)
 
     timeseries_data["meta_from_source"] = []
     for field in meta["fields"]:
@@ -162,6 +189,21 @@ def get_timeseries(counties: List) -> Dict:
 
         timeseries_data["meta_from_source"].append(field)
 
+    return timeseries_data, data_raw
+
+
+def stream_timeseries(counties: List) -> Tuple[Dict, Iterator[Tuple[str, Dict]]]:
+    """Fetch timeseries data without holding the whole series in memory.
+    Returns the header data and an iterator of (county, record) pairs, with
+    each record standardized as soon as its page has been downloaded."""
+    timeseries_data, records = fetch_records(counties)
+    return timeseries_data, iter_county_records(records, counties)
+
+
+def get_timeseries(counties: List) -> Dict:
+    """Fetch all pages of timeseries data from API endpoint"""
+    timeseries_data, records = fetch_records(counties)
+
     # standardize the format of the data and key it by county name
     timeseries_data["series"] = process_data(records, counties)
 
@@ -25,7 +25,7 @@ API_IDS = {
 
 def get_county() -> Dict:
     """Main method for populating county data"""
-    api = SocrataApi('https://data.marincounty.org/')
+    api = SocrataApi('https://data.marincounty.org/', source='marin')
     notes = ('This data only accounts for Marin residents and does not '
              'include inmates at San Quentin State Prison. '
              'The tests timeseries only includes the number of tests '
@@ -56,24 +56,30 @@ def get_county() -> Dict:
 
 
 def get_latest_update(api: SocrataApi) -> datetime:
-    times = [parse_datetime(api.metadata(api_id)['dataUpdatedAt'])
-             for api_id in API_IDS.values()]
+    metadata = api.metadata_many(API_IDS.values())
+    times = [parse_datetime(item['dataUpdatedAt'])
+             for item in metadata.values()]
     return max(*times)
 
 
 def get_api_cases(api: SocrataApi, disposition: str) -> Iterable[dict]:
     # https://data.marincounty.org/Public-Health/COVID-19-Case-Disposition/wg8s-i3c7
-    data = api.resource(API_IDS['cases'], params={'$order': 'test_date ASC'})
-    total = 0
-    for entry in data:
-        if entry['status'] == disposition:
-            total += 1
-            yield entry
+    # Cases and deaths are both in this dataset, so it's only downloaded once.
+    # Only get the rows and columns we need for them.
+    params = {
+        '$select': 'test_date, status, new_confirmed_cases, cumulative_case_count',
+        '$where': "status in ('Confirmed', 'Death')",
+        '$order': 'test_date ASC',
+    }
+    data = api.dataset(API_IDS['cases'], params=params, parallel=True)
+    entries = data.where('status', disposition)
 
     # Sanity-check that we filtered the `status` column on a real value.
-    if total == 0:
+    if len(entries) == 0:
         raise FormatError(f'There were no cases with `status == "{disposition}"`')
 
+    return entries
+
 
 def get_timeseries_cases(api: SocrataApi) -> List[dict]:
     return [
@@ -99,19 +105,20 @@ def get_timeseries_deaths(api: SocrataApi) -> List[dict]:
 
 def get_timeseries_tests(api: SocrataApi) -> List[dict]:
     # https://data.marincounty.org/Public-Health/Marin-County-COVID-19-Testing-Data-CDPH-/kr8c-izzb
-    data = api.resource(API_IDS['tests'], params={'$order': 'date ASC'})
+    # Percent positive tests is also available in this timeseries when:
+    #     variable == 'test_pos_nopris_7day_total_!no_lag'
+    # Unfortunately the naming and documentation implies this is the
+    # positivity rate over the past 7 days, so it's probably not accurate
+    # to calculate an absolute number of positive/negative tests from it.
+    data = api.resource(API_IDS['tests'], params={
+        '$select': 'date, value',
+        '$where': "variable = 'total_tests_nopris_!no_lag'",
+        '$order': 'date ASC',
+    })
 
     total = 0
     result = []
     for entry in data:
-        # Percent positive tests is also available in this timeseries when:
-        #     variable == 'test_pos_nopris_7day_total_!no_lag'
-        # Unfortunately the naming and documentation implies this is the
-        # positivity rate over the past 7 days, so it's probably not accurate
-        # to calculate an absolute number of positive/negative tests from it.
-        if entry['variable'] != 'total_tests_nopris_!no_lag':
-            continue
-
         # Since the same column is used for percent positive and tests, the
         # total tests comes through as a float rather than an int.
         value = float(entry['value'])
@@ -134,18 +141,27 @@ def get_timeseries_tests(api: SocrataApi) -> List[dict]:
     return result
 
 
+def demographic_category(grouping: str) -> str:
+    """
+    Get the category from a demographic grouping, e.g. ``'Gender'`` from
+    ``'Gender - Female'``.
+    """
+    return grouping.split(' - ', 1)[0] if ' - ' in grouping else ''
+
+
 def get_demographic_totals(api: SocrataApi, demographic: str) -> List[Dict]:
     # https://data.marincounty.org/Public-Health/COVID-19-Cumulative-Demographics/uu8g-ckxh
-    data = api.resource(API_IDS['demographics'])
-    prefix = f'{demographic} - '
-    prefix_length = len(prefix)
+    # All six breakdowns (3 demographics for cases and deaths) come from this
+    # dataset, so it's only downloaded once.
+    data = api.dataset(API_IDS['demographics'],
+                       params={'$select': 'grouping, cumulative, deaths'})
+    prefix_length = len(f'{demographic} - ')
 
     result = []
-    for entry in data:
-        if entry['grouping'].startswith(prefix):
-            entry = entry.copy()
-            entry['grouping'] = entry['grouping'][prefix_length:]
-            result.append(entry)
+    for entry in data.index('grouping', key=demographic_category).get(demographic, []):
+        entry = entry.copy()
+        entry['grouping'] = entry['grouping'][prefix_length:]
+        result.append(entry)
 
     # Sanity-check that we filtered the `status` column on a real value.
     if len(result) == 0:
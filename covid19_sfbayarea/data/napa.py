@@ -1,11 +1,12 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 import re
-import requests
 from typing import Dict, List, Iterable
 from ..errors import FormatError
 from ..utils import assert_equal_sets, PACIFIC_TIME
-from .arcgis import ArcGisFeatureServer
+from .arcgis import ArcGisFeatureServer, statistic
+from .cache import cached_session
 
 
 # Most data comes from this ArcGIS server.
@@ -16,6 +17,8 @@ CASES_SERVICE = 'CaseDataDemographics'
 # Tests data comes from a Google Sheet proxies through livestories.com.
 TESTS_SPREADSHEET_URL = 'https://legacy.livestories.com/dataset.json?dashId=6014a050c648870017b6dc84'
 
+session = cached_session(source='napa')
+
 
 def get_county() -> Dict:
     """
@@ -35,23 +38,32 @@ def get_county() -> Dict:
              'Test data is updated on Tuesdays, but a test week is '
              'Sunday-Saturday.')
 
-    api = ArcGisFeatureServer(ARCGIS_SERVER_URL)
+    api = ArcGisFeatureServer(ARCGIS_SERVER_URL, source='napa')
+
+    # None of these depend on each other, so load them all at the same time.
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        update_time = executor.submit(get_latest_update, api)
+        cases = executor.submit(get_timeseries_cases, api)
+        deaths = executor.submit(get_timeseries_deaths, api)
+        tests = executor.submit(get_timeseries_tests)
+        case_totals = executor.submit(get_case_totals, api)
+        death_totals = executor.submit(get_death_totals, api)
 
     return {
         'name': 'Napa',
-        'update_time': get_latest_update(api).isoformat(),
+        'update_time': update_time.result().isoformat(),
         # The dashboard loads data from ArcGIS and from several Google Sheets
         # proxied through livestories.com (see URLs in constants above).
         'source_url': 'https://legacy.livestories.com/s/v2/coronavirus-report-for-napa-county-ca/9065d62d-f5a6-445f-b2a9-b7cf30b846dd/',
         'meta_from_source': '',
         'meta_from_baypd': notes,
         'series': {
-            'cases': get_timeseries_cases(api),
-            'deaths': get_timeseries_deaths(api),
-            'tests': get_timeseries_tests(),
+            'cases': cases.result(),
+            'deaths': deaths.result(),
+            'tests': tests.result(),
         },
-        'case_totals': get_case_totals(api),
-        'death_totals': get_death_totals(api),
+        'case_totals': case_totals.result(),
+        'death_totals': death_totals.result(),
         # Napa does not currently provide demographic breakdowns for testing,
         # so no test totals right now.
     }
@@ -59,7 +71,7 @@ def get_county() -> Dict:
 
 def get_latest_update(api: ArcGisFeatureServer) -> datetime:
     data = api.query(CASES_SERVICE,
-                     outFields='MAX(EditDate_1) as edit_date')
+                     outStatistics=[statistic('max', 'EditDate_1', 'edit_date')])
     result = next(data)
     return datetime.fromtimestamp(result['edit_date'] / 1000, tz=PACIFIC_TIME)
 
@@ -80,23 +92,21 @@ def get_timeseries_cases(api: ArcGisFeatureServer) -> List:
     # were entered incorrectly and are dated unrealistically early.)
     minimum_valid_date = '2019-12-01'
 
-    dated = {
-        row['DtLabCollect']: row['count']
-        for row in api.query(CASES_SERVICE,
-                             where=f'DtLabCollect <> NULL AND DtLabCollect >= \'{minimum_valid_date}\'',
-                             outFields='DtLabCollect,COUNT(*) AS count',
-                             groupByFieldsForStatistics='DtLabCollect',
-                             orderByFields='DtLabCollect asc')
-    }
-
-    undated = {
-        row['DtLabResult']: row['count']
-        for row in api.query(CASES_SERVICE,
-                             where=f'DtLabCollect IS NULL OR DtLabCollect < \'{minimum_valid_date}\'',
-                             outFields='DtLabResult,COUNT(*) AS count',
-                             groupByFieldsForStatistics='DtLabResult',
-                             orderByFields='DtLabResult asc')
-    }
+    count_cases = statistic('count', api.object_id_field(CASES_SERVICE), 'count')
+    results = api.query_many({
+        'dated': dict(service=CASES_SERVICE,
+                      where=f'DtLabCollect <> NULL AND DtLabCollect >= \'{minimum_valid_date}\'',
+                      outStatistics=[count_cases],
+                      groupByFieldsForStatistics='DtLabCollect',
+                      orderByFields='DtLabCollect asc'),
+        'undated': dict(service=CASES_SERVICE,
+                        where=f'DtLabCollect IS NULL OR DtLabCollect < \'{minimum_valid_date}\'',
+                        outStatistics=[count_cases],
+                        groupByFieldsForStatistics='DtLabResult',
+                        orderByFields='DtLabResult asc'),
+    })
+    dated = {row['DtLabCollect']: row['count'] for row in results['dated']}
+    undated = {row['DtLabResult']: row['count'] for row in results['undated']}
 
     dates = sorted(set(list(dated.keys()) + list(undated.keys())))
 
@@ -123,7 +133,7 @@ def get_timeseries_deaths(api: ArcGisFeatureServer) -> List:
     # First build a lookup table for records with no collection date.
     data = api.query(CASES_SERVICE,
                      where='DtDeath <> NULL',
-                     outFields='DtDeath,COUNT(*) AS deaths',
+                     outStatistics=[statistic('count', 'DtDeath', 'deaths')],
                      groupByFieldsForStatistics='DtDeath',
                      orderByFields='DtDeath asc')
     total = 0
@@ -142,7 +152,7 @@ def get_timeseries_deaths(api: ArcGisFeatureServer) -> List:
 def get_timeseries_tests() -> List:
     # Testing data comes from a Google Sheet proxies through livestories.com,
     # rather than ArcGIS.
-    data = requests.get(TESTS_SPREADSHEET_URL).json()
+    data = session.get(TESTS_SPREADSHEET_URL).json()
 
     # Validate that the series are what we expect.
     if 'number of tests' not in data['series'][0]['name'].lower():
@@ -262,7 +272,7 @@ def format_age_results(data: Iterable[Dict]) -> List[Dict]:
 
 
 def get_case_totals(api: ArcGisFeatureServer) -> Dict:
-    return get_totals(api, count_by='*')
+    return get_totals(api, count_by=api.object_id_field(CASES_SERVICE))
 
 
 def get_death_totals(api: ArcGisFeatureServer) -> Dict:
@@ -270,28 +280,20 @@ def get_death_totals(api: ArcGisFeatureServer) -> Dict:
 
 
 def get_totals(api: ArcGisFeatureServer, count_by: str) -> Dict:
+    """
+    Count rows with a value in the ``count_by`` field, grouped by each
+    demographic field.
+    """
+    results = api.query_many({
+        field: dict(service=CASES_SERVICE,
+                    outStatistics=[statistic('count', count_by, 'count')],
+                    groupByFieldsForStatistics=field)
+        for field in ('Sex', 'AgeGroup', 'RaceEthn')
+    })
     return {
-        'gender': format_gender_results(
-            api.query(
-                CASES_SERVICE,
-                outFields=f'Sex,COUNT({count_by}) AS count',
-                groupByFieldsForStatistics='Sex'
-            )
-        ),
-        'age_group': format_age_results(
-            api.query(
-                CASES_SERVICE,
-                outFields=f'AgeGroup,COUNT({count_by}) AS count',
-                groupByFieldsForStatistics='AgeGroup'
-            )
-        ),
-        'race_eth': format_race_results(
-            api.query(
-                CASES_SERVICE,
-                outFields=f'RaceEthn,COUNT({count_by}) AS count',
-                groupByFieldsForStatistics='RaceEthn'
-            )
-        ),
+        'gender': format_gender_results(results['Sex']),
+        'age_group': format_age_results(results['AgeGroup']),
+        'race_eth': format_race_results(results['RaceEthn']),
         # NOTE: Napa does not appear to have any source of information about
         # comorbidities/underlying conditions or type of transmission, so no
         # `underlying_cond` or `transmission_cat` fields.
@@ -0,0 +1,153 @@
+from itertools import groupby
+import logging
+import requests
+from threading import Lock
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib3.util.retry import Retry
+from ..errors import PowerBiQueryError
+from .cache import cached_session
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTiming(NamedTuple):
+    method: str
+    url: str
+    # Total time in seconds, including any retries.
+    duration: float
+
+
+class TimedSession(requests.Session):
+    """
+    A requests session that records how long each request takes in its
+    ``timings`` list.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.timings: List[RequestTiming] = []
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:  # type: ignore
+        start = time.perf_counter()
+        try:
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            timing = RequestTiming(method, url, time.perf_counter() - start)
+            self.timings.append(timing)
+            logger.debug('%s %s took %.3f seconds', *timing)
+
+
+def create_session() -> TimedSession:
+    """
+    Create a session for Power BI requests. It keeps connections open between
+    requests, retries failed requests with exponential backoff, and records
+    the time each request took.
+    """
+    # Power BI's `querydata` endpoint is read-only even though it uses POST,
+    # so it's safe to retry.
+    retries = Retry(total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(('GET', 'POST')))
+    session = TimedSession()
+    cached_session(retries=retries, session=session, source='power_bi')
+    return session
+
+
+_session: Optional[requests.Session] = None
+_session_lock = Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Get the session shared by all Power BI queriers (in every county).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def use_session(session: Optional[requests.Session]) -> None:
+    """
+    Replace the session shared by all Power BI queriers, e.g. with a stand-in
+    for testing. Set it to ``None`` to go back to the default session.
+    """
+    global _session
+    _session = session
+
+
+class PowerBiBatch:
+    """
+    Send the queries for several Power BI queriers (the ``PowerBiQuerier``
+    classes in the ``alameda`` and ``san_mateo`` packages) in as few requests
+    as possible.
+
+    Power BI's ``querydata`` endpoint accepts a list of queries, so all the
+    queries for the same model and resource key can go in one request. After
+    calling ``fetch()``, each querier's ``get_data()`` will parse its part of
+    the batched response instead of making its own request.
+
+    Parameters
+    ----------
+    *queriers
+        The queriers to fetch data for. Objects that combine the results of
+        several queriers list them in their ``queriers`` attribute, so pass
+        ``*x.queriers`` for each of them.
+
+    Examples
+    --------
+    >>> cases = TimeSeriesCases()
+    >>> cases_by_age = CasesByAge()
+    >>> PowerBiBatch(*cases.queriers, *cases_by_age.queriers).fetch()
+    >>> cases.get_data()
+    """
+    # Limit how many queries go in one request so that a single request
+    # doesn't take too long or get too big for the server.
+    MAX_QUERIES = 10
+
+    def __init__(self, *queriers: Any) -> None:
+        self.queriers: List[Any] = list(queriers)
+
+    def add(self, *queriers: Any) -> None:
+        self.queriers.extend(queriers)
+
+    def fetch(self) -> None:
+        """
+        Send the queries and store each querier's part of the response on it.
+        """
+        for _, group in groupby(sorted(self.queriers, key=self._batch_key),
+                                key=self._batch_key):
+            queriers = list(group)
+            for start in range(0, len(queriers), self.MAX_QUERIES):
+                self._fetch_batch(queriers[start:start + self.MAX_QUERIES])
+
+    def _batch_key(self, querier: Any) -> Tuple[str, str, int]:
+        return (querier.BASE_URI, querier.powerbi_resource_key, querier.model_id)
+
+    def _fetch_batch(self, queriers: List[Any]) -> None:
+        first = queriers[0]
+        response = first.session.post(
+            first.BASE_URI,
+            headers={'X-PowerBI-ResourceKey': first.powerbi_resource_key},
+            json={
+                'version': '1.0.0',
+                'queries': [querier._query() for querier in queriers],
+                'cancelQueries': [],
+                'modelId': first.model_id
+            }
+        )
+        response.raise_for_status()
+        response_json: Dict[str, Any] = response.json()
+
+        results = response_json.get('results', [])
+        if len(results) != len(queriers):
+            raise PowerBiQueryError(f'Sent {len(queriers)} queries, but got '
+                                    f'{len(results)} results')
+
+        # Results are in the same order as the queries. Give each querier a
+        # response that looks like it was the only query that was sent.
+        for querier, result in zip(queriers, results):
+            querier.prefetched_response = {**response_json, 'results': [result]}
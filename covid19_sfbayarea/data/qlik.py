@@ -1,9 +1,11 @@
+from concurrent.futures import Future
 from datetime import date, timedelta
 import json
 import logging
 import ssl
+from threading import Lock, Thread
 from types import TracebackType
-from typing import Any, Dict, List, Union, Optional, Type
+from typing import Any, Dict, Iterable, Iterator, List, Union, Optional, Type
 from websocket import create_connection  # type: ignore
 
 
@@ -40,6 +42,12 @@ class QlikClient:
     There are some existing Python Clients, but they all either don't seem well
     maintained or don't appear to cover the API aspects we focus on.
 
+    Many requests can be in flight at once over the same connection: a
+    background thread reads responses and matches them to requests by ID. The
+    ``*_async`` methods return a ``concurrent.futures.Future`` instead of
+    waiting for the response, and it is safe to call any method from multiple
+    threads at the same time.
+
     Parameters
     ----------
     url : str
@@ -52,6 +60,9 @@ class QlikClient:
         HTTP `Cookie` header string to send when connecting.
     ssl_verify : bool, optional
         Whether to verify SSL certificates. Defaults to ``True``.
+    timeout : float, optional
+        How many seconds to wait for a response before raising
+        ``concurrent.futures.TimeoutError``. Defaults to 60.
 
     Examples
     --------
@@ -60,14 +71,35 @@ class QlikClient:
     >>>                        'b7d7f869-fb91-4950-9262-0b89473ceed6')
     >>> dashboard.open()
     >>> tests_chart = dashboard.get_data('bZFxmu')
+
+    Get several objects at once:
+    >>> charts = dashboard.get_data_many(['bZFxmu', 'cWjnGdK'])
+
+    Get just the data rows of a chart, one page at a time:
+    >>> for date, count in dashboard.get_hypercube_data('cWjnGdK', width=2):
+    >>>     print(date['qNum'], count['qNum'])
     """
-    def __init__(self, url: str, document_id: str, cookie: str = None, ssl_verify: bool = True):
+    # Qlik won't return more than 10,000 cells in a single page of data.
+    MAX_PAGE_CELLS = 10000
+
+    def __init__(self, url: str, document_id: str, cookie: str = None,
+                 ssl_verify: bool = True, timeout: float = 60):
         self.url = url + ('' if url.endswith('/') else '/')
         self.document_id = document_id
         self._message_id = 1
         self._document_handle = -1
         self._cookie = cookie
         self._ssl_verify = ssl_verify
+        self.timeout = timeout
+        self._lock = Lock()
+        # Websocket frames sent from different threads at the same time can
+        # get interleaved, so only one thread may send at a time.
+        self._send_lock = Lock()
+        self._pending: Dict[int, 'Future[Dict]'] = {}
+        # Once the connection is closed or broken, the reason why. Requests
+        # sent after that fail right away, since nothing will answer them.
+        self._closed = False
+        self._error: Optional[Exception] = None
 
     def _connect(self) -> None:
         "Connect to the websocket server."
@@ -75,13 +107,79 @@ class QlikClient:
         sslopt = None if self._ssl_verify else {"cert_reqs": ssl.CERT_NONE}
         self._socket = create_connection(socket_url,
                                          cookie=self._cookie,
-                                         sslopt=sslopt)
+                                         sslopt=sslopt,
+                                         enable_multithread=True)
+        self._start_reader()
+
+    def _start_reader(self) -> None:
+        self._reader = Thread(target=self._read_messages,
+                              name='QlikClient reader',
+                              daemon=True)
+        self._reader.start()
+
+    def _read_messages(self) -> None:
+        "Read messages from the socket and resolve the matching requests."
+        try:
+            while True:
+                response = self._socket.recv()
+                if not response:
+                    raise ConnectionError('Qlik connection was closed')
+
+                logger.debug('Received: %s', response)
+                response_data = json.loads(response)
+                with self._lock:
+                    future = self._pending.pop(response_data.get('id'), None)
+
+                # Messages that aren't responses to a request (e.g. the
+                # `OnConnected` notification) are ignored.
+                if future:
+                    try:
+                        future.set_result(self._parse_response(response_data))
+                    except Exception as error:
+                        future.set_exception(error)
+        except Exception as error:
+            # The connection is closed or broken; fail anything still waiting.
+            with self._lock:
+                self._closed = True
+                self._error = error
+                pending = list(self._pending.values())
+                self._pending.clear()
+            for future in pending:
+                future.set_exception(error)
+
+    def _parse_response(self, response_data: Dict) -> Dict:
+        if 'error' in response_data:
+            raise JsonRpcError(**response_data['error'])
+        elif 'result' in response_data:
+            return response_data['result']
+        elif 'method' in response_data:
+            return {
+                'method': response_data['method'],
+                'params': response_data.get('params')
+            }
+        else:
+            raise ValueError(f'Unexpected response: {response_data}')
 
     def _send(self, handle: Any, method: str, parameters: Union[List, Dict],
               delta: bool = False) -> Dict:
         "Send a JSON-RPC message and await the response."
-        id_ = self._message_id
-        self._message_id += 1
+        future = self._send_async(handle, method, parameters, delta)
+        return future.result(self.timeout)
+
+    def _send_async(self, handle: Any, method: str,
+                    parameters: Union[List, Dict],
+                    delta: bool = False) -> 'Future[Dict]':
+        "Send a JSON-RPC message and return a future for the response."
+        future: 'Future[Dict]' = Future()
+        with self._lock:
+            if self._closed:
+                future.set_exception(
+                    self._error or ConnectionError('Qlik connection was closed'))
+                return future
+
+            id_ = self._message_id
+            self._message_id += 1
+            self._pending[id_] = future
 
         message = {
             'jsonrpc': '2.0',
@@ -96,27 +194,15 @@ class QlikClient:
             message['delta'] = True
 
         logger.debug('Sending: %s', message)
-        self._socket.send(json.dumps(message))
+        try:
+            with self._send_lock:
+                self._socket.send(json.dumps(message))
+        except Exception:
+            with self._lock:
+                self._pending.pop(id_, None)
+            raise
 
-        while True:
-            # Keep reading the socket until we see our response.
-            response = self._socket.recv()
-            logger.debug('Received: %s', response)
-            response_data = json.loads(response)
-            if response_data.get('id') == id_:
-                break
-
-        if 'error' in response_data:
-            raise JsonRpcError(**response_data['error'])
-        elif 'result' in response_data:
-            return response_data['result']
-        elif 'method' in response_data:
-            return {
-                'method': response_data['method'],
-                'params': response_data.get('params')
-            }
-        else:
-            raise ValueError(f'Unexpected response: {response_data}')
+        return future
 
     def open(self) -> None:
         "Open a connection to the Qlik server and get basic document info."
@@ -145,7 +231,11 @@ class QlikClient:
         object_id : str
             The ID of the object to get a handle to, e.g. ``'bZFxmu'``.
         """
-        return self._send(self._document_handle, 'GetObject', [object_id])
+        return self.get_object_async(object_id).result(self.timeout)
+
+    def get_object_async(self, object_id: str) -> 'Future[Dict]':
+        "Like ``get_object``, but returns a future instead of waiting."
+        return self._send_async(self._document_handle, 'GetObject', [object_id])
 
     def get_layout(self, handle: Any) -> Dict:
         """
@@ -171,8 +261,137 @@ class QlikClient:
         object_id : str
             The ID of the object to get data for, e.g. ``'bZFxmu'``.
         """
+        return self.get_data_async(object_id).result(self.timeout)
+
+    def get_data_async(self, object_id: str) -> 'Future[Dict]':
+        "Like ``get_data``, but returns a future instead of waiting."
+        result: 'Future[Dict]' = Future()
+
+        def get_layout(object_future: 'Future[Dict]') -> None:
+            try:
+                handle = object_future.result()['qReturn']['qHandle']
+                layout = self._send_async(handle, 'GetLayout', [])
+            except Exception as error:
+                result.set_exception(error)
+                return
+
+            _copy_future(layout, result)
+
+        self.get_object_async(object_id).add_done_callback(get_layout)
+        return result
+
+    def get_data_many(self, object_ids: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Get detailed information for several objects at once. This sends all
+        the requests before waiting for any responses, so it is much faster
+        than calling ``get_data`` for each object.
+
+        Parameters
+        ----------
+        object_ids : iterable of str
+            The IDs of the objects to get data for.
+
+        Returns
+        -------
+        dict
+            The data for each object, keyed by object ID.
+        """
+        futures = {object_id: self.get_data_async(object_id)
+                   for object_id in object_ids}
+        return {object_id: future.result(self.timeout)
+                for object_id, future in futures.items()}
+
+    def get_hypercube_data(self, object_id: str, width: int,
+                           page_height: int = None,
+                           path: str = '/qHyperCubeDef') -> Iterator[List[Dict]]:
+        """
+        Get the data rows of a chart or table. Unlike ``get_data``, this only
+        gets the columns you ask for (none of the layout or styling info) and
+        gets *all* the rows, one page at a time.
+
+        Each page is requested before the rows of the previous page are
+        yielded, so the next page is usually ready by the time it is needed.
+
+        Parameters
+        ----------
+        object_id : str
+            The ID of the object to get data for, e.g. ``'bZFxmu'``.
+        width : int
+            How many columns to get, starting from the first. Every dimension
+            and measure in the chart is a column.
+        page_height : int, optional
+            How many rows to get in each request. Defaults to as many as Qlik
+            allows.
+        path : str, optional
+            Path to the hypercube definition in the object's properties.
+
+        Yields
+        ------
+        list of dict
+            Each row, as a list of cells (``{'qText': ..., 'qNum': ...}``).
+        """
+        handle = self.get_object(object_id)['qReturn']['qHandle']
+        page_height = page_height or self.MAX_PAGE_CELLS // width
+
+        def request_page(top: int) -> 'Future[Dict]':
+            page = {'qLeft': 0, 'qTop': top,
+                    'qWidth': width, 'qHeight': page_height}
+            return self._send_async(handle, 'GetHyperCubeData', [path, [page]])
+
+        top = 0
+        next_page: Optional['Future[Dict]'] = request_page(top)
+        while next_page is not None:
+            rows = next_page.result(self.timeout)['qDataPages'][0]['qMatrix']
+            top += page_height
+            next_page = request_page(top) if len(rows) >= page_height else None
+            yield from rows
+
+    def get_hypercube_stack_data(self, object_id: str, width: int,
+                                 page_height: int = None,
+                                 path: str = '/qHyperCubeDef') -> Iterator[Dict]:
+        """
+        Get the data of a "stacked" chart (one with several overlaid series),
+        one page at a time. This is the paged equivalent of the
+        ``qStackedDataPages`` in ``get_data``.
+
+        Parameters
+        ----------
+        object_id : str
+            The ID of the object to get data for, e.g. ``'VapZPL'``.
+        width : int
+            How many columns to get, starting from the first.
+        page_height : int, optional
+            How many values of the first dimension to get in each request.
+            Defaults to as many as Qlik allows.
+        path : str, optional
+            Path to the hypercube definition in the object's properties.
+
+        Yields
+        ------
+        dict
+            A node for each value of the first dimension. Its ``qSubNodes``
+            hold the values of the next dimension or of the measures.
+        """
         handle = self.get_object(object_id)['qReturn']['qHandle']
-        return self.get_layout(handle)
+        page_height = page_height or self.MAX_PAGE_CELLS // width
+
+        def request_page(top: int) -> 'Future[Dict]':
+            page = {'qLeft': 0, 'qTop': top,
+                    'qWidth': width, 'qHeight': page_height}
+            return self._send_async(handle, 'GetHyperCubeStackData',
+                                    [path, [page], width * page_height])
+
+        top = 0
+        next_page: Optional['Future[Dict]'] = request_page(top)
+        while next_page is not None:
+            data_page = next_page.result(self.timeout)['qDataPages'][0]
+            # Each page has a root node whose sub-nodes are the rows.
+            nodes = [node for root in data_page['qData']
+                     for node in root['qSubNodes']]
+            height = data_page.get('qArea', {}).get('qHeight', len(nodes))
+            top += page_height
+            next_page = request_page(top) if height >= page_height else None
+            yield from nodes
 
     def get_field(self, field: str) -> Dict:
         return self._send(self._document_handle, 'GetField', [field])
@@ -203,3 +422,15 @@ class QlikClient:
             The Qlik/Excel-formatted date value to parse.
         """
         return date(1900, 1, 1) + timedelta(days=(value - 2))
+
+
+def _copy_future(source: 'Future[Dict]', target: 'Future[Dict]') -> None:
+    "Resolve ``target`` with the outcome of ``source`` once it is done."
+    def copy(future: 'Future[Dict]') -> None:
+        error = future.exception()
+        if error:
+            target.set_exception(error)
+        else:
+            target.set_result(future.result())
+
+    source.add_done_callback(copy)
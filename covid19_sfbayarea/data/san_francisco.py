@@ -16,7 +16,7 @@ def get_county() -> Dict:
     RESOURCE_IDS = {'cases_deaths_transmission': 'tvq9-ec9w', 'gender': 'nhy6-gqam', 'age': 'sunc-2t3k',
                      'race_eth': 'vqqm-nsqg', 'tests': 'nfpa-mg4g'}
 
-    session = SocrataApi('https://data.sfgov.org/')
+    session = SocrataApi('https://data.sfgov.org/', source='san_francisco')
 
     # fetch metadata
     meta_from_source = get_notes(session, RESOURCE_IDS)
@@ -41,21 +41,18 @@ def get_notes(session: SocrataApi, resource_ids: Dict[str, str]) -> str:
     Get 'description' field of metadata for all resources. Collect into one string,
     separated by 2 newlines.
     """
+    metadata = session.metadata_many(resource_ids.values())
     meta_from_source = ''
     for v in resource_ids.values():
-        data = session.metadata(v)
-        meta_from_source += data["description"] + '\n\n'
+        meta_from_source += metadata[v]["description"] + '\n\n'
     return meta_from_source
 
 def get_update_times(session: SocrataApi, resource_ids: Dict[str, str]) -> List:
     """
     Return a list of update times for all resources.
     """
-    update_times = []
-    for v in resource_ids.values():
-        data = session.metadata(v)
-        update_times.append(data["dataUpdatedAt"])
-    return update_times
+    metadata = session.metadata_many(resource_ids.values())
+    return [metadata[v]["dataUpdatedAt"] for v in resource_ids.values()]
 
 def get_demographics(session: SocrataApi, resource_ids: Dict[str, str]) -> Dict:
     """
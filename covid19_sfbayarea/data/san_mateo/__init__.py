@@ -1,6 +1,5 @@
 import csv
 import json
-import requests
 
 from datetime import datetime
 from typing import Any, Dict, List, cast
@@ -19,17 +18,39 @@ from .deaths_by_gender import DeathsByGender
 from .time_series_cases import TimeSeriesCases
 from .time_series_tests import TimeSeriesTests
 
+from ..cache import cached_session
+from ..power_bi import PowerBiBatch
 from ..utils import get_data_model
 from ...errors import FormatError
 
 LANDING_PAGE = 'https://www.smchealth.org/post/san-mateo-county-covid-19-data-1'
 
+session = cached_session(source='san_mateo')
+
 def get_county() -> Dict:
     out = get_data_model()
     out.update(fetch_data())
     return out
 
 def fetch_data() -> Dict:
+    cases = TimeSeriesCases()
+    tests = TimeSeriesTests()
+    case_totals: Dict[str, Any] = {
+        'gender': CasesByGender(),
+        'age_group': CasesByAge(),
+        'race_eth': CasesByEthnicity()
+    }
+    death_totals: Dict[str, Any] = {
+        'gender': DeathsByGender(),
+        'age_group': DeathsByAge(),
+        'race_eth': DeathsByEthnicity()
+    }
+    # Send all the queries together in as few requests as possible.
+    batch = PowerBiBatch()
+    for querier in [cases, tests, *case_totals.values(), *death_totals.values()]:
+        batch.add(*querier.queriers)
+    batch.fetch()
+
     data : Dict = {
         'name': 'San Mateo County',
         'source_url': LANDING_PAGE,
@@ -47,20 +68,14 @@ def fetch_data() -> Dict:
             https://github.com/datadesk/california-coronavirus-data
          """,
         'series': {
-            'cases': TimeSeriesCases().get_data(),
+            'cases': cases.get_data(),
             'deaths': get_timeseries_deaths(),
-            'tests': TimeSeriesTests().get_data()
-        },
-        'case_totals': {
-            'gender': CasesByGender().get_data(),
-            'age_group': CasesByAge().get_data(),
-            'race_eth': CasesByEthnicity().get_data()
+            'tests': tests.get_data()
         },
-        'death_totals': {
-            'gender': DeathsByGender().get_data(),
-            'age_group': DeathsByAge().get_data(),
-            'race_eth': DeathsByEthnicity().get_data()
-        }
+        'case_totals': {key: querier.get_data()
+                        for key, querier in case_totals.items()},
+        'death_totals': {key: querier.get_data()
+                         for key, querier in death_totals.items()}
     }
     last_updated = most_recent_case_time(data)
     data.update({ 'update_time': last_updated.isoformat() })
@@ -86,7 +101,7 @@ def get_timeseries_deaths() -> List:
     """
     timeseries: List[Dict[str, Any]] = []
     url = 'https://raw.githubusercontent.com/datadesk/california-coronavirus-data/master/latimes-county-totals.csv'
-    with requests.get(url, stream=True) as response:
+    with session.get(url, stream=True) as response:
         response.raise_for_status()
         lines = (line.decode('utf-8') for line in response.iter_lines())
         for row in csv.DictReader(lines):
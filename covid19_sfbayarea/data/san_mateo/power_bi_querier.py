@@ -1,8 +1,9 @@
 import json
-from requests import post
-from typing import Any, Dict, List, Union
+import requests
+from typing import Any, Dict, List, Optional, Union
 from ...utils import dig
 from ...errors import PowerBiQueryError
+from ..power_bi import get_session
 
 
 class PowerBiQuerier:
@@ -10,11 +11,27 @@ class PowerBiQuerier:
     JSON_PATH = ['results', 0, 'result', 'data', 'dsr', 'DS', 0, 'PH', 0, 'DM0']
     DEFAULT_MODEL_ID = 275725
     DEFAULT_POWERBI_RESOURCE_KEY = '86dc380f-4914-4cff-b2a5-03af9f292bbd'
+    # Set by `PowerBiBatch` when this querier's data was fetched together with
+    # other queriers' data.
+    prefetched_response: Optional[Dict] = None
 
     def __init__(self) -> None:
         self._set_defaults()
         self._assert_init_variables_are_set()
 
+    @property
+    def session(self) -> requests.Session:
+        return get_session()
+
+    @property
+    def queriers(self) -> List['PowerBiQuerier']:
+        """
+        The queriers to fetch data for when batching (see `PowerBiBatch`).
+        Classes that combine several queriers list those instead of a single
+        querier.
+        """
+        return [self]
+
     def get_data(self) -> Union[List, Dict]:
         response_json = self._fetch_data()
         return self._parse_data(response_json)
@@ -28,7 +45,12 @@ class PowerBiQuerier:
         self.source = getattr(self, 'source')
 
     def _fetch_data(self) -> Dict:
-        response = post(self.BASE_URI, headers = { 'X-PowerBI-ResourceKey': self.powerbi_resource_key }, json = self._query_params())
+        if self.prefetched_response is not None:
+            # Only use a prefetched response once; parsing can modify it.
+            response_json, self.prefetched_response = self.prefetched_response, None
+            return response_json
+
+        response = self.session.post(self.BASE_URI, headers = { 'X-PowerBI-ResourceKey': self.powerbi_resource_key }, json = self._query_params())
         response.raise_for_status()
         return response.json()
 
@@ -1,13 +1,18 @@
-from datetime import datetime
 from typing import Any, Dict, List, cast
 
 from .time_series_daily import TimeSeriesDaily
 from .time_series_cumulative import TimeSeriesCumulative
+from ...utils import timestamp_to_date
 
 class TimeSeriesCases():
+    def __init__(self) -> None:
+        self.daily = TimeSeriesDaily()
+        self.cumulative = TimeSeriesCumulative()
+        self.queriers = [self.daily, self.cumulative]
+
     def get_data(self) -> List[Dict[str, Any]]:
-        daily_cases = cast(Dict[int, int], TimeSeriesDaily().get_data())
-        cumulative_cases = cast(Dict[int, int], TimeSeriesCumulative().get_data())
+        daily_cases = cast(Dict[int, int], self.daily.get_data())
+        cumulative_cases = cast(Dict[int, int], self.cumulative.get_data())
         self._assert_daily_and_cumulative_cases_match(daily_cases, cumulative_cases)
 
         return [{
@@ -17,7 +22,7 @@ class TimeSeriesCases():
         } for timestamp in daily_cases.keys()]
 
     def _timestamp_to_date(self, timestamp_in_milliseconds: int) -> str:
-        return datetime.utcfromtimestamp(timestamp_in_milliseconds / 1000).strftime('%Y-%m-%d')
+        return timestamp_to_date(timestamp_in_milliseconds)
 
     def _assert_daily_and_cumulative_cases_match(self, daily_cases: Dict[int, int], cumulative_cases: Dict[int, int]) -> None:
         if daily_cases.keys() != cumulative_cases.keys():
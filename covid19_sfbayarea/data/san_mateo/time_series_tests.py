@@ -1,6 +1,6 @@
-from datetime import datetime
 from typing import Any, Dict, List
 from .power_bi_querier import PowerBiQuerier
+from ...utils import timestamp_to_date
 
 class TimeSeriesTests(PowerBiQuerier):
     def __init__(self) -> None:
@@ -27,7 +27,7 @@ class TimeSeriesTests(PowerBiQuerier):
         return results
 
     def _timestamp_to_date(self, timestamp_in_milliseconds: int) -> str:
-        return datetime.utcfromtimestamp(timestamp_in_milliseconds / 1000).strftime('%Y-%m-%d')
+        return timestamp_to_date(timestamp_in_milliseconds)
 
     def _add_cumulative_data(self, results: List[Dict[str, Any]]) -> None:
         running_totals = { 'cumul_tests': 0, 'cumul_pos': 0, 'cumul_neg': 0, 'cumul_pend': 0 }
@@ -37,7 +37,7 @@ def get_county() -> Dict:
     """
     Get data for Santa Clara County.
     """
-    api = SocrataApi('https://data.sccgov.org/')
+    api = SocrataApi('https://data.sccgov.org/', source='santa_clara')
     notes = ('Santa Clara does not report pending tests in its data, so '
              '`series.tests[].pending` will always be -1. '
              'An "outbreak" (in the `transmission_cat` breakdown) is defined '
@@ -75,14 +75,18 @@ def get_county() -> Dict:
 
 
 def get_latest_update(api: SocrataApi) -> datetime:
-    times = [parse_datetime(api.metadata(api_id)['dataUpdatedAt'])
-             for api_id in API_IDS.values()]
+    metadata = api.metadata_many(API_IDS.values())
+    times = [parse_datetime(item['dataUpdatedAt'])
+             for item in metadata.values()]
     return max(*times)
 
 
 def get_timeseries_cases(api: SocrataApi) -> List[dict]:
     # https://data.sccgov.org/COVID-19/COVID-19-case-counts-by-date/6cnm-gchg
-    data = api.resource(API_IDS['cases'], params={'$order': 'date ASC'})
+    data = api.resource(API_IDS['cases'], params={
+        '$select': 'date, new_cases, total_cases',
+        '$order': 'date ASC',
+    })
     return [
         {
             'date': parse_datetime(entry['date']).date().isoformat(),
@@ -94,7 +98,10 @@ def get_timeseries_cases(api: SocrataApi) -> List[dict]:
 
 
 def get_timeseries_deaths(api: SocrataApi) -> List[dict]:
-    data = api.resource(API_IDS['deaths'], params={'$order': 'date ASC'})
+    data = api.resource(API_IDS['deaths'], params={
+        '$select': 'date, total, cumulative',
+        '$order': 'date ASC',
+    })
     result = []
     for index, entry in enumerate(data):
         if 'date' not in entry:
@@ -119,7 +126,10 @@ def get_timeseries_deaths(api: SocrataApi) -> List[dict]:
 
 def get_timeseries_tests(api: SocrataApi) -> List[dict]:
     # https://data.sccgov.org/COVID-19/COVID-19-testing-by-date/dvgc-tzgq
-    data = api.resource(API_IDS['tests'], params={'$order': 'collection_date ASC'})
+    data = api.resource(API_IDS['tests'], params={
+        '$select': 'collection_date, total, post_rslt, neg_rslt',
+        '$order': 'collection_date ASC',
+    })
 
     total = 0
     total_positive = 0
@@ -159,7 +169,8 @@ def get_case_totals(api: SocrataApi) -> Dict:
 
 def get_cases_by_gender(api: SocrataApi) -> Dict:
     # https://data.sccgov.org/COVID-19/COVID-19-cases-by-gender/ibdk-7rf5
-    data = api.resource(API_IDS['cases_by_gender'])
+    data = api.resource(API_IDS['cases_by_gender'],
+                        params={'$select': 'gender, count'})
     result = {row['gender'].lower(): int(row['count'])
               for row in data}
     try:
@@ -175,14 +186,16 @@ def get_cases_by_age(api: SocrataApi) -> List[Dict]:
     # https://data.sccgov.org/COVID-19/COVID-19-cases-by-age-group/ige8-ixqu
     # There is also a detailed breakdown by individual year for ages 0-13 at:
     # https://data.sccgov.org/COVID-19/COVID-19-cases-among-children-by-age/dxgq-7kuf
-    data = api.resource(API_IDS['cases_by_age'])
+    data = api.resource(API_IDS['cases_by_age'],
+                        params={'$select': 'age_group, count'})
     return [{'group': row['age_group'], 'raw_count': int(row['count'])}
             for row in data]
 
 
 def get_cases_by_race(api: SocrataApi) -> Dict:
     # https://data.sccgov.org/COVID-19/COVID-19-cases-by-race-ethnicity/ccm2-45w3
-    data = api.resource(API_IDS['cases_by_race'])
+    data = api.resource(API_IDS['cases_by_race'],
+                        params={'$select': 'race_eth, count'})
     mapping = {
         'african american': 'African_Amer',
         'asian': 'Asian',
@@ -208,7 +221,8 @@ def get_cases_by_condition(api: SocrataApi) -> Dict:
 
 def get_cases_by_transmission(api: SocrataApi) -> Dict:
     # https://data.sccgov.org/COVID-19/COVID-19-cases-by-method-of-transmission/xar3-th86
-    data = api.resource(API_IDS['cases_by_transmission'])
+    data = api.resource(API_IDS['cases_by_transmission'],
+                        params={'$select': 'category, counts'})
     mapping = {
         # NOTE: In this parlance, an "outbreak" is 3+ cases linked to exposures
         # at a particular location/event -- usually a workplace like a factory,
@@ -242,7 +256,8 @@ def get_death_totals(api: SocrataApi) -> Dict:
 
 def get_deaths_by_gender(api: SocrataApi) -> Dict:
     # https://data.sccgov.org/COVID-19/Deaths-with-COVID-19-by-gender/v49w-v4a7
-    data = api.resource(API_IDS['deaths_by_gender'])
+    data = api.resource(API_IDS['deaths_by_gender'],
+                        params={'$select': 'gender, counts'})
     result = {row['gender'].lower(): int(row['counts'])
               for row in data}
     try:
@@ -256,14 +271,16 @@ def get_deaths_by_gender(api: SocrataApi) -> Dict:
 
 def get_deaths_by_age(api: SocrataApi) -> List[Dict]:
     # https://data.sccgov.org/COVID-19/Deaths-with-COVID-19-by-age-group/pg8z-gbgv
-    data = api.resource(API_IDS['deaths_by_age'])
+    data = api.resource(API_IDS['deaths_by_age'],
+                        params={'$select': 'age_group, count'})
     return [{'group': row['age_group'], 'raw_count': int(row['count'])}
             for row in data]
 
 
 def get_deaths_by_race(api: SocrataApi) -> Dict:
     # https://data.sccgov.org/COVID-19/Deaths-with-COVID-19-by-race-ethnicity/nd69-4zii
-    data = api.resource(API_IDS['deaths_by_race'])
+    data = api.resource(API_IDS['deaths_by_race'],
+                        params={'$select': 'race_eth, counts'})
     mapping = {
         'african american': 'African_Amer',
         'asian': 'Asian',
@@ -284,7 +301,8 @@ def get_deaths_by_race(api: SocrataApi) -> Dict:
 
 def get_deaths_by_condition(api: SocrataApi) -> Dict:
     # https://data.sccgov.org/COVID-19/Deaths-with-COVID-19-by-comorbidity-status/mejj-pzbm
-    data = api.resource(API_IDS['deaths_by_condition'])
+    data = api.resource(API_IDS['deaths_by_condition'],
+                        params={'$select': 'comorbidities, counts'})
     mapping = {
         '1 or more comorbidities': 'greater_than_1',
         'none': 'none',
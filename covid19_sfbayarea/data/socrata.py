@@ -1,26 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Any, Dict, List
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import requests
 from urllib.parse import urljoin
-from cachecontrol import CacheControl  # type: ignore
 from ..errors import BadRequest
+from .cache import cached_session
+
+
+logger = logging.getLogger(__name__)
+
+
+class SocrataDataset:
+    """
+    The rows of a Socrata resource, with indexes for quickly picking out the
+    rows that have a given value in a column. Indexes are built the first time
+    they are used and then reused, so many consumers can each pick out their
+    own subset of the data without scanning all of it.
+
+    The rows are shared by everything that uses the dataset, so don't modify
+    them (copy them first).
+
+    Parameters
+    ----------
+    rows : list of dict
+        The rows of the dataset.
+
+    Examples
+    --------
+    >>> dataset = SocrataDataset(api.resource('wg8s-i3c7'))
+    >>> deaths = dataset.where('status', 'Death')
+    """
+    def __init__(self, rows: List[Dict]):
+        self.rows = rows
+        self._indexes: Dict[Tuple[str, Optional[Callable]], Dict[Any, List[Dict]]] = {}
+        self._lock = Lock()
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def index(self, column: str,
+              key: Callable[[Any], Any] = None) -> Dict[Any, List[Dict]]:
+        """
+        Get the rows grouped by their value in a column (in their original
+        order).
+
+        Parameters
+        ----------
+        column : str
+            The name of the column to group by.
+        key : callable, optional
+            A function that transforms each value before grouping, e.g. to
+            group by a prefix of the value. Rows without the column are left
+            out.
+        """
+        with self._lock:
+            index = self._indexes.get((column, key))
+            if index is None:
+                index = {}
+                for row in self.rows:
+                    if column in row:
+                        value = row[column] if key is None else key(row[column])
+                        index.setdefault(value, []).append(row)
+                self._indexes[(column, key)] = index
+
+        return index
+
+    def where(self, column: str, value: Any) -> List[Dict]:
+        """
+        Get the rows that have a given value in a column.
+        """
+        return self.index(column).get(value, [])
 
 
 class SocrataApi:
     """
     Class for starting a session for requests via Socrata APIs.
-    Initialize with a base_url
+    Initialize with a base_url, and optionally with ``cache_ttl``, the number
+    of seconds to treat cached responses as fresh, or ``source``, the name of
+    the data source to look up the TTL for (see ``cache.cached_session``).
+
+    If ``state_dir`` is set (it defaults to the ``SOCRATA_STATE_DIR``
+    environment variable), ``resource()`` runs in incremental mode: it saves
+    the rows it downloads in that directory along with the resource's
+    ``dataUpdatedAt`` time, and on later runs it returns the saved rows
+    instead of downloading them again if the resource's metadata shows it
+    hasn't been updated since.
     """
     # SODA API has a default limit of 1000 records per call,
     # so we'll use that as well.
     # See: https://dev.socrata.com/docs/paging.html
     DEFAULT_LIMIT = 1000
+    # Maximum number of pages to load at once when fetching in parallel.
+    DEFAULT_WORKERS = 4
 
-    def __init__(self, base_url: str):
-        self.session = CacheControl(requests.Session())
+    def __init__(self, base_url: str, cache_ttl: int = None,
+                 state_dir: Union[str, Path] = None, source: str = None):
+        self.session = cached_session(cache_ttl, source=source)
+        state_dir = state_dir or os.getenv('SOCRATA_STATE_DIR')
+        self.state_dir = Path(state_dir) if state_dir else None
         self.base_url = base_url
         self.resource_url = urljoin(self.base_url, '/resource/')
         self.metadata_url = urljoin(self.base_url, '/api/views/metadata/v1/')
+        self._datasets: Dict[Tuple, SocrataDataset] = {}
+        self._dataset_locks: Dict[Tuple, Lock] = {}
+        self._datasets_lock = Lock()
 
     @lru_cache(maxsize=32)
     def _request(self, url: str, **kwargs: Any) -> Dict:
@@ -50,19 +142,86 @@ class SocrataApi:
         return self._request(url, **kwargs)
 
     def resource(
-            self, resource_id: str, params: Dict = None, **kwargs: Any
+            self, resource_id: str, params: Dict = None, *,
+            parallel: bool = False, **kwargs: Any
     ) -> List[Dict]:
-        """Fetch and return data from a given Socrata data resource"""
-        data: List[Dict] = []
+        """
+        Fetch and return data from a given Socrata data resource.
 
-        params = params or {}
+        Parameters
+        ----------
+        resource_id : str
+            The ID of the resource to load, e.g. ``'wg8s-i3c7'``.
+        params : dict, optional
+            SoQL parameters for the query, e.g. ``{'$order': 'date ASC'}``.
+        parallel : bool, optional
+            If true, count the matching rows first and then load all the pages
+            at once instead of one after another. This is much faster for large
+            datasets. It is not supported for grouped queries (ones with a
+            ``$group`` parameter), which are always loaded one page at a time.
+        """
+        params = dict(params or {})
         params.setdefault("$offset", 0)
-        limit = params.setdefault("$limit", self.DEFAULT_LIMIT)
+        params.setdefault("$limit", self.DEFAULT_LIMIT)
+
+        if self.state_dir:
+            return self._resource_incremental(resource_id, params,
+                                              parallel=parallel, **kwargs)
+
+        return self._download_resource(resource_id, params,
+                                       parallel=parallel, **kwargs)
+
+    def _download_resource(self, resource_id: str, params: Dict, *,
+                           parallel: bool, **kwargs: Any) -> List[Dict]:
+        url = f'{self.resource_url}{resource_id}'
+
+        if parallel and '$group' not in params:
+            data = self._resource_parallel(url, params, **kwargs)
+        else:
+            data = self._resource_sequential(url, params, **kwargs)
+
+        logger.info(f'Loaded {len(data)} rows from {resource_id}')
+        return data
+
+    def _resource_incremental(self, resource_id: str, params: Dict, *,
+                              parallel: bool, **kwargs: Any) -> List[Dict]:
+        assert self.state_dir
+        # Saved data is specific to the query, not just the resource.
+        query = json.dumps([self.base_url, resource_id, params], sort_keys=True)
+        query_hash = hashlib.sha1(query.encode('utf-8')).hexdigest()[:16]
+        path = self.state_dir / f'{resource_id}-{query_hash}.json'
+
+        updated_at = self.metadata(resource_id).get('dataUpdatedAt')
+        if updated_at:
+            try:
+                with path.open(encoding='utf-8') as f:
+                    state = json.load(f)
+                if state['dataUpdatedAt'] == updated_at:
+                    logger.info(f'{resource_id} has not changed since '
+                                f'{updated_at}, using saved data')
+                    return state['rows']
+            except (OSError, ValueError, KeyError):
+                pass
+
+        rows = self._download_resource(resource_id, params, parallel=parallel,
+                                       **kwargs)
+        if updated_at:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so an interrupted run can't
+            # leave a partial file behind.
+            temporary_path = path.with_suffix('.tmp')
+            with temporary_path.open('w', encoding='utf-8') as f:
+                json.dump({'dataUpdatedAt': updated_at, 'rows': rows}, f)
+            temporary_path.replace(path)
+
+        return rows
+
+    def _resource_sequential(self, url: str, params: Dict, **kwargs: Any) -> List[Dict]:
+        data: List[Dict] = []
+        limit = params["$limit"]
 
         while True:
-            results = self.request(
-                f'{self.resource_url}{resource_id}', params=params, **kwargs
-            )
+            results = self.request(url, params=params, **kwargs)
             result_count = len(results)
 
             if result_count == limit:
@@ -80,5 +239,95 @@ class SocrataApi:
 
         return data
 
+    def _resource_parallel(self, url: str, params: Dict, **kwargs: Any) -> List[Dict]:
+        # Pages can only be loaded independently if every row has a fixed
+        # position, so always break ties in the sort order by row ID.
+        # Otherwise, rows with the same sort value could move between pages.
+        order = params.get('$order')
+        if not order:
+            params['$order'] = ':id'
+        elif ':id' not in order:
+            params['$order'] = f'{order}, :id'
+
+        # Count with the same filters as the real query.
+        count_params = {key: value
+                        for key, value in params.items()
+                        if not key.startswith('$') or key in ('$where', '$q')}
+        count_params['$select'] = 'count(*) AS count'
+        count_result = self.request(url, params=count_params, **kwargs)
+        total = int(count_result[0]['count']) if count_result else 0
+
+        start = params['$offset']
+        limit = params['$limit']
+        page_params = [{**params, '$offset': offset}
+                       for offset in range(start, total, limit)]
+        if not page_params:
+            return []
+
+        with ThreadPoolExecutor(max_workers=self.DEFAULT_WORKERS) as executor:
+            pages = list(executor.map(
+                lambda page: self.request(url, params=page, **kwargs),
+                page_params
+            ))
+
+        data: List[Dict] = []
+        for page in pages:
+            data.extend(page)
+
+        # If rows were added after we counted, we'll have more than we
+        # counted and the last page will be full, so pick up the rest the slow
+        # way. (If the count was a multiple of the page size, the last page is
+        # always full, so don't rely on that alone.)
+        if len(data) != total - start and len(pages[-1]) == limit:
+            last_offset = page_params[-1]['$offset']
+            rest = self._resource_sequential(
+                url, {**params, '$offset': last_offset + limit}, **kwargs
+            )
+            data.extend(rest)
+
+        return data
+
+    def dataset(self, resource_id: str, params: Dict = None, *,
+                parallel: bool = False) -> SocrataDataset:
+        """
+        Get the data from a Socrata resource as a ``SocrataDataset``. Each
+        resource (with the same ``params``) is only downloaded once for the
+        life of this ``SocrataApi`` object, so use this instead of
+        ``resource()`` when several functions need the same data.
+
+        Takes the same arguments as ``resource()``.
+        """
+        key = (resource_id, tuple(sorted((params or {}).items())))
+        with self._datasets_lock:
+            lock = self._dataset_locks.setdefault(key, Lock())
+
+        # Only hold the lock for this dataset while loading, so different
+        # datasets can load at the same time.
+        with lock:
+            if key not in self._datasets:
+                rows = self.resource(resource_id, params, parallel=parallel)
+                self._datasets[key] = SocrataDataset(rows)
+            return self._datasets[key]
+
     def metadata(self, resource_id: str, **kwargs: Any) -> Dict:
         return self.request(f'{self.metadata_url}{resource_id}.json', **kwargs)
+
+    def metadata_many(self, resource_ids: Iterable[str], **kwargs: Any) -> Dict[str, Dict]:
+        """
+        Get metadata for several resources at once.
+
+        Parameters
+        ----------
+        resource_ids : iterable of str
+            The IDs of the resources to get metadata for.
+
+        Returns
+        -------
+        dict
+            The metadata for each resource, keyed by resource ID.
+        """
+        unique_ids = list(dict.fromkeys(resource_ids))
+        with ThreadPoolExecutor(max_workers=self.DEFAULT_WORKERS) as executor:
+            results = executor.map(lambda resource_id: self.metadata(resource_id, **kwargs),
+                                   unique_ids)
+            return dict(zip(unique_ids, results))
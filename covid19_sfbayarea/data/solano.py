@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
-import requests
 import re
 from bs4 import BeautifulSoup  # type: ignore
 import json
 import logging
-from typing import List, Dict
+from os import getenv
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, timezone
 import dateutil.tz
-from ..webdriver import get_firefox
+from .cache import cached_session
 from .utils import get_data_model
 from ..errors import FormatError
 
@@ -18,11 +18,19 @@ logger = logging.getLogger(__name__)
 data_url = "https://services2.arcgis.com/SCn6czzcqKAFwdGU/ArcGIS/rest/services/COVID19Surveypt1v3_view/FeatureServer/0/query"
 # data2_url looks like a join on Race/Eth and Age Group
 data2_url = "https://services2.arcgis.com/SCn6czzcqKAFwdGU/ArcGIS/rest/services/COVID19Surveypt2v3_view_3/FeatureServer/0/query"
+# Columns from data2_url used for the age, race/ethnicity, and gender tables
+DEMOGRAPHIC_FIELDS = ('Age_group', 'AG_Total_cases', 'AG_deaths',
+                      'Race_ethnicity', 'RE_total_cases', 'RE_deaths',
+                      'Gender', 'G_Total_cases')
 metadata_url = 'https://services2.arcgis.com/SCn6czzcqKAFwdGU/ArcGIS/rest/services/COVID19Surveypt1v3_view/FeatureServer/0?f=pjson'
 
 # note, this is a link to just one dashboard, which is used to scrape the disclaimers.
 # The main public-facing interface with all dashboards is here: https://doitgis.maps.arcgis.com/apps/MapSeries/index.html?appid=055f81e9fe154da5860257e3f2489d67
 dashboard_url = 'https://doitgis.maps.arcgis.com/apps/opsdashboard/index.html#/d28335cd317a45cd84211cd290889c27'
+# The definition of the dashboard above, which includes the text it displays.
+dashboard_item_url = 'https://doitgis.maps.arcgis.com/sharing/rest/content/items/d28335cd317a45cd84211cd290889c27/data'
+
+session = cached_session(source='solano')
 
 def get_county() -> Dict:
     """Main method for populating county data .json"""
@@ -40,7 +48,7 @@ def get_county() -> Dict:
         "Deaths by gender not currently reported."])
 
     # fetch cases metadata, to get the timestamp
-    response = requests.get(metadata_url)
+    response = session.get(metadata_url)
     response.raise_for_status()
     metadata = response.json()
     timestamp = metadata["editingInfo"]["lastEditDate"]
@@ -54,9 +62,10 @@ def get_county() -> Dict:
 
     # get cases, deaths, and demographics data
     get_timeseries(out)
-    get_age_table(out)
-    get_gender_table(out)
-    get_race_eth(out)
+    demographics = get_demographics()
+    get_age_table(out, demographics)
+    get_gender_table(out, demographics)
+    get_race_eth(out, demographics)
 
     return out
 
@@ -87,7 +96,7 @@ def get_timeseries(out: Dict) -> None:
                     'resultType': 'none',
                     'outFields': 'Date_reported,cumulative_cases,total_deaths,residents_tested',
                     'orderByFields': 'date_reported asc', 'f': 'json'}
-    response = requests.get(data_url, params=param_list)
+    response = session.get(data_url, params=param_list)
     response.raise_for_status()
     parsed = response.json()
     features = [obj["attributes"] for obj in parsed['features']]
@@ -128,58 +137,228 @@ def get_timeseries(out: Dict) -> None:
 
 
 def get_notes() -> str:
-    """Scrape notes and disclaimers from dashboard."""
+    """
+    Get notes and disclaimers from the dashboard.
+
+    These are read from the dashboard's item definition (the JSON ArcGIS
+    uses to build the dashboard page), so no browser is needed. If that
+    fails or finds no notes, and the ``SOLANO_BROWSER_NOTES`` environment
+    variable is set, the rendered dashboard is scraped with Firefox instead.
+    Otherwise, the error is raised.
+    """
+    try:
+        notes = get_notes_from_item()
+        if not notes:
+            raise FormatError('No disclaimers found in the dashboard item')
+        return notes
+    except Exception:
+        if not getenv('SOLANO_BROWSER_NOTES'):
+            raise
+        logger.warning('Could not read notes from dashboard item; '
+                       'falling back to a browser', exc_info=True)
+        return get_notes_from_browser()
+
+
+def _find_notes(text_lines: Iterable[str]) -> List[str]:
     # As of 6/5/20, the only disclaimer is "Data update weekdays at 4:30pm"
     # As of 9/18/20, the only disclaimer is "Numbers are updated weekdays at 6:00 PM."
-    with get_firefox() as driver:
-        notes = []
-        match = re.compile('disclaimer?', re.IGNORECASE)
+    match = re.compile('disclaimer?', re.IGNORECASE)
+    return [line.strip() for line in text_lines if match.search(line)]
+
+
+def _item_strings(value: Any) -> Iterator[str]:
+    "Yield every string in a JSON structure."
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _item_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _item_strings(item)
+
+
+def _html_text(html: str) -> str:
+    "Get the text from some HTML, with a line break after each block."
+    soup = BeautifulSoup(html, 'html5lib')
+    for block in soup.find_all(['br', 'div', 'h1', 'h2', 'h3', 'h4', 'li', 'p']):
+        block.insert_after('\n')
+    return soup.get_text()
+
+
+def get_notes_from_item() -> str:
+    """
+    Find notes and disclaimers in the dashboard's item data. The text shown
+    on the dashboard (in text widgets, titles, descriptions, etc.) is stored
+    there as HTML, so this searches every string in it the same way
+    ``get_notes_from_browser`` searches the page.
+    """
+    response = session.get(dashboard_item_url, params={'f': 'json'})
+    response.raise_for_status()
+    item = response.json()
+    if 'error' in item:
+        raise FormatError(f'Could not load dashboard item: {item["error"]}')
+
+    notes: List[str] = []
+    for value in _item_strings(item):
+        if '<' in value:
+            value = _html_text(value)
+        for note in _find_notes(value.splitlines()):
+            if note not in notes:
+                notes.append(note)
+    return '\n\n'.join(notes)
+
+
+def get_notes_from_browser() -> str:
+    """Scrape notes and disclaimers from the rendered dashboard."""
+    # Only import Selenium if we actually need a browser.
+    from ..webdriver import get_browser
+
+    with get_browser() as driver:
         driver.implicitly_wait(30)
         driver.get(dashboard_url)
         soup = BeautifulSoup(driver.page_source, 'html5lib')
-        text = soup.get_text().splitlines()
-        for text_item in text:
-            if match.search(text_item):
-                notes.append(text_item.strip())
-        return '\n\n'.join(notes)
+        return '\n\n'.join(_find_notes(soup.get_text().splitlines()))
+
+
+def _positive(value: Optional[int]) -> bool:
+    return value is not None and value > 0
+
+
+def _is_race_eth_row(row: Dict) -> bool:
+    return _positive(row['RE_total_cases'])
+
 
+def _is_age_row(row: Dict) -> bool:
+    # Skip the group "Total_AG", which represents the sum total of all groups.
+    return _positive(row['AG_Total_cases']) and row['Age_group'] != 'Total_AG'
+
+
+def _is_gender_row(row: Dict) -> bool:
+    return _positive(row['G_Total_cases'])
+
+
+# For each demographic breakdown: a filter for days on which it was reported,
+# and a function that picks out the rows that have data for it.
+DEMOGRAPHIC_BREAKDOWNS: Dict[str, Tuple[str, Callable[[Dict], bool]]] = {
+    'race_eth': ("Race_ethnicity = 'Total_RE'", _is_race_eth_row),
+    'age_group': ("Age_group = 'Total_AG'", _is_age_row),
+    'gender': ('G_Total_cases > 0', _is_gender_row),
+}
 
-def get_race_eth (out: Dict)-> None :
+
+def _get_latest_day(where: str) -> str:
     """
-    Fetch cases by race and ethnicity
+    Get the latest day on which there are rows in the demographics layer that
+    match the ``where`` filter, as a string in format 'mm-dd-yyyy' to use in
+    other queries.
     """
-    # Link to map item: https://www.arcgis.com/home/webmap/viewer.html?url=https://services2.arcgis.com/SCn6czzcqKAFwdGU/ArcGIS/rest/services/COVID19Surveypt2v3_view_3/FeatureServer&source=sd
-    # The table view of the map item is a helpful reference.
-
-    # format query to get entry for latest date for race/eth reporting
-    # filter for any days on which a total race/eth was reported
-    param_list = {'where': "Race_ethnicity='Total_RE'",'outFields': '*', 'orderByFields':'Date_reported DESC', 'resultRecordCount': '1', 'f': 'json'}
-    response = requests.get(data2_url, params=param_list)
+    response = session.get(data2_url, params={
+        'where': where,
+        'outFields': 'Date_reported',
+        'orderByFields': 'Date_reported DESC',
+        'resultRecordCount': '1',
+        'f': 'json'
+    })
     response.raise_for_status()
     parsed = response.json()
     latest_day_timestamp = parsed['features'][0]['attributes']['Date_reported']
-    # translate timestamp  to a date string in format 'mm-dd-yyyy' to use in the query string
-    latest_day = datetime.fromtimestamp(latest_day_timestamp/1000, tz=timezone.utc).strftime('%m-%d-%Y')
+    return datetime.fromtimestamp(latest_day_timestamp/1000,
+                                  tz=timezone.utc).strftime('%m-%d-%Y')
+
+
+def _get_rows_for_day(day: str) -> List[Dict]:
+    """
+    Get every row in the demographics layer for a day. A day can have more
+    rows than the server sends in one response, so this loads them a page at
+    a time.
+    """
+    params: Dict[str, Any] = {
+        'where': f"Date_reported = '{day}'",
+        'outFields': ', '.join(DEMOGRAPHIC_FIELDS),
+        'f': 'json'
+    }
+    rows: List[Dict] = []
+    while True:
+        response = session.get(data2_url, params=params)
+        response.raise_for_status()
+        parsed = response.json()
+        rows.extend(entry['attributes'] for entry in parsed['features'])
+
+        if not parsed.get('exceededTransferLimit', False):
+            return rows
+        if not parsed['features']:
+            raise FormatError(f'Demographics for {day} were cut off at '
+                              f'{len(rows)} rows')
+
+        params = {**params, 'resultOffset': len(rows)}
+
+
+def get_demographics() -> Dict[str, List[Dict]]:
+    """
+    Fetch the rows of the demographics layer (``data2_url``) for the latest
+    day each demographic breakdown was reported on.
+
+    The layer is a join of age group, race/ethnicity, and gender: each row has
+    the columns for all three breakdowns. Rather than querying it separately
+    for each one, we make one query for the latest day any of them was
+    reported, and one for all that day's rows, then split them up in
+    ``get_age_table``, ``get_gender_table``, and ``get_race_eth``. If a
+    breakdown has no data on that day, its own latest day is fetched instead.
+
+    Returns
+    -------
+    dict
+        The attributes of each row for each breakdown, keyed by breakdown
+        (``'age_group'``, ``'gender'``, or ``'race_eth'``).
+    """
+    # Link to map item: https://www.arcgis.com/home/webmap/viewer.html?url=https://services2.arcgis.com/SCn6czzcqKAFwdGU/ArcGIS/rest/services/COVID19Surveypt2v3_view_3/FeatureServer&source=sd
+    # The table view of the map item is a helpful reference.
+    any_reported = ' OR '.join(f'({where})'
+                               for where, _ in DEMOGRAPHIC_BREAKDOWNS.values())
+    latest_day = _get_latest_day(any_reported)
+    rows = _get_rows_for_day(latest_day)
+
+    demographics = {}
+    for breakdown, (where, has_data) in DEMOGRAPHIC_BREAKDOWNS.items():
+        if any(has_data(row) for row in rows):
+            demographics[breakdown] = rows
+        else:
+            # The breakdowns are usually published together, but if this one
+            # wasn't updated on the latest day, use the last day it was.
+            breakdown_day = _get_latest_day(where)
+            logger.warning(f'No {breakdown} data on {latest_day}; '
+                           f'using {breakdown_day} instead')
+            demographics[breakdown] = _get_rows_for_day(breakdown_day)
+
+    return demographics
+
+
+def get_race_eth(out: Dict, demographics: Dict[str, List[Dict]] = None) -> None:
+    """
+    Fetch cases by race and ethnicity. If ``demographics`` (the result of
+    ``get_demographics()``) is not provided, it will be fetched.
+    """
+    if demographics is None:
+        demographics = get_demographics()
 
     # get all positive values for race/ethnicity total cases on the latest day
-    param2_list = {'where': f"RE_total_cases>0 AND Date_reported = '{latest_day}' ",'outFields': 'Race_ethnicity, RE_total_cases, RE_deaths', 'f': 'json'}
-    response2 = requests.get(data2_url, params=param2_list)
-    response2.raise_for_status()
-    parsed2 = response2.json()
+    rows = [row for row in demographics['race_eth'] if _is_race_eth_row(row)]
 
-    race_eth_cases = { entry['attributes']['Race_ethnicity']: entry['attributes']['RE_total_cases']  for entry in parsed2['features'] }
+    race_eth_cases = {row['Race_ethnicity']: row['RE_total_cases'] for row in rows}
     # A complete table will have 10 datapoints, as of 9/18/20. If there are any more or less, raise an error.
     if len(race_eth_cases) != 10:
         raise FormatError( f'Race_eth query did not return 10 groups. Results: {race_eth_cases}')
 
-    race_eth_deaths = { entry['attributes']['Race_ethnicity']: entry['attributes']['RE_deaths']  for entry in parsed2['features'] }
+    race_eth_deaths = {row['Race_ethnicity']: row['RE_deaths'] for row in rows}
     # save to the out dict
     out["case_totals"]["race_eth"] = race_eth_cases
     out["death_totals"]["race_eth"] = race_eth_deaths
 
-def get_age_table(out: Dict) -> None:
+def get_age_table(out: Dict, demographics: Dict[str, List[Dict]] = None) -> None:
     """
-    Fetch cases and deaths by age group
+    Fetch cases and deaths by age group. If ``demographics`` (the result of
+    ``get_demographics()``) is not provided, it will be fetched.
     Updates out with:
         {
             "cases_totals": {
@@ -190,40 +369,15 @@ def get_age_table(out: Dict) -> None:
             }
         }
     """
-    # Filter for any days on which a total age group cases was reported.
-    response = requests.get(data2_url, params={
-        'where': "Age_group='Total_AG'",
-        'outFields': 'Date_reported',
-        'orderByFields': 'Date_reported DESC',
-        'resultRecordCount': '1',
-        'f': 'json'
-    })
-    response.raise_for_status()
-    parsed = response.json()
-    latest_day_timestamp = parsed['features'][0]['attributes']['Date_reported']
-    # Translate timestamp  to a date string in format 'mm-dd-yyyy' to use in
-    # the next query.
-    latest_day = datetime.fromtimestamp(latest_day_timestamp/1000,
-                                        tz=timezone.utc).strftime('%m-%d-%Y')
-
-    # Get all positive values for age group total cases on the latest day.
-    # Skip the group "Total_AG", which represents the sum total of all groups.
-    response2 = requests.get(data2_url, params={
-        'where': f"""AG_Total_cases > 0
-                     AND Date_reported = '{latest_day}'
-                     AND Age_group <> 'Total_AG'""",
-        'outFields': 'Age_group, AG_Total_cases, AG_deaths',
-        'f': 'json'
-    })
-    response2.raise_for_status()
-    parsed2 = response2.json()
+    if demographics is None:
+        demographics = get_demographics()
 
     # Because of the way data is structured (ages, race/ethnicity groups, etc.
     # all on one line), some categories get repeated (even though the data is
     # not different). To handle this, create a dict with our groupings to
     # de-duplicate before formatting final results.
-    age_groups = {entry['attributes']['Age_group']: entry['attributes']
-                  for entry in parsed2['features']}
+    age_groups = {row['Age_group']: row for row in demographics['age_group']
+                  if _is_age_row(row)}
 
     age_group_cases = [{'group': group, 'raw_count': data['AG_Total_cases']}
                        for group, data in age_groups.items()]
@@ -239,39 +393,20 @@ def get_age_table(out: Dict) -> None:
     out["death_totals"]["age_group"] = age_group_deaths
 
 
-def get_gender_table(out: Dict) -> None:
+def get_gender_table(out: Dict, demographics: Dict[str, List[Dict]] = None) -> None:
     """
-    Fetch cases by gender.
+    Fetch cases by gender. If ``demographics`` (the result of
+    ``get_demographics()``) is not provided, it will be fetched.
     Updates out with:
         { "cases_totals": { "gender": {"male": 45, "female": 40, ... } } }
     """
-    # Filter for any days on which a Gender total cases number was reported.
-    response = requests.get(data2_url, params={
-        'where': "G_Total_cases>0",
-        'outFields': 'Date_reported',
-        'orderByFields': 'Date_reported DESC',
-        'resultRecordCount': '1',
-        'f': 'json'
-    })
-    response.raise_for_status()
-    parsed = response.json()
-    latest_day_timestamp = parsed['features'][0]['attributes']['Date_reported']
-    # Translate timestamp  to a date string in format 'mm-dd-yyyy' to use in
-    # the next query.
-    latest_day = datetime.fromtimestamp(latest_day_timestamp/1000,
-                                        tz=timezone.utc).strftime('%m-%d-%Y')
+    if demographics is None:
+        demographics = get_demographics()
 
     # get all positive values for Gender total cases reported on the latest day
-    response2 = requests.get(data2_url, params={
-        'where': f"G_Total_cases>0 AND Date_reported = '{latest_day}' ",
-        'outFields': 'Gender, G_Total_cases',
-        'f': 'json'
-    })
-    response2.raise_for_status()
-    parsed2 = response2.json()
-
-    gender_cases = {entry['attributes']['Gender'].lower(): entry['attributes']['G_Total_cases']
-                    for entry in parsed2['features']}
+    gender_cases = {row['Gender'].lower(): row['G_Total_cases']
+                    for row in demographics['gender']
+                    if _is_gender_row(row)}
 
     # A complete table will have at least 2 datapoints, as of 9/18/20. If were
     # less than 2, raise an error.
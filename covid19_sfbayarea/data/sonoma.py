@@ -1,41 +1,80 @@
-import requests
 import json
 import dateutil.parser
 from datetime import datetime, timezone
-from typing import List, Dict, Union
-from bs4 import BeautifulSoup, element # type: ignore
+from typing import List, Dict, NamedTuple, Union
+from bs4 import UnicodeDammit  # type: ignore
+from lxml import html  # type: ignore
+import requests
 from ..errors import FormatError
 from ..utils import assert_equal_sets
+from .cache import cached_session
 
 TimeSeriesItem = Dict[str, Union[str, int]]
 TimeSeries = List[TimeSeriesItem]
 UnformattedSeriesItem = Dict[str, str]
 UnformattedSeries = List[UnformattedSeriesItem]
 
-def get_section_by_title(header: str, soup: BeautifulSoup) -> element.Tag:
+session = cached_session(source='sonoma')
+
+def get_page_text(page: requests.Response) -> str:
+    """
+    Decode a page's HTML. If the server says what encoding it used, use that.
+    Otherwise requests assumes ISO-8859-1, so instead guess the way a browser
+    would: from a byte order mark or ``<meta charset>`` tag if there is one,
+    or else by trying UTF-8 before falling back to Windows-1252.
+    """
+    if 'charset' in page.headers.get('Content-Type', '').lower():
+        return page.text
+
+    return UnicodeDammit(page.content, is_html=True).unicode_markup
+
+class Section(NamedTuple):
+    element: html.HtmlElement
+    tables: List[html.HtmlElement]
+
+
+def index_sections(document: html.HtmlElement) -> Dict[str, Section]:
+    """
+    Find every ``h3`` header on the page and map its text to the section it
+    heads (the header's parent element) and the tables in that section.
+    Doing this once up front means we don't have to search the whole page for
+    each header we want.
+    """
+    sections: Dict[str, Section] = {}
+    for header_tag in document.iter('h3'):
+        title = header_tag.text_content()
+        if title not in sections:
+            parent = header_tag.getparent()
+            sections[title] = Section(parent, list(parent.iter('table')))
+
+    return sections
+
+def get_section_by_title(header: str, sections: Dict[str, Section]) -> Section:
     """
-    Takes in a header string and returns the parent element of that header
+    Takes in a header string and returns the section (from ``index_sections``)
+    whose title contains it
     """
-    header_tag = soup.find(lambda tag: tag.name == 'h3' and header in tag.get_text())
-    if not header_tag:
+    section = next((section for title, section in sections.items()
+                    if header in title), None)
+    if section is None:
         raise FormatError('The header "{0}" no longer corresponds to a section'.format(header))
 
-    return header_tag.find_parent()
+    return section
 
-def get_table(header: str, soup: BeautifulSoup) -> element.Tag:
+def get_table(header: str, sections: Dict[str, Section]) -> html.HtmlElement:
     """
-    Takes in a header and a BeautifulSoup object and returns the table under
-    that header
+    Takes in a header and the page's sections (from ``index_sections``) and
+    returns the table under that header
     """
-    tables = get_section_by_title(header, soup).find_all('table')
+    tables = get_section_by_title(header, sections).tables
     # this lets us get the second cases table
     return tables[-1]
 
-def get_cells(row: element.ResultSet) -> List[str]:
+def get_cells(row: html.HtmlElement) -> List[str]:
     """
     Gets all th and tr elements within a single tr element
     """
-    return [el.text for el in row.find_all(['th', 'td'])]
+    return [el.text_content() for el in row.iter('th', 'td')]
 
 def row_list_to_dict(row: List[str], headers: List[str]) -> UnformattedSeriesItem:
     """
@@ -44,17 +83,14 @@ def row_list_to_dict(row: List[str], headers: List[str]) -> UnformattedSeriesIte
     """
     return dict(zip(headers, row))
 
-def parse_table(tag: element.Tag) -> UnformattedSeries:
+def parse_table(tag: html.HtmlElement) -> UnformattedSeries:
     """
-    Takes in a BeautifulSoup table tag and returns a list of dictionaries
+    Takes in an lxml table element and returns a list of dictionaries
     where the keys correspond to header names and the values to corresponding cell values
     """
-    rows = tag.find_all('tr')
-    header = rows[0]
-    body = rows[1:]
-    header_cells = get_cells(header)
-    body_cells = (get_cells(row) for row in body)
-    return [row_list_to_dict(row, header_cells) for row in body_cells]
+    rows = tag.iter('tr')
+    header_cells = get_cells(next(rows))
+    return [row_list_to_dict(get_cells(row), header_cells) for row in rows]
 
 def parse_int(text: str) -> int:
     """
@@ -67,17 +103,17 @@ def parse_int(text: str) -> int:
     else:
         return int(text.replace(',', ''))
 
-def get_source_meta(soup: BeautifulSoup) -> str:
+def get_source_meta(sections: Dict[str, Section]) -> str:
     """
     Finds the 'Definitions' header on the page and gets all of the text in it.
     """
-    definitions_section = get_section_by_title('Definitions', soup)
-    definitions_text = definitions_section.text
+    definitions_section = get_section_by_title('Definitions', sections)
+    definitions_text = definitions_section.element.text_content()
     return definitions_text.replace('\n', '/').strip()
 
-def transform_cases(cases_tag: element.Tag) -> Dict[str, TimeSeries]:
+def transform_cases(cases_tag: html.HtmlElement) -> Dict[str, TimeSeries]:
     """
-    Takes in a BeautifulSoup tag for the cases table and returns all cases
+    Takes in a table element for the cases table and returns all cases
     (historic and active), deaths, and recoveries in the form:
     { 'cases': [], 'deaths': [] }
     Where each list contains dictionaries (representing each day's data)
@@ -107,19 +143,19 @@ def transform_cases(cases_tag: element.Tag) -> Dict[str, TimeSeries]:
     return { 'cases': cases, 'deaths': deaths }
 
 def transform_transmission(
-        transmission_tag: element.Tag,
+        transmission_tag: html.HtmlElement,
         total_cases: int,
         standardize: bool = True
 ) -> Dict[str, int]:
     """
-    Takes in a BeautifulSoup tag for the transmissions table and breaks it into
+    Takes in a table element for the transmissions table and breaks it into
     a dictionary. Fields are either the original from data source or are normalized
     into groups consistent with other datasets, by using `standardize=True` (default).
 
     Parameters
     ----------
-    transmission_tag : element.Tag
-        A BeautifulSoup table tag containing transmission source data
+    transmission_tag : html.HtmlElement
+        A table element containing transmission source data
 
     total_cases: int
         The total number of COVID-19 cases reported by the county
@@ -196,10 +232,10 @@ def transform_transmission(
 
     return transmissions
 
-def transform_tests(tests_tag: element.Tag) -> Dict[str, int]:
+def transform_tests(tests_tag: html.HtmlElement) -> Dict[str, int]:
     """
     Transform function for the tests table.
-    Takes in a BeautifulSoup tag for a table and returns a dictionary
+    Takes in a table element and returns a dictionary
     """
     tests = {}
     rows = parse_table(tests_tag)
@@ -208,10 +244,10 @@ def transform_tests(tests_tag: element.Tag) -> Dict[str, int]:
         tests[lower_res] = parse_int(row['Number'])
     return tests;
 
-def transform_gender(tag: element.Tag) -> Dict[str, int]:
+def transform_gender(tag: html.HtmlElement) -> Dict[str, int]:
     """
     Transform function for the cases by gender table.
-    Takes in a BeautifulSoup tag for a table and returns a dictionary
+    Takes in a table element and returns a dictionary
     in which the keys are strings and the values integers
     """
     genders = {}
@@ -226,10 +262,10 @@ def transform_gender(tag: element.Tag) -> Dict[str, int]:
         genders[gender_string_conversions[gender]] = cases
     return genders
 
-def transform_age(tag: element.Tag) -> TimeSeries:
+def transform_age(tag: html.HtmlElement) -> TimeSeries:
     """
     Transform function for the cases by age group table.
-    Takes in a BeautifulSoup tag for a table and returns a list of
+    Takes in a table element and returns a list of
     dictionaries in which the keys are strings and the values integers
     """
     categories: TimeSeries = []
@@ -241,9 +277,9 @@ def transform_age(tag: element.Tag) -> TimeSeries:
         categories.append(element)
     return categories
 
-def transform_race_eth(race_eth_tag: element.Tag) -> Dict[str, int]:
+def transform_race_eth(race_eth_tag: html.HtmlElement) -> Dict[str, int]:
     """
-    Takes in the BeautifulSoup tag for the cases by race/ethnicity table and
+    Takes in the table element for the cases by race/ethnicity table and
     transforms it into an object of form:
     'race_eth': {'Asian': -1, 'Latinx_or_Hispanic': -1, 'Other': -1, 'White':-1, 'Unknown': -1}
     """
@@ -282,9 +318,10 @@ def transform_race_eth(race_eth_tag: element.Tag) -> Dict[str, int]:
     return race_cases
 
 
-def get_table_tags(soup: BeautifulSoup) -> List[element.Tag]:
+def get_table_tags(sections: Dict[str, Section]) -> List[html.HtmlElement]:
     """
-    Takes in a BeautifulSoup object and returns an array of the tables we need
+    Takes in the page's sections (from ``index_sections``) and returns an
+    array of the tables we need
     """
     headers = [
         'Cases by Date',
@@ -294,7 +331,7 @@ def get_table_tags(soup: BeautifulSoup) -> List[element.Tag]:
         # 'Cases by Gender',   Data by gender no longer available
         'Cases by Race'
     ]
-    return [get_table(header, soup) for header in headers]
+    return [get_table(header, sections) for header in headers]
 
 def get_county() -> Dict:
     """
@@ -303,11 +340,11 @@ def get_county() -> Dict:
     url = 'https://socoemergency.org/emergency/novel-coronavirus/coronavirus-cases/'
     # need this to avoid 403 error ¯\_(ツ)_/¯
     headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_11_5) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/50.0.2661.102 Safari/537.36'}
-    page = requests.get(url, headers=headers)
+    page = session.get(url, headers=headers)
     page.raise_for_status()
-    sonoma_soup = BeautifulSoup(page.content, 'html5lib')
+    sections = index_sections(html.fromstring(get_page_text(page)))
 
-    hist_cases, total_tests, cases_by_source, cases_by_age, cases_by_race = get_table_tags(sonoma_soup)
+    hist_cases, total_tests, cases_by_source, cases_by_age, cases_by_race = get_table_tags(sections)
 
     # calculate total cases to compute values from percentages
     # we previously summed the cases across all genders, but with gender data unavailable,
@@ -323,7 +360,7 @@ def get_county() -> Dict:
         'name': 'Sonoma County',
         'update_time': datetime.now(timezone.utc).isoformat(),
         'source_url': url,
-        'meta_from_source': get_source_meta(sonoma_soup),
+        'meta_from_source': get_source_meta(sections),
         'meta_from_baypd': meta_from_baypd,
         'series': transform_cases(hist_cases),
         'case_totals': {
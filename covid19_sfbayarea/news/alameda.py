@@ -5,7 +5,7 @@ from typing import List, Optional
 from urllib.parse import urljoin
 from ..errors import FormatError
 from ..utils import parse_datetime
-from ..webdriver import get_firefox
+from ..webdriver import get_browser
 from .base import NewsScraper
 from .feed import NewsItem
 from .utils import get_base_url
@@ -79,7 +79,7 @@ class AlamedaNews(NewsScraper):
     URL = 'https://covid-19.acgov.org/press.page'
 
     def load_html(self, url: str) -> str:
-        with get_firefox() as driver:
+        with get_browser() as driver:
             # This page does a kind of nutty thing: it loads some javascript
             # that sets a cookie, then reloads the page, which then gives us
             # the actual content. Soooooo, we have to look for something that
@@ -5,7 +5,7 @@ from typing import List, Optional
 from urllib.parse import urljoin
 from ..errors import FormatError
 from ..utils import parse_datetime
-from ..webdriver import get_firefox
+from ..webdriver import get_browser
 from .base import NewsScraper
 from .feed import NewsItem
 from .utils import get_base_url
@@ -86,7 +86,7 @@ class ContraCostaNews(NewsScraper):
         # This page uses Wix, and if it thinks it's getting scraped, might
         # return a blank page with some JS code that sets cookies and reloads
         # the page with real content. Use Selenium to work around that.
-        with get_firefox() as driver:
+        with get_browser() as driver:
             driver.get(self.URL)
             driver.implicitly_wait(10)
             # Finding a heading for the year to check we're on the news page.
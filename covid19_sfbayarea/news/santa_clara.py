@@ -7,7 +7,7 @@ from typing import List
 from urllib.parse import urljoin
 from ..errors import FormatError
 from ..utils import parse_datetime
-from ..webdriver import get_firefox
+from ..webdriver import get_browser
 from .base import NewsScraper
 from .feed import NewsItem
 from .utils import get_base_url
@@ -45,7 +45,7 @@ class SantaClaraNews(NewsScraper):
     URL = 'https://www.sccgov.org/sites/phd/news/Pages/newsroom.aspx'
 
     def load_html(self, url: str) -> str:
-        with get_firefox() as driver:
+        with get_browser() as driver:
             driver.get(self.URL)
             driver.implicitly_wait(10)
             page_sources = []
@@ -2,9 +2,9 @@ import dateutil.parser
 import dateutil.tz
 import re
 from datetime import datetime, tzinfo
-from functools import reduce
+from functools import lru_cache, reduce
 import string
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Union
 from .errors import FormatError
 
 
@@ -12,6 +12,20 @@ US_SHORT_DATE_PATTERN = re.compile(r'^\s*\d+/\d+/\d+\s*$')
 PACIFIC_TIME = dateutil.tz.gettz('America/Los_Angeles')
 CURRENT_YEAR = datetime.utcnow().year
 
+# How many results to remember for each of the memoized date parsers below.
+# Scrapers tend to parse the same few hundred dates over and over, so this is
+# plenty to cover a whole run.
+DATE_CACHE_SIZE = 8192
+
+# Common formats that `datetime.fromisoformat` doesn't handle (on all Python
+# versions), and a pattern that matches strings in each one. These are tried
+# before falling back to dateutil's much slower general-purpose parser.
+KNOWN_DATE_FORMATS = (
+    (re.compile(r'^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d+Z$'), '%Y-%m-%dT%H:%M:%S.%f%z'),
+    (re.compile(r'^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ$'), '%Y-%m-%dT%H:%M:%S%z'),
+    (re.compile(r'^\d\d?/\d\d?/\d{4}$'), '%m/%d/%Y'),
+)
+
 
 def friendly_county(county_id: str) -> str:
     '''
@@ -38,15 +52,41 @@ def parse_datetime(
     Parse a datetime from a string and ensure it always has a timezone set. Use
     the `timezone` argument to set the timezone to use if none was specified in
     the parsed string.
+
+    Results are memoized, since the same dates tend to be parsed many times in
+    a run. See ``date_cache_stats()`` for how well that is working.
+    """
+    return _parse_datetime(date_string, _IdentityKey(timezone), correct_century)
+
+
+class _IdentityKey:
+    """
+    Wraps an object so it can be part of a cache key, comparing by identity.
+    (dateutil's timezones can't be hashed.)
     """
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __hash__(self) -> int:
+        return id(self.value)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _IdentityKey) and other.value is self.value
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_datetime(date_string: str, timezone_key: _IdentityKey,
+                    correct_century: bool) -> datetime:
     # Handle dumb typos that might be in the dates on the page :(
     if US_SHORT_DATE_PATTERN.match(date_string):
         if date_string.endswith('/202'):
             date_string += '0'
 
-    date = dateutil.parser.parse(date_string)
+    date = _parse_known_format(date_string) or dateutil.parser.parse(date_string)
     if date.tzinfo is None:
-        date = date.replace(tzinfo=timezone)
+        date = date.replace(tzinfo=timezone_key.value)
 
     # We often see dates from 1920 or 1921, which appear to be someone
     # accidentally entering a 2-digit year in a 4-digit year field, and some
@@ -61,6 +101,56 @@ def parse_datetime(
     return date
 
 
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def timestamp_to_date(timestamp_in_milliseconds: int) -> str:
+    """
+    Format a timestamp in milliseconds since the epoch (as used by Power BI and
+    ArcGIS) as an ISO 8601 date in UTC, e.g. ``'2020-05-01'``. Results are
+    memoized.
+    """
+    return datetime.utcfromtimestamp(timestamp_in_milliseconds / 1000).strftime('%Y-%m-%d')
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+
+def date_cache_stats() -> Dict[str, CacheStats]:
+    """
+    Get hit/miss stats for the memoized date parsers, keyed by function name.
+    """
+    caches = {
+        'parse_datetime': _parse_datetime.cache_info(),
+        'timestamp_to_date': timestamp_to_date.cache_info(),
+    }
+    return {name: CacheStats(hits=info.hits,
+                             misses=info.misses,
+                             size=info.currsize)
+            for name, info in caches.items()}
+
+
+def _parse_known_format(date_string: str) -> Optional[datetime]:
+    """
+    Quickly parse a date in ISO 8601 or one of the ``KNOWN_DATE_FORMATS``.
+    Returns ``None`` if the string is in some other format.
+    """
+    try:
+        return datetime.fromisoformat(date_string)
+    except ValueError:
+        pass
+
+    for pattern, date_format in KNOWN_DATE_FORMATS:
+        if pattern.match(date_string):
+            try:
+                return datetime.strptime(date_string, date_format)
+            except ValueError:
+                pass
+
+    return None
+
+
 def assert_equal_sets(a: Iterable, b: Iterable, description: str = 'items') -> None:
     """
     Raise a nicely formatted exception if the two arguments do not contain the
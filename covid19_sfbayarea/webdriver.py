@@ -1,5 +1,27 @@
+import atexit
+from contextlib import contextmanager
+import logging
 from os import getenv
 from selenium import webdriver  # type: ignore
+from selenium.common.exceptions import WebDriverException  # type: ignore
+from threading import Condition
+import time
+from typing import (Any, Callable, ContextManager, Generic, Iterator, List,
+                    NamedTuple, Optional, Set, TypeVar)
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Clears cookies and storage for *every* site (not just the current page's).
+# This runs in Firefox's privileged "chrome" context.
+CLEAR_ALL_DATA_SCRIPT = '''
+    Services.cookies.removeAll();
+    Services.clearData.deleteData(
+        Ci.nsIClearDataService.CLEAR_COOKIES |
+        Ci.nsIClearDataService.CLEAR_DOM_STORAGES,
+        () => {}
+    );
+'''
 
 
 def get_firefox() -> webdriver.Firefox:
@@ -8,7 +30,284 @@ def get_firefox() -> webdriver.Firefox:
 
     By default, this returns a headless Firefox. Set the ``FIREFOX_VISIBLE``
     environment variable to anything in order to get a non-headless browser.
+
+    Launching Firefox is slow, so scrapers should usually borrow a browser
+    with ``get_browser()`` instead of calling this directly.
     """
     options = webdriver.FirefoxOptions()
     options.headless = not getenv('FIREFOX_VISIBLE')
     return webdriver.Firefox(options=options)
+
+
+class BrowserPoolStats(NamedTuple):
+    launches: int
+    reuses: int
+    recycled: int
+    launch_time: float
+    acquire_time: float
+
+
+Driver = TypeVar('Driver')
+
+
+def _origin(url: str) -> Optional[str]:
+    parts = urlsplit(url)
+    if parts.scheme in ('http', 'https') and parts.netloc:
+        return f'{parts.scheme}://{parts.netloc}/'
+    return None
+
+
+class _PooledBrowser(Generic[Driver]):
+    """
+    A browser in a ``BrowserPool``. Keeps track of the sites it has been sent
+    to with ``get()``, so their cookies and storage can be cleared even if the
+    browser can't clear everything at once.
+    """
+    def __init__(self, driver: Driver):
+        self.driver = driver
+        self.uses = 0
+        self.origins: Set[str] = set()
+
+        original_get = getattr(driver, 'get')
+
+        def get(url: str) -> Any:
+            self.record_origin(url)
+            return original_get(url)
+
+        setattr(driver, 'get', get)
+
+    def record_origin(self, url: str) -> None:
+        origin = _origin(url)
+        if origin:
+            self.origins.add(origin)
+
+
+class BrowserPool(Generic[Driver]):
+    """
+    Keeps running browsers around so they can be reused, instead of starting
+    a new browser (which can take several seconds) every time a scraper
+    needs one.
+
+    Borrow a browser with ``acquire()``. When it is returned, its cookies and
+    storage are cleared for every site it visited, extra windows are closed,
+    and it is left on a blank page, so the next user starts fresh. A browser is shut down instead of
+    being reused after ``max_uses`` uses or if it raised a
+    ``WebDriverException`` (which usually means it crashed).
+
+    Parameters
+    ----------
+    launch
+        Function that starts a new browser, e.g. ``get_firefox``.
+    max_size
+        The most browsers that can be running at once. If all of them are in
+        use, ``acquire()`` waits for one to be returned.
+    max_uses
+        How many times a browser can be used before it is replaced.
+
+    Examples
+    --------
+    >>> pool = BrowserPool(get_firefox)
+    >>> with pool.acquire() as driver:
+    ...     driver.get('https://www.example.com/')
+    ...     html = driver.page_source
+    >>> pool.close()
+    """
+    def __init__(self, launch: Callable[[], Driver],
+                 max_size: int = 2, max_uses: int = 20):
+        self.launch = launch
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self._idle: List[_PooledBrowser[Driver]] = []
+        self._size = 0
+        self._available = Condition()
+        self._launches = 0
+        self._reuses = 0
+        self._recycled = 0
+        self._launch_time = 0.0
+        self._acquire_time = 0.0
+
+    @contextmanager
+    def acquire(self) -> Iterator[Driver]:
+        "Borrow a browser from the pool for the duration of a ``with`` block."
+        browser = self._checkout()
+        healthy = True
+        try:
+            yield browser.driver
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            self._checkin(browser, healthy)
+
+    def stats(self) -> BrowserPoolStats:
+        """
+        Get counts of how many browsers were launched and reused, and the
+        total time (in seconds) spent launching browsers and waiting for
+        ``acquire()`` (which includes launching).
+        """
+        with self._available:
+            return BrowserPoolStats(launches=self._launches,
+                                    reuses=self._reuses,
+                                    recycled=self._recycled,
+                                    launch_time=self._launch_time,
+                                    acquire_time=self._acquire_time)
+
+    def close(self) -> None:
+        "Shut down all the idle browsers in the pool."
+        with self._available:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._available.notify_all()
+
+        for browser in idle:
+            self._quit(browser)
+
+    def _checkout(self) -> _PooledBrowser[Driver]:
+        start = time.monotonic()
+        browser: Optional[_PooledBrowser[Driver]] = None
+        with self._available:
+            while not self._idle and self._size >= self.max_size:
+                self._available.wait()
+
+            if self._idle:
+                browser = self._idle.pop()
+                self._reuses += 1
+            else:
+                # Reserve a slot so other threads don't launch too many
+                # browsers while this one is starting.
+                self._size += 1
+
+        if browser is None:
+            try:
+                browser = self._launch()
+            except Exception:
+                with self._available:
+                    self._size -= 1
+                    self._available.notify()
+                raise
+
+        browser.uses += 1
+        elapsed = time.monotonic() - start
+        with self._available:
+            self._acquire_time += elapsed
+        logger.debug(f'Acquired browser in {elapsed:.2f}s '
+                     f'(use {browser.uses} of {self.max_uses})')
+        return browser
+
+    def _launch(self) -> _PooledBrowser[Driver]:
+        start = time.monotonic()
+        driver = self.launch()
+        elapsed = time.monotonic() - start
+        with self._available:
+            self._launches += 1
+            self._launch_time += elapsed
+        logger.info(f'Launched browser in {elapsed:.2f}s')
+        return _PooledBrowser(driver)
+
+    def _checkin(self, browser: _PooledBrowser[Driver], healthy: bool) -> None:
+        if healthy and browser.uses < self.max_uses:
+            healthy = self._reset(browser)
+
+        if healthy and browser.uses < self.max_uses:
+            with self._available:
+                self._idle.append(browser)
+                self._available.notify()
+        else:
+            self._quit(browser)
+            with self._available:
+                self._size -= 1
+                self._recycled += 1
+                self._available.notify()
+
+    def _reset(self, browser: _PooledBrowser[Driver]) -> bool:
+        """
+        Clear out everything the last user did in a browser. Returns whether
+        the browser still works.
+        """
+        driver: Any = browser.driver
+        try:
+            # Close extra windows, clearing the sites they're on first.
+            handles = driver.window_handles
+            for handle in reversed(handles):
+                driver.switch_to.window(handle)
+                browser.record_origin(driver.current_url)
+                if handle != handles[0]:
+                    driver.close()
+            driver.switch_to.window(handles[0])
+            driver.implicitly_wait(0)
+
+            if not self._clear_all_data(driver):
+                # Selenium can only clear cookies and storage for the page
+                # the browser is on, so visit each site the browser has been
+                # to and clear them there.
+                for origin in sorted(browser.origins):
+                    driver.get(origin)
+                    self._clear_page_data(driver)
+
+            driver.get('about:blank')
+            return True
+        except WebDriverException:
+            logger.warning('Browser could not be reset; replacing it',
+                           exc_info=True)
+            return False
+
+    def _clear_all_data(self, driver: Any) -> bool:
+        """
+        Try to clear cookies and storage for all sites at once. This only
+        works in Firefox. Returns whether it worked.
+        """
+        try:
+            with driver.context(driver.CONTEXT_CHROME):
+                driver.execute_script(CLEAR_ALL_DATA_SCRIPT)
+            return True
+        except (AttributeError, WebDriverException):
+            logger.debug('Could not clear all browser data at once',
+                         exc_info=True)
+            return False
+
+    def _clear_page_data(self, driver: Any) -> None:
+        "Clear cookies and storage for the site the browser is on."
+        driver.delete_all_cookies()
+        try:
+            driver.execute_script('window.localStorage.clear();'
+                                  'window.sessionStorage.clear();')
+        except WebDriverException:
+            # Some pages have no storage (or don't allow access to it).
+            pass
+
+    def _quit(self, browser: _PooledBrowser[Driver]) -> None:
+        try:
+            getattr(browser.driver, 'quit')()
+        except Exception:
+            logger.warning('Error shutting down browser', exc_info=True)
+
+
+_firefox_pool: BrowserPool[webdriver.Firefox] = BrowserPool(
+    get_firefox,
+    max_size=int(getenv('BROWSER_POOL_SIZE', 2)),
+    max_uses=int(getenv('BROWSER_MAX_USES', 20)))
+atexit.register(_firefox_pool.close)
+
+
+def get_browser() -> ContextManager[webdriver.Firefox]:
+    """
+    Borrow a headless Firefox (see ``get_firefox``) from a shared pool, so
+    that scrapers running one after the other (or in the same process as
+    other scrapers) don't each have to start their own. Use it in a ``with``
+    statement; the browser is returned to the pool at the end of the block.
+
+    The ``BROWSER_POOL_SIZE`` environment variable sets how many browsers
+    can run at once (default: 2) and ``BROWSER_MAX_USES`` sets how many times
+    each one is reused before it is replaced (default: 20).
+
+    Examples
+    --------
+    >>> with get_browser() as driver:
+    ...     driver.get('https://www.example.com/')
+    """
+    return _firefox_pool.acquire()
+
+
+def browser_pool_stats() -> BrowserPoolStats:
+    "Get launch and timing stats for the browsers used by ``get_browser()``."
+    return _firefox_pool.stats()
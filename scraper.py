@@ -1,21 +1,204 @@
 #!/usr/bin/env python3
+import codecs
 import requests
 import json
-from typing import List, Dict
+import re
+from typing import Any, Iterable, Iterator, List, Dict, Optional
 
-def get_json() -> List[Dict]:
+# How many bytes of the response to read at a time.
+CHUNK_SIZE = 64 * 1024
+
+# Characters that matter for finding the end of a JSON list or object.
+JSON_STRUCTURE = re.compile(r'[\[\]{}"\\]')
+# Characters that can end a number, ``true``, ``false``, or ``null``.
+JSON_SCALAR_END = re.compile(r'[\s,\]}]')
+JSON_CLOSERS = {']': '[', '}': '{'}
+
+class _JsonValueScanner:
+    """
+    Finds where a JSON value ends when its text arrives a piece at a time.
+    Each piece is only scanned once, so finding the end of a large value split
+    across many pieces takes time proportional to its length. Brackets that
+    don't match are reported as soon as they are seen.
+    """
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        "Get ready to scan a new value."
+        self.scalar: Optional[bool] = None
+        self.open_brackets: List[str] = []
+        self.in_string = False
+        # Characters to skip at the start of the next piece (the rest of an
+        # escape sequence that was split between pieces).
+        self.skip = 0
+
+    def scan(self, text: str, start: int, final: bool) -> Optional[int]:
+        """
+        Scan ``text`` from ``start`` (the start of the value, or of the next
+        piece of it). Returns the index just past the end of the value, or
+        ``None`` if it continues in the next piece.
+        """
+        if self.scalar is None:
+            self.scalar = text[start] not in '[{"'
+
+        if self.scalar:
+            match = JSON_SCALAR_END.search(text, start)
+            if match:
+                return match.start()
+            return len(text) if final else None
+
+        position = start + self.skip
+        self.skip = 0
+        while True:
+            match = JSON_STRUCTURE.search(text, position)
+            if not match:
+                return None
+
+            character = match.group()
+            position = match.end()
+            if self.in_string:
+                if character == '\\':
+                    # Skip the escaped character, which may be in the next
+                    # piece.
+                    self.skip = max(0, position + 1 - len(text))
+                    position += 1
+                elif character == '"':
+                    self.in_string = False
+                    if not self.open_brackets:
+                        return position
+            elif character == '"':
+                self.in_string = True
+            elif character in JSON_CLOSERS:
+                if (not self.open_brackets or
+                        self.open_brackets.pop() != JSON_CLOSERS[character]):
+                    raise ValueError(f'Unexpected {character!r} in JSON')
+                if not self.open_brackets:
+                    return position
+            elif character in '[{':
+                self.open_brackets.append(character)
+            else:
+                raise ValueError('Unexpected "\\" in JSON')
+
+def iter_json_list(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Incrementally parses a JSON list from chunks of UTF-8 encoded bytes,
+    yielding each item in the list as soon as it has been read. Only the item
+    currently being parsed is kept in memory, so this uses about the same
+    amount of memory no matter how long the list is.
+
+    An item that is split across chunks is only decoded once all of it has
+    arrived, and a ``ValueError`` is raised as soon as an item turns out to be
+    invalid (not when the response ends).
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    scanner = _JsonValueScanner()
+    buffer = ''
+    index = 0
+    # The text of an item that continues into the next chunk, in pieces.
+    pieces: List[str] = []
+    # What we expect to find next: 'start' (the opening bracket), 'item',
+    # 'item_or_end', 'separator' (a comma or closing bracket), or 'done'.
+    expecting = 'start'
+    chunk_iterator = iter(chunks)
+    final = False
+    while not final:
+        chunk = next(chunk_iterator, None)
+        final = chunk is None
+        text = text_decoder.decode(chunk or b'', final=final)
+        if pieces:
+            # Carry on with the item we were in the middle of.
+            text_end = scanner.scan(text, 0, final)
+            pieces.append(text)
+            if text_end is None:
+                continue
+            buffer = ''.join(pieces)
+            pieces = []
+            item_end = len(buffer) - len(text) + text_end
+            yield _decode_json_item(decoder, buffer, 0, item_end)
+            scanner.reset()
+            index = item_end
+            expecting = 'separator'
+        else:
+            buffer = buffer[index:] + text
+            index = 0
+
+        while True:
+            while index < len(buffer) and buffer[index].isspace():
+                index += 1
+            if index == len(buffer) or expecting == 'done':
+                break
+
+            character = buffer[index]
+            if expecting == 'start':
+                if character != '[':
+                    raise ValueError(f'Expected a JSON list, found {character!r}')
+                index += 1
+                expecting = 'item_or_end'
+            elif expecting == 'separator' or (expecting == 'item_or_end'
+                                              and character == ']'):
+                if character == ']':
+                    expecting = 'done'
+                elif character == ',':
+                    expecting = 'item'
+                else:
+                    raise ValueError(f'Expected "," or "]", found {character!r}')
+                index += 1
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, index)
+                    # A number at the end of the buffer might continue in
+                    # the next chunk, so it isn't finished yet.
+                    complete = (end < len(buffer) or final
+                                or character in '[{"')
+                except json.JSONDecodeError:
+                    complete = False
+
+                if not complete:
+                    # Either the item is invalid or it continues in the next
+                    # chunk. Find out where it ends (if it does) without
+                    # decoding it again for every chunk.
+                    scanned_end = scanner.scan(buffer, index, final)
+                    if scanned_end is None:
+                        pieces = [buffer[index:]]
+                        buffer = ''
+                        index = 0
+                        break
+                    end = scanned_end
+                    item = _decode_json_item(decoder, buffer, index, end)
+                    scanner.reset()
+
+                yield item
+                index = end
+                expecting = 'separator'
+
+    if expecting != 'done':
+        raise ValueError('Unexpected end of JSON list')
+
+def _decode_json_item(decoder: json.JSONDecoder, text: str, start: int,
+                      end: int) -> Any:
+    "Decode the JSON value that runs from ``start`` to ``end`` in ``text``."
+    item, item_end = decoder.raw_decode(text, start)
+    if item_end != end:
+        raise ValueError(f'Invalid JSON: {text[start:end]!r}')
+    return item
+
+def get_json() -> Iterator[Dict]:
     """
     Fetches location-keyed data in JSON format from the CDS
-    and parses it into a dict
+    and parses it into a dict for each location. The response is parsed as it
+    is downloaded, so the whole file (which covers every location worldwide)
+    is never held in memory at once.
     Since 8/31/2020, the CDS site has not been updating data.
     Seems the public site is busted but the data is still updating and
     available directly from the updated link below.
     Keep watching the issue: https://github.com/covidatlas/li/issues/606
     """
     corona_url = 'https://liproduction-reportsbucket-bhk8fnhv1s76.s3-us-west-1.amazonaws.com/v1/latest/timeseries-byLocation.json'
-    raw_response = requests.get(corona_url)
-    parsed_json = json.loads(raw_response.content)
-    return parsed_json
+    with requests.get(corona_url, stream=True) as response:
+        response.raise_for_status()
+        yield from iter_json_list(response.iter_content(chunk_size=CHUNK_SIZE))
 
 def clean_dates(dates: Dict[str,Dict]) -> List[Dict]:
     """
@@ -30,14 +213,16 @@ def clean_dates(dates: Dict[str,Dict]) -> List[Dict]:
         date_list.append(val)
     return date_list
 
-def get_county_data(county_names: List[str], data: List[Dict]) -> Dict:
+def get_county_data(county_names: List[str], data: Iterable[Dict]) -> Dict:
     """
     Takes in a list of county names and maps the corresponding county data
-    to that list
+    to that list. Locations that aren't in the list are discarded as soon as
+    they are read.
     """
+    wanted = set(county_names)
     county_dicts = {}
     for county_data in data:
-        if county_data['name'] in county_names:
+        if county_data['name'] in wanted:
             clean_county_data = {}
             county_name = county_data['countyName']
             clean_county_data['name'] = county_name
@@ -66,5 +251,6 @@ bay_area_counties = [
     'Napa County, California, United States',
     'Marin County, California, United States'
 ]
-covid_data = pipeline(bay_area_counties)
-print(json.dumps(covid_data, indent=4))
+if __name__ == '__main__':
+    covid_data = pipeline(bay_area_counties)
+    print(json.dumps(covid_data, indent=4))
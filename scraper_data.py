@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 import click
+from concurrent.futures import ThreadPoolExecutor
 import json
 import logging
 import os
 from covid19_sfbayarea import data as data_scrapers
-from covid19_sfbayarea.utils import friendly_county
+from covid19_sfbayarea.utils import date_cache_stats, friendly_county
 from sys import exit
 import traceback
 from typing import Tuple
@@ -13,6 +14,8 @@ from pathlib import Path
 
 COUNTY_NAMES : Tuple[str,...]= tuple(data_scrapers.scrapers.keys())
 
+logger = logging.getLogger(__name__)
+
 
 @click.command(help='Create a .json with data for one or more counties. Supported '
                     f'counties: {", ".join(COUNTY_NAMES)}.')
@@ -20,16 +23,26 @@ COUNTY_NAMES : Tuple[str,...]= tuple(data_scrapers.scrapers.keys())
                 type=click.Choice(COUNTY_NAMES, case_sensitive=False))
 @click.option('--output', metavar='PATH',
               help='write output file to this directory')
-def main(counties: Tuple[str,...], output: str) -> None:
+@click.option('--jobs', metavar='N', default=1, type=click.IntRange(min=1),
+              help='scrape up to N counties at the same time')
+def main(counties: Tuple[str,...], output: str, jobs: int) -> None:
     out = dict()
     failed_counties = False
     if len(counties) == 0:
         counties = COUNTY_NAMES
 
-    # Run each scraper's get_county() method. Assign the output to out[county]
-    for county in counties:
+    # Run each scraper's get_county() method in a pool of up to `jobs` threads.
+    # Results are collected in the order the counties were listed (not the
+    # order they finished in) so the output is always the same.
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [(county,
+                    executor.submit(data_scrapers.scrapers[county].get_county))
+                   for county in counties]
+
+    # Assign the output to out[county]
+    for county, future in futures:
         try:
-            out[county] = data_scrapers.scrapers[county].get_county()
+            out[county] = future.result()
         except Exception as error:
             failed_counties = True
             message = click.style(f'{friendly_county(county)} county failed',
@@ -46,6 +59,11 @@ def main(counties: Tuple[str,...], output: str) -> None:
     else:
         print(json.dumps(out,indent=2))
 
+    # Log how often the same dates were parsed, so we know the caching is
+    # actually helping (run with LOG_LEVEL=INFO to see this).
+    for name, stats in date_cache_stats().items():
+        logger.info(f'{name} cache: {stats.hits} hits, {stats.misses} misses')
+
     if not out: exit(70) # all counties failed
     if failed_counties: exit(1) # some counties failed
 
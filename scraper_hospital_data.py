@@ -3,13 +3,14 @@
 """Script for pulling down CA COVID-19 hospitalization stats"""
 
 import click
+from contextlib import ExitStack
 import json
 import logging
 import os
 import traceback
 import sys
 from pathlib import Path
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 from covid19_sfbayarea import ca_counties
 from covid19_sfbayarea.data import hospitals
@@ -18,6 +19,42 @@ from covid19_sfbayarea.data import hospitals
 all_ca_counties = sorted(ca_counties.bay_area_counties + ca_counties.other_ca_counties)
 
 
+def write_ndjson(counties: List[str], output: Optional[str]) -> int:
+    """
+    Stream hospitalization records as newline-delimited JSON, writing each
+    record as soon as it is downloaded. If ``output`` is set, this writes the
+    metadata to ``hospital_data/meta.json`` and each county's records to
+    ``hospital_data/<county>.ndjson`` in that directory. Otherwise, it prints
+    all the records. Returns the number of records written.
+    """
+    header, records = hospitals.stream_timeseries(counties)
+    count = 0
+
+    if output:
+        directory = Path(output, 'hospital_data')
+        directory.mkdir(parents=True, exist_ok=True)
+        with directory.joinpath('meta.json').open('w', encoding='utf-8') as f:
+            json.dump(header, f, ensure_ascii=False, indent=2)
+
+        with ExitStack() as stack:
+            files = {
+                county: stack.enter_context(
+                    directory.joinpath(f'{county}.ndjson').open('w', encoding='utf-8')
+                )
+                for county in counties
+            }
+            for county, record in records:
+                files[county].write(json.dumps(record, ensure_ascii=False) + '\n')
+                count += 1
+
+    else:
+        for _county, record in records:
+            print(json.dumps(record))
+            count += 1
+
+    return count
+
+
 @click.command(
     help="Pull down COVID-19-related hospitalization data "
          "from the California Dept. of Public Health"
@@ -33,9 +70,24 @@ all_ca_counties = sorted(ca_counties.bay_area_counties + ca_counties.other_ca_co
     metavar='PATH',
     help='write output file to this directory'
 )
-def main(counties: Tuple[str], output: str) -> None:
+@click.option(
+    '--ndjson',
+    is_flag=True,
+    help='stream records as newline-delimited JSON (one file per county '
+         'with --output) instead of building a single JSON document'
+)
+def main(counties: Tuple[str], output: str, ndjson: bool) -> None:
 
     try:
+        if ndjson:
+            if not write_ndjson(list(counties) or ca_counties.bay_area_counties, output):
+                message = click.style(
+                    'Hospitalization data fetch came back empty ', fg='red'
+                )
+                click.echo(message, err=True)
+                sys.exit(1)
+            return
+
         if counties:
             out = hospitals.get_timeseries(list(counties))
 
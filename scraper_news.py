@@ -3,6 +3,7 @@ import click
 from datetime import datetime, timedelta
 from covid19_sfbayarea import news
 from covid19_sfbayarea.utils import friendly_county, parse_datetime
+from covid19_sfbayarea.webdriver import browser_pool_stats
 import logging
 import os
 import sys
@@ -13,6 +14,8 @@ from typing import cast, Tuple
 
 COUNTY_NAMES = cast(Tuple[str], tuple(news.scrapers.keys()))
 
+logger = logging.getLogger(__name__)
+
 
 def cli_date(date_string: str) -> datetime:
     '''Parse a CLI date or number of days into a TZ-aware datetime.'''
@@ -87,6 +90,13 @@ def main(counties: Tuple[str], from_: datetime, format: Tuple[str], output: str)
             click.echo(f'{message}: {error}', err=True)
             traceback.print_exc()
 
+    # Log how much time went to starting browsers (run with LOG_LEVEL=INFO to
+    # see this). Counties that need a browser share them through a pool.
+    stats = browser_pool_stats()
+    logger.info(f'Browsers: {stats.launches} launched in '
+                f'{stats.launch_time:.2f}s, {stats.reuses} reused, '
+                f'{stats.acquire_time:.2f}s total acquire time')
+
     if error_count == len(counties):
         sys.exit(70)
     elif error_count > 0:
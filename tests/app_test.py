@@ -0,0 +1,77 @@
+import gzip
+import json
+import pytest
+from threading import Event, Thread
+import time
+from typing import Dict, Iterator
+import app as app_module
+from app import Snapshot, app
+
+
+@pytest.fixture
+def snapshot(monkeypatch: pytest.MonkeyPatch) -> Iterator[Snapshot]:
+    loads = []
+
+    def load() -> Dict:
+        loads.append(time.time())
+        return {'Marin County': {'name': 'Marin County', 'loads': len(loads)}}
+
+    snapshot = Snapshot(load, interval=3600)
+    snapshot.loads = loads  # type: ignore
+    monkeypatch.setattr(app_module, 'snapshot', snapshot)
+    yield snapshot
+
+
+class TestScrape:
+    def test_returns_data(self, snapshot: Snapshot) -> None:
+        response = app.test_client().get('/scrape')
+        assert response.status_code == 200
+        assert response.json == {'Marin County': {'name': 'Marin County',
+                                                  'loads': 1}}
+        assert response.headers['ETag']
+
+    def test_does_not_reload_for_each_request(self, snapshot: Snapshot) -> None:
+        client = app.test_client()
+        client.get('/scrape')
+        client.get('/scrape')
+        assert len(snapshot.loads) == 1  # type: ignore
+
+    def test_supports_etags(self, snapshot: Snapshot) -> None:
+        client = app.test_client()
+        etag = client.get('/scrape').headers['ETag']
+        response = client.get('/scrape', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_supports_gzip(self, snapshot: Snapshot) -> None:
+        response = app.test_client().get('/scrape',
+                                         headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.data))['Marin County']
+
+
+def test_snapshot_loads_once_for_concurrent_requests() -> None:
+    started = Event()
+    release = Event()
+    loads = []
+
+    def load() -> Dict:
+        loads.append(1)
+        started.set()
+        release.wait(5)
+        return {}
+
+    snapshot = Snapshot(load, interval=3600)
+    results = []
+    threads = [Thread(target=lambda: results.append(snapshot.get()))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(loads) == 1
+    assert len(results) == 5
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,57 @@
+from covid19_sfbayarea.data.arcgis import ArcGisFeatureServer, statistic
+import json
+from typing import Any, Dict
+from unittest.mock import patch
+
+
+class FakeResponse:
+    def __init__(self, data: Dict) -> None:
+        self.data = data
+        self.headers = {'Content-Type': 'application/json'}
+
+    def json(self) -> Dict:
+        return self.data
+
+
+def fake_get(url: str, params: Dict = None, **kwargs: Any) -> FakeResponse:
+    params = params or {}
+    field = params['groupByFieldsForStatistics']
+    offset = params.get('resultOffset', 0)
+    # Return two pages of results for each query.
+    return FakeResponse({
+        'features': [{'attributes': {field: f'{field}-{offset}', 'count': 1}}],
+        'exceededTransferLimit': offset == 0,
+    })
+
+
+class TestQueryMany:
+    def test_returns_all_results_for_each_query(self) -> None:
+        api = ArcGisFeatureServer('https://services.example.com/abc')
+        with patch.object(api.session, 'get', side_effect=fake_get) as get:
+            results = api.query_many({
+                'gender': {'service': 'Cases', 'groupByFieldsForStatistics': 'Sex'},
+                'age': {'service': 'Cases', 'groupByFieldsForStatistics': 'Age'},
+            })
+
+        assert results == {
+            'gender': [{'Sex': 'Sex-0', 'count': 1}, {'Sex': 'Sex-1', 'count': 1}],
+            'age': [{'Age': 'Age-0', 'count': 1}, {'Age': 'Age-1', 'count': 1}],
+        }
+        assert get.call_count == 4
+
+
+class TestQuery:
+    def test_sends_statistics(self) -> None:
+        api = ArcGisFeatureServer('https://services.example.com/abc')
+        with patch.object(api.session, 'get', side_effect=fake_get) as get:
+            list(api.query('Cases',
+                           outStatistics=[statistic('count', 'ObjectId', 'count')],
+                           groupByFieldsForStatistics='Sex'))
+
+        params = get.call_args.kwargs['params']
+        assert params['f'] == 'json'
+        assert json.loads(params['outStatistics']) == [{
+            'statisticType': 'count',
+            'onStatisticField': 'ObjectId',
+            'outStatisticFieldName': 'count',
+        }]
@@ -0,0 +1,69 @@
+from covid19_sfbayarea.data.arcgis_pbf import decode_feature_collection
+import struct
+from typing import Any
+
+
+def varint(value: int) -> bytes:
+    result = b''
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            result += bytes([byte | 0x80])
+        else:
+            return result + bytes([byte])
+
+
+def field(number: int, value: Any) -> bytes:
+    "Encode a field as a varint (for ints) or length-delimited (for bytes)."
+    if isinstance(value, int):
+        return varint(number << 3) + varint(value)
+    return varint(number << 3 | 2) + varint(len(value)) + value
+
+
+def fixed64(number: int, value: float) -> bytes:
+    return varint(number << 3 | 1) + struct.pack('<d', value)
+
+
+def feature_collection(*features: bytes, exceeded: bool = False) -> bytes:
+    fields = b''.join(field(13, field(1, name.encode('utf-8')))
+                      for name in ('Sex', 'count', 'DtDeath', 'rate'))
+    result = fields + b''.join(field(15, feature) for feature in features)
+    if exceeded:
+        result += field(9, 1)
+    return field(1, b'2.0') + field(2, field(1, result))
+
+
+def feature(sex: bytes, count: int, death: int, rate: float) -> bytes:
+    values = [
+        field(1, sex) if sex else b'',
+        field(5, count),
+        field(6, death),
+        fixed64(3, rate),
+    ]
+    return b''.join(field(1, value) for value in values)
+
+
+class TestDecodeFeatureCollection:
+    def test_decodes_attributes(self) -> None:
+        data = feature_collection(
+            feature(b'Female', 120, 1620000000000, 0.25),
+            feature(b'', 3, 1620086400000, 1.5),
+        )
+        assert decode_feature_collection(data) == {
+            'features': [
+                {'attributes': {'Sex': 'Female', 'count': 120,
+                                'DtDeath': 1620000000000, 'rate': 0.25}},
+                {'attributes': {'Sex': None, 'count': 3,
+                                'DtDeath': 1620086400000, 'rate': 1.5}},
+            ],
+            'exceededTransferLimit': False,
+        }
+
+    def test_decodes_exceeded_transfer_limit(self) -> None:
+        data = feature_collection(feature(b'Male', 1, 0, 0.0), exceeded=True)
+        assert decode_feature_collection(data)['exceededTransferLimit'] is True
+
+    def test_decodes_empty_results(self) -> None:
+        assert decode_feature_collection(b'') == {'features': [],
+                                                  'exceededTransferLimit': False}
@@ -0,0 +1,110 @@
+from cachecontrol.cache import DictCache  # type: ignore
+from covid19_sfbayarea.data.cache import (SOURCE_TTLS, SqliteCache, get_cache,
+                                          source_ttl)
+from datetime import datetime, timedelta
+from pathlib import Path
+import pytest
+from typing import Iterator
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    "Keep the shared cache out of the real home directory."
+    directory = tmp_path / 'http_cache'
+    monkeypatch.setenv('HTTP_CACHE_DIR', str(directory))
+    get_cache.cache_clear()
+    yield directory
+    get_cache.cache_clear()
+
+
+class TestSqliteCache:
+    def test_stores_values(self, tmp_path: Path) -> None:
+        cache = SqliteCache(tmp_path / 'cache.sqlite')
+        cache.set('a', b'some data')
+        assert cache.get('a') == b'some data'
+        assert cache.get('b') is None
+
+    def test_persists_values(self, tmp_path: Path) -> None:
+        cache = SqliteCache(tmp_path / 'cache.sqlite')
+        cache.set('a', b'some data')
+        cache.close()
+
+        reopened = SqliteCache(tmp_path / 'cache.sqlite')
+        assert reopened.get('a') == b'some data'
+
+    def test_deletes_values(self, tmp_path: Path) -> None:
+        cache = SqliteCache(tmp_path / 'cache.sqlite')
+        cache.set('a', b'some data')
+        cache.delete('a')
+        assert cache.get('a') is None
+
+    def test_keeps_expired_values_for_revalidation(self, tmp_path: Path) -> None:
+        cache = SqliteCache(tmp_path / 'cache.sqlite')
+        cache.set('seconds', b'some data', expires=-1)
+        cache.set('datetime', b'some data',
+                  expires=datetime.now() - timedelta(seconds=1))
+        assert cache.get('seconds') == b'some data'
+        assert cache.get('datetime') == b'some data'
+
+        cache.close()
+        reopened = SqliteCache(tmp_path / 'cache.sqlite')
+        assert reopened.get('seconds') == b'some data'
+
+    def test_prunes_expired_values_when_opened(self, tmp_path: Path) -> None:
+        cache = SqliteCache(tmp_path / 'cache.sqlite', keep_expired=60)
+        cache.set('long expired', b'some data', expires=-120)
+        cache.set('just expired', b'some data', expires=-1)
+        cache.set('fresh', b'some data', expires=60)
+        cache.set('no expiration', b'some data')
+        cache.close()
+
+        reopened = SqliteCache(tmp_path / 'cache.sqlite', keep_expired=60)
+        connection = reopened._connect()
+        keys = {key for key, in connection.execute('SELECT key FROM responses')}
+        assert keys == {'just expired', 'fresh', 'no expiration'}
+
+    def test_prunes_least_recently_stored_values(self, tmp_path: Path) -> None:
+        cache = SqliteCache(tmp_path / 'cache.sqlite', max_entries=2)
+        cache.set('a', b'some data')
+        cache.set('b', b'some data')
+        cache.set('c', b'some data')
+        cache.set('a', b'new data')
+
+        assert cache.prune() == 1
+        assert cache.get('a') == b'new data'
+        assert cache.get('b') is None
+        assert cache.get('c') == b'some data'
+
+    def test_prunes_a_limited_number_of_values(self, tmp_path: Path) -> None:
+        cache = SqliteCache(tmp_path / 'cache.sqlite', max_entries=0)
+        cache.PRUNE_BATCH_SIZE = 2
+        for key in 'abcde':
+            cache.set(key, b'some data')
+
+        assert cache.prune() == 2
+        assert cache.prune() == 2
+        assert cache.prune() == 1
+
+
+class TestGetCache:
+    def test_stores_cache_in_cache_dir(self, cache_dir: Path) -> None:
+        cache = get_cache()
+        assert isinstance(cache, SqliteCache)
+        assert cache.path == cache_dir / 'http_cache.sqlite'
+
+    def test_caches_in_memory_if_cache_dir_is_empty(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv('HTTP_CACHE_DIR', '')
+        assert isinstance(get_cache(), DictCache)
+
+
+class TestSourceTtl:
+    def test_uses_table(self) -> None:
+        assert source_ttl('napa') == SOURCE_TTLS['napa']
+        assert source_ttl('not a source') is None
+
+    def test_uses_environment(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv('HTTP_CACHE_TTL_NAPA', '5')
+        assert source_ttl('napa') == 5
+
+        monkeypatch.setenv('HTTP_CACHE_TTL_NAPA', '0')
+        assert source_ttl('napa') is None
@@ -0,0 +1,72 @@
+from covid19_sfbayarea.data.ckan import Ckan
+import pytest
+from threading import Lock
+from typing import Any, Dict, List
+
+
+class FakeCkan(Ckan):
+    """
+    A CKAN client whose requests are answered from a list of records instead
+    of a server.
+    """
+    def __init__(self, records: List[Dict], max_limit: int = None) -> None:
+        super().__init__('https://data.example.com')
+        self.records = records
+        # Like ``ckan.datastore.search.rows_max`` on a real server.
+        self.max_limit = max_limit
+        self.requests: List[Dict] = []
+        self.lock = Lock()
+
+    def request(self, url: str, **kwargs: Any) -> Dict:
+        params = kwargs['params'] or {}
+        with self.lock:
+            self.requests.append(params)
+        offset = int(params.get('offset', 0))
+        limit = int(params.get('limit', 100))
+        if self.max_limit:
+            limit = min(limit, self.max_limit)
+        return {
+            'fields': [{'id': '_id'}],
+            'records': self.records[offset:offset + limit],
+            'total': len(self.records),
+            'limit': limit,
+            '_links': {'next': f'/next?offset={offset + limit}'},
+        }
+
+
+RECORDS = [{'_id': index} for index in range(1, 26)]
+
+
+class TestParallelData:
+    @pytest.mark.parametrize('count', [0, 5, 20, 25])
+    def test_yields_records_in_order(self, count: int) -> None:
+        api = FakeCkan(RECORDS[:count])
+        records = list(api.data('abc', limit=5, parallel=True))
+        assert records == RECORDS[:count]
+
+    def test_requests_each_page_once(self) -> None:
+        api = FakeCkan(RECORDS[:22])
+        list(api.data('abc', limit=5, parallel=True))
+        offsets = sorted(int(params.get('offset', 0)) for params in api.requests)
+        assert offsets == [0, 5, 10, 15, 20]
+        assert all(params['sort'] == '_id' for params in api.requests)
+
+    def test_uses_page_size_from_server(self) -> None:
+        api = FakeCkan(RECORDS, max_limit=4)
+        records = list(api.data('abc', limit=10, parallel=True))
+        assert records == RECORDS
+        offsets = sorted(int(params.get('offset', 0)) for params in api.requests)
+        assert offsets == [0, 4, 8, 12, 16, 20, 24]
+
+    def test_yields_meta_first(self) -> None:
+        api = FakeCkan(RECORDS)
+        data = api.data('abc', limit=10, yield_meta=True, parallel=True)
+        assert next(data)['total'] == 25
+        assert len(list(data)) == 25
+
+    def test_reads_records_added_after_first_page(self) -> None:
+        api = FakeCkan(RECORDS[:10])
+        data = api.data('abc', limit=5, parallel=True)
+        first = next(data)
+        api.records = RECORDS
+        assert [first, *data] == RECORDS
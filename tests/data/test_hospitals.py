@@ -5,6 +5,9 @@ Tests for functions in hospitals.py
 """
 
 from covid19_sfbayarea.data import hospitals
+from covid19_sfbayarea.data.ckan import Ckan
+import pytest
+from typing import Dict, List
 
 
 SAMPLE_RECORD = {
@@ -58,3 +61,64 @@ def test_floats_to_ints():
 def test_standardize_data():
     standardized = hospitals.standardize_data(SAMPLE_RECORD)
     assert standardized == SAMPLE_OUTPUT
+
+
+def test_get_timeseries_filters_by_county_on_server(monkeypatch: pytest.MonkeyPatch) -> None:
+    requests: List[Dict] = []
+
+    def request(self: Ckan, url: str, params: Dict = None) -> Dict:
+        requests.append(params or {})
+        return {
+            'fields': [{'id': 'county'}, {'id': 'todays_date'}],
+            'records': [{'county': 'Marin',
+                         'todays_date': '2020-03-30T00:00:00'}],
+            'total': 1,
+            '_links': {'next': '/next-page'},
+        }
+
+    monkeypatch.setattr(Ckan, 'request', request)
+    result = hospitals.get_timeseries(['marin', 'san_francisco'])
+
+    # Only one page is needed, so only one request should be made.
+    assert len(requests) == 1
+    assert requests[0]['filters'] == '{"county": ["Marin", "San Francisco"]}'
+    assert result['series'] == {
+        'marin': [{'county': 'Marin', 'date': '2020-03-30'}],
+        'san_francisco': [],
+    }
+
+
+def test_process_data_groups_records_by_county() -> None:
+    series: List[Dict] = [
+        {'county': 'Marin', 'todays_date': '2020-03-30T00:00:00'},
+        {'county': 'Napa', 'todays_date': '2020-03-30T00:00:00'},
+        {'county': None, 'todays_date': '2020-03-30T00:00:00'},
+        {'county': 'San Francisco', 'todays_date': '2020-03-31T00:00:00'},
+        {'county': 'Marin', 'todays_date': '2020-03-31T00:00:00'},
+    ]
+    result = hospitals.process_data(series, ['marin', 'san_francisco', 'sonoma'])
+    assert result == {
+        'marin': [{'county': 'Marin', 'date': '2020-03-30'},
+                  {'county': 'Marin', 'date': '2020-03-31'}],
+        'san_francisco': [{'county': 'San Francisco', 'date': '2020-03-31'}],
+        'sonoma': [],
+    }
+
+
+def test_stream_timeseries_yields_records_lazily(monkeypatch: pytest.MonkeyPatch) -> None:
+    pages: List[str] = []
+
+    def request(self: Ckan, url: str, params: Dict = None) -> Dict:
+        pages.append(url)
+        return {
+            'fields': [{'id': 'county'}, {'id': 'todays_date'}],
+            'records': [{'county': 'Napa',
+                         'todays_date': '2020-03-30T00:00:00'}],
+            'total': 1,
+        }
+
+    monkeypatch.setattr(Ckan, 'request', request)
+    header, records = hospitals.stream_timeseries(['napa'])
+    assert header['name'] == hospitals.SERIES_NAME
+    assert 'series' not in header
+    assert list(records) == [('napa', {'county': 'Napa', 'date': '2020-03-30'})]
@@ -0,0 +1,72 @@
+from covid19_sfbayarea.data.alameda.cases_by_age import CasesByAge
+from covid19_sfbayarea.data.alameda.cases_by_gender import CasesByGender
+from covid19_sfbayarea.data.alameda.time_series_tests import TimeSeriesTests
+from covid19_sfbayarea.data import power_bi
+from covid19_sfbayarea.data.power_bi import PowerBiBatch
+import pytest
+from typing import Any, Dict, Iterator, List
+from unittest.mock import MagicMock
+
+
+def result_for(values: List[List]) -> Dict[str, Any]:
+    return {'result': {'data': {'dsr': {'DS': [{'PH': [{'DM0': [
+        {'C': value} for value in values
+    ]}]}]}}}}
+
+
+def fake_post(url: str, headers: Dict, json: Dict) -> MagicMock:
+    # Respond to each query with one row named for the entity it queried.
+    results = []
+    for query in json['queries']:
+        entity = query['Query']['Commands'][0]['SemanticQueryDataShapeCommand']['Query']['From'][0]['Entity']
+        results.append(result_for([[entity, len(json['queries'])]]))
+
+    response = MagicMock()
+    response.json.return_value = {'jobIds': [], 'results': results}
+    return response
+
+
+@pytest.fixture
+def session() -> Iterator[MagicMock]:
+    session = MagicMock()
+    session.post.side_effect = fake_post
+    power_bi.use_session(session)
+    yield session
+    power_bi.use_session(None)
+
+
+class TestPowerBiBatch:
+    def test_sends_one_request_per_model(self, session: MagicMock) -> None:
+        by_age = CasesByAge()
+        by_gender = CasesByGender()
+        tests = TimeSeriesTests()
+
+        PowerBiBatch(*by_age.queriers, *by_gender.queriers, *tests.queriers).fetch()
+
+        # Cases by age and gender share a model; the two tests queriers share
+        # a different one.
+        assert session.post.call_count == 2
+        # Each querier gets its own result back.
+        assert by_age.get_data() == [{'group': 'V_Combined_data', 'raw_count': 2}]
+        assert tests.total.get_data() == [['V_Tests_RollingSevenDayAverage', 2]]
+        assert tests.percent.get_data() == [['V_Tests_RollingSevenDayPercentagePositive', 2]]
+
+    def test_splits_large_batches(self, session: MagicMock) -> None:
+        queriers = [CasesByAge() for _ in range(PowerBiBatch.MAX_QUERIES + 1)]
+        PowerBiBatch(*queriers).fetch()
+        assert session.post.call_count == 2
+
+
+class TestSession:
+    def test_is_shared_by_all_counties(self) -> None:
+        from covid19_sfbayarea.data.san_mateo.cases_by_age import CasesByAge as SanMateoCasesByAge
+        assert CasesByAge().session is SanMateoCasesByAge().session
+
+    def test_records_timings(self) -> None:
+        session = power_bi.create_session()
+        session.get_adapter('https://').send = MagicMock(side_effect=ValueError)  # type: ignore
+        with pytest.raises(ValueError):
+            session.get('https://example.com/')
+        assert len(session.timings) == 1
+        assert session.timings[0].method == 'GET'
+        assert session.timings[0].url == 'https://example.com/'
@@ -0,0 +1,194 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from covid19_sfbayarea.data.qlik import JsonRpcError, QlikClient
+import json
+from queue import Queue
+import pytest
+from threading import Lock
+import time
+from typing import Dict, List
+
+
+class FakeSocket:
+    """
+    Stands in for a websocket connected to a Qlik server. Responses are held
+    back until ``hold`` requests have been sent, then sent in reverse order, so
+    requests only succeed if several can be in flight at once.
+    """
+    def __init__(self, hold: int = 1) -> None:
+        self.hold = hold
+        self.sent: List[Dict] = []
+        self.held: List[Dict] = []
+        self.responses: Queue = Queue()
+        self.lock = Lock()
+
+    def send(self, raw: str) -> None:
+        message = json.loads(raw)
+        with self.lock:
+            self.sent.append(message)
+            self.held.append(self.respond(message))
+            if len(self.held) >= self.hold:
+                for response in reversed(self.held):
+                    self.responses.put(json.dumps(response))
+                self.held.clear()
+
+    def respond(self, message: Dict) -> Dict:
+        method = message['method']
+        if method == 'GetHyperCubeData':
+            page = message['params'][1][0]
+            matrix = [[{'qNum': row, 'qText': str(row)}] * page['qWidth']
+                      for row in range(25)]
+            rows = matrix[page['qTop']:page['qTop'] + page['qHeight']]
+            return {'id': message['id'],
+                    'result': {'qDataPages': [{'qMatrix': rows}]}}
+        elif method == 'GetHyperCubeStackData':
+            page = message['params'][1][0]
+            nodes = [{'qValue': row, 'qSubNodes': []} for row in range(25)]
+            nodes = nodes[page['qTop']:page['qTop'] + page['qHeight']]
+            area = {**page, 'qHeight': len(nodes)}
+            return {'id': message['id'],
+                    'result': {'qDataPages': [{
+                        'qData': [{'qSubNodes': nodes}],
+                        'qArea': area
+                    }]}}
+        if method == 'GetObject':
+            object_id = message['params'][0]
+            if object_id == 'missing':
+                return {'id': message['id'],
+                        'error': {'code': 2, 'message': 'Invalid handle'}}
+            return {'id': message['id'],
+                    'result': {'qReturn': {'qHandle': f'handle-{object_id}'}}}
+        elif method == 'GetLayout':
+            return {'id': message['id'],
+                    'result': {'qLayout': {'handle': message['handle']}}}
+        return {'id': message['id'], 'result': {}}
+
+    def recv(self) -> str:
+        return self.responses.get()
+
+    def close(self) -> None:
+        self.responses.put('')
+
+
+class UnsafeSocket(FakeSocket):
+    """
+    A ``FakeSocket`` that, like a real websocket, corrupts messages if two
+    threads send at the same time. It records how many were sent at once.
+    """
+    def __init__(self, hold: int = 1) -> None:
+        super().__init__(hold)
+        self.sending = 0
+        self.most_sending = 0
+
+    def send(self, raw: str) -> None:
+        with self.lock:
+            self.sending += 1
+            self.most_sending = max(self.most_sending, self.sending)
+        # Give other threads a chance to start sending part way through.
+        time.sleep(0.001)
+        super().send(raw)
+        with self.lock:
+            self.sending -= 1
+
+
+def connect(socket: FakeSocket) -> QlikClient:
+    client = QlikClient('wss://qlik.example.com/app/', 'abc')
+    client._socket = socket
+    client._start_reader()
+    return client
+
+
+class TestQlikClient:
+    def test_get_data(self) -> None:
+        client = connect(FakeSocket())
+        assert client.get_data('x') == {'qLayout': {'handle': 'handle-x'}}
+        client.close()
+
+    def test_requests_can_be_in_flight_at_once(self) -> None:
+        socket = FakeSocket(hold=3)
+        client = connect(socket)
+        result = client.get_data_many(['a', 'b', 'c'])
+        assert result == {
+            'a': {'qLayout': {'handle': 'handle-a'}},
+            'b': {'qLayout': {'handle': 'handle-b'}},
+            'c': {'qLayout': {'handle': 'handle-c'}},
+        }
+        # All the GetObject calls were sent before any GetLayout calls.
+        methods = [message['method'] for message in socket.sent]
+        assert methods == ['GetObject'] * 3 + ['GetLayout'] * 3
+        client.close()
+
+    def test_sends_one_message_at_a_time(self) -> None:
+        socket = UnsafeSocket()
+        client = connect(socket)
+        object_ids = [str(index) for index in range(10)]
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(client.get_data, object_ids))
+
+        assert results == [{'qLayout': {'handle': f'handle-{object_id}'}}
+                           for object_id in object_ids]
+        assert socket.most_sending == 1
+        client.close()
+
+    def test_get_hypercube_data_reads_all_pages(self) -> None:
+        socket = FakeSocket()
+        client = connect(socket)
+        rows = list(client.get_hypercube_data('x', width=2, page_height=10))
+        assert [row[0]['qNum'] for row in rows] == list(range(25))
+        assert all(len(row) == 2 for row in rows)
+        pages = [message['params'][1][0]['qTop'] for message in socket.sent
+                 if message['method'] == 'GetHyperCubeData']
+        assert pages == [0, 10, 20]
+        client.close()
+
+    def test_get_hypercube_data_stops_after_exact_page(self) -> None:
+        socket = FakeSocket()
+        client = connect(socket)
+        rows = list(client.get_hypercube_data('x', width=1, page_height=25))
+        assert len(rows) == 25
+        # A full page might not be the last, so one empty page is expected.
+        pages = [message for message in socket.sent
+                 if message['method'] == 'GetHyperCubeData']
+        assert len(pages) == 2
+        client.close()
+
+    def test_get_hypercube_stack_data(self) -> None:
+        client = connect(FakeSocket())
+        nodes = list(client.get_hypercube_stack_data('x', width=3,
+                                                     page_height=10))
+        assert [node['qValue'] for node in nodes] == list(range(25))
+        client.close()
+
+    def test_raises_errors(self) -> None:
+        client = connect(FakeSocket())
+        with pytest.raises(JsonRpcError):
+            client.get_data('missing')
+        client.close()
+
+    def test_fails_pending_requests_when_closed(self) -> None:
+        client = connect(FakeSocket(hold=2))
+        future = client.get_data_async('a')
+        client.close()
+        with pytest.raises(ConnectionError):
+            future.result(timeout=1)
+
+    def test_fails_requests_after_connection_closes(self) -> None:
+        client = connect(FakeSocket())
+        client.close()
+        client._reader.join(timeout=1)
+        with pytest.raises(ConnectionError):
+            client.get_data('a')
+
+    def test_fails_requests_after_bad_response(self) -> None:
+        socket = FakeSocket()
+        client = connect(socket)
+        socket.responses.put('not json')
+        client._reader.join(timeout=1)
+        with pytest.raises(ValueError):
+            client.get_object('a')
+
+    def test_times_out_waiting_for_response(self) -> None:
+        client = connect(FakeSocket(hold=2))
+        client.timeout = 0.1
+        with pytest.raises(TimeoutError):
+            client.get_object('a')
+        client.close()
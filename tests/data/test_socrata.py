@@ -0,0 +1,158 @@
+from covid19_sfbayarea.data.socrata import SocrataApi, SocrataDataset
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+
+ROWS = [{'id': str(index)} for index in range(2345)]
+
+
+def fake_request(url: str, params: Dict = None, **kwargs: Any) -> List[Dict]:
+    params = params or {}
+    if params.get('$select') == 'count(*) AS count':
+        return [{'count': str(len(ROWS))}]
+
+    offset = params['$offset']
+    return ROWS[offset:offset + params['$limit']]
+
+
+class TestResource:
+    def test_loads_all_pages(self) -> None:
+        api = SocrataApi('https://data.example.gov/')
+        with patch.object(api, 'request', side_effect=fake_request):
+            assert api.resource('abcd-1234') == ROWS
+
+    def test_loads_pages_in_parallel(self) -> None:
+        api = SocrataApi('https://data.example.gov/')
+        with patch.object(api, 'request', side_effect=fake_request) as request:
+            assert api.resource('abcd-1234', parallel=True) == ROWS
+
+        # One count query plus one request for each page.
+        assert request.call_count == 4
+        offsets: List[Tuple[int, str]] = [
+            (call.kwargs['params']['$offset'], call.kwargs['params']['$order'])
+            for call in request.call_args_list[1:]
+        ]
+        assert sorted(offsets) == [(0, ':id'), (1000, ':id'), (2000, ':id')]
+
+    def test_parallel_does_not_request_empty_page(self) -> None:
+        rows = ROWS[:2000]
+
+        def request(url: str, params: Dict = None, **kwargs: Any) -> List[Dict]:
+            params = params or {}
+            if params.get('$select') == 'count(*) AS count':
+                return [{'count': str(len(rows))}]
+            return rows[params['$offset']:params['$offset'] + params['$limit']]
+
+        api = SocrataApi('https://data.example.gov/')
+        with patch.object(api, 'request', side_effect=request) as fake:
+            assert api.resource('abcd-1234', parallel=True) == rows
+
+        # Just the count query and the two pages.
+        assert fake.call_count == 3
+
+    def test_parallel_loads_rows_added_after_counting(self) -> None:
+        def request(url: str, params: Dict = None, **kwargs: Any) -> List[Dict]:
+            params = params or {}
+            if params.get('$select') == 'count(*) AS count':
+                return [{'count': '1500'}]
+            return fake_request(url, params)
+
+        api = SocrataApi('https://data.example.gov/')
+        with patch.object(api, 'request', side_effect=request):
+            assert api.resource('abcd-1234', parallel=True) == ROWS
+
+    def test_parallel_breaks_sort_ties_by_id(self) -> None:
+        api = SocrataApi('https://data.example.gov/')
+        with patch.object(api, 'request', side_effect=fake_request) as request:
+            api.resource('abcd-1234', params={'$order': 'date ASC'}, parallel=True)
+
+        assert request.call_args_list[-1].kwargs['params']['$order'] == 'date ASC, :id'
+
+    def test_does_not_modify_params(self) -> None:
+        api = SocrataApi('https://data.example.gov/')
+        params = {'$order': 'date ASC'}
+        with patch.object(api, 'request', side_effect=fake_request):
+            api.resource('abcd-1234', params=params, parallel=True)
+
+        assert params == {'$order': 'date ASC'}
+
+
+class TestDataset:
+    def test_loads_each_resource_once(self) -> None:
+        api = SocrataApi('https://data.example.gov/')
+        with patch.object(api, 'request', side_effect=fake_request) as request:
+            first = api.dataset('abcd-1234')
+            second = api.dataset('abcd-1234')
+            other = api.dataset('abcd-1234', params={'$order': 'id'})
+
+        assert first is second
+        assert other is not first
+        assert list(first) == ROWS
+        # Three pages for each of the two distinct queries.
+        assert request.call_count == 6
+
+    def test_where(self) -> None:
+        dataset = SocrataDataset([{'status': 'Death', 'id': '1'},
+                                  {'status': 'Confirmed', 'id': '2'},
+                                  {'status': 'Death', 'id': '3'},
+                                  {'id': '4'}])
+        assert dataset.where('status', 'Death') == [{'status': 'Death', 'id': '1'},
+                                                    {'status': 'Death', 'id': '3'}]
+        assert dataset.where('status', 'Unknown') == []
+
+    def test_index_with_key(self) -> None:
+        dataset = SocrataDataset([{'grouping': 'Gender - Female'},
+                                  {'grouping': 'Age - 0-18'},
+                                  {'grouping': 'Gender - Male'}])
+        index = dataset.index('grouping', key=lambda value: value.split(' - ')[0])
+        assert index['Gender'] == [{'grouping': 'Gender - Female'},
+                                   {'grouping': 'Gender - Male'}]
+        assert index['Age'] == [{'grouping': 'Age - 0-18'}]
+
+
+class TestMetadataMany:
+    def test_returns_metadata_by_id(self) -> None:
+        api = SocrataApi('https://data.example.gov/')
+
+        def fake_metadata(resource_id: str, **kwargs: Any) -> Dict:
+            return {'id': resource_id}
+
+        with patch.object(api, 'metadata', side_effect=fake_metadata) as metadata:
+            result = api.metadata_many(['abcd-1234', 'efgh-5678', 'abcd-1234'])
+
+        assert result == {'abcd-1234': {'id': 'abcd-1234'},
+                          'efgh-5678': {'id': 'efgh-5678'}}
+        assert metadata.call_count == 2
+
+
+class TestIncremental:
+    def test_reuses_saved_rows_if_not_updated(self, tmp_path: Path) -> None:
+        metadata = {'dataUpdatedAt': '2021-05-01T10:00:00+0000'}
+
+        def run() -> Tuple[List[Dict], int]:
+            api = SocrataApi('https://data.example.gov/', state_dir=tmp_path)
+            with patch.object(api, 'metadata', return_value=metadata), \
+                    patch.object(api, 'request', side_effect=fake_request) as request:
+                rows = api.resource('abcd-1234')
+            return rows, request.call_count
+
+        assert run() == (ROWS, 3)
+        assert run() == (ROWS, 0)
+
+        metadata = {'dataUpdatedAt': '2021-05-02T10:00:00+0000'}
+        assert run() == (ROWS, 3)
+
+    def test_saves_separately_for_each_query(self, tmp_path: Path) -> None:
+        metadata = {'dataUpdatedAt': '2021-05-01T10:00:00+0000'}
+        api = SocrataApi('https://data.example.gov/', state_dir=tmp_path)
+        with patch.object(api, 'metadata', return_value=metadata), \
+                patch.object(api, 'request', side_effect=fake_request):
+            api.resource('abcd-1234')
+            api.resource('abcd-1234', params={'$order': 'id'})
+
+        assert len(list(tmp_path.glob('abcd-1234-*.json'))) == 2
+
+    def test_is_off_by_default(self, monkeypatch: Any) -> None:
+        monkeypatch.delenv('SOCRATA_STATE_DIR', raising=False)
+        assert SocrataApi('https://data.example.gov/').state_dir is None
@@ -0,0 +1,235 @@
+from covid19_sfbayarea.data import marin, santa_clara
+from covid19_sfbayarea.data.socrata import SocrataApi
+from datetime import date
+import json
+import pytest
+import re
+from threading import Lock
+from typing import Any, Dict, List
+
+
+class FakeSocrata(SocrataApi):
+    """
+    A Socrata client whose requests are answered from lists of rows instead of
+    a server. It understands the small part of SoQL the scrapers use:
+    ``$select`` with a list of columns (or ``count(*)``), ``$where`` with
+    ``column = 'value'`` or ``column in ('a', 'b')``, ``$order``, ``$offset``
+    and ``$limit``.
+
+    Each query's parameters are recorded in ``queries``, and the size of the
+    JSON sent back for each resource in ``response_bytes``.
+    """
+    def __init__(self, resources: Dict[str, List[Dict]]) -> None:
+        super().__init__('https://data.example.gov/')
+        self.resources = resources
+        self.queries: Dict[str, List[Dict]] = {}
+        self.response_bytes: Dict[str, int] = {}
+        self.lock = Lock()
+
+    def request(self, url: str, params: Dict = None, **kwargs: Any) -> Any:
+        resource_id = url.rsplit('/', 1)[-1]
+        params = params or {}
+        rows = [row for row in self.resources[resource_id]
+                if self._matches(row, params.get('$where'))]
+
+        select = params.get('$select')
+        if select == 'count(*) AS count':
+            return [{'count': str(len(rows))}]
+
+        order = params.get('$order', '').split(',')[0].split(' ')[0]
+        if order and order != ':id':
+            rows = sorted(rows, key=lambda row: row.get(order, ''))
+        offset = params.get('$offset', 0)
+        rows = rows[offset:offset + params.get('$limit', 1000)]
+        if select:
+            columns = [column.strip() for column in select.split(',')]
+            rows = [{column: row[column] for column in columns if column in row}
+                    for row in rows]
+
+        with self.lock:
+            self.queries.setdefault(resource_id, []).append(params)
+            self.response_bytes[resource_id] = (
+                self.response_bytes.get(resource_id, 0) + len(json.dumps(rows))
+            )
+        return rows
+
+    def _matches(self, row: Dict, where: str = None) -> bool:
+        if not where:
+            return True
+
+        match = re.fullmatch(r"(\w+) (=|in) \(?(.*?)\)?", where)
+        assert match, f'Unsupported $where: {where}'
+        column, _, values = match.groups()
+        return row.get(column) in re.findall(r"'([^']*)'", values)
+
+    def query(self, resource_id: str) -> Dict:
+        "Get the SoQL parameters a resource's rows were queried with."
+        return {key: value
+                for key, value in self.queries[resource_id][0].items()
+                if key not in ('$offset', '$limit')}
+
+
+# Dates too far from the present are rejected as typos, so use this year.
+YEAR = date.today().year
+
+MARIN_CASES = [
+    {
+        'test_date': f'{YEAR}-06-{day:02}T00:00:00.000',
+        'status': status,
+        'new_confirmed_cases': str(count),
+        'cumulative_case_count': str(count * day),
+        'new_cases_7day_avg': '1.5',
+        'population': '258826',
+    }
+    for day in range(1, 4)
+    for status, count in (('Confirmed', 10), ('Death', 1),
+                          ('Hospitalized', 2), ('Recovered', 5))
+]
+
+MARIN_TESTS = [
+    {
+        'date': f'{YEAR}-06-{day:02}T00:00:00.000',
+        'variable': variable,
+        'value': value,
+        'county': 'Marin',
+    }
+    for day in range(1, 4)
+    for variable, value in (('total_tests_nopris_!no_lag', '100.0'),
+                            ('test_pos_nopris_7day_total_!no_lag', '0.0231'))
+]
+
+MARIN_DEMOGRAPHICS = [
+    {
+        'grouping': grouping,
+        'cumulative': '20',
+        'hospitalizations': '3',
+        'deaths': '1',
+        'population': '1000',
+    }
+    for grouping in ['Gender - Female', 'Gender - Male', 'Age - 0-18',
+                     'Age - 19-34', 'Race - American Indian/Alaska Native',
+                     'Race - Asian', 'Race - Black/African American',
+                     'Race - Hispanic/Latinx', 'Race - Multiracial',
+                     'Race - Native Hawaiian/Pacific Islander',
+                     'Race - Unknown', 'Race - Other', 'Race - White']
+]
+
+
+@pytest.fixture
+def marin_api() -> FakeSocrata:
+    return FakeSocrata({
+        marin.API_IDS['cases']: MARIN_CASES,
+        marin.API_IDS['tests']: MARIN_TESTS,
+        marin.API_IDS['demographics']: MARIN_DEMOGRAPHICS,
+    })
+
+
+class TestMarin:
+    def test_queries_only_columns_and_rows_it_uses(self, marin_api: FakeSocrata) -> None:
+        marin.get_timeseries_cases(marin_api)
+        marin.get_timeseries_deaths(marin_api)
+        marin.get_timeseries_tests(marin_api)
+        marin.get_case_totals(marin_api)
+        marin.get_death_totals(marin_api)
+
+        assert marin_api.query('wg8s-i3c7') == {
+            '$select': 'test_date, status, new_confirmed_cases, cumulative_case_count',
+            '$where': "status in ('Confirmed', 'Death')",
+            '$order': 'test_date ASC, :id',
+        }
+        # Cases and deaths share one download.
+        assert len(marin_api.queries['wg8s-i3c7']) == 1
+        assert marin_api.query('kr8c-izzb') == {
+            '$select': 'date, value',
+            '$where': "variable = 'total_tests_nopris_!no_lag'",
+            '$order': 'date ASC',
+        }
+        assert marin_api.query('uu8g-ckxh') == {
+            '$select': 'grouping, cumulative, deaths',
+        }
+
+    def test_timeseries(self, marin_api: FakeSocrata) -> None:
+        assert marin.get_timeseries_cases(marin_api) == [
+            {'date': f'{YEAR}-06-01', 'cases': 10, 'cumul_cases': 10},
+            {'date': f'{YEAR}-06-02', 'cases': 10, 'cumul_cases': 20},
+            {'date': f'{YEAR}-06-03', 'cases': 10, 'cumul_cases': 30},
+        ]
+        assert marin.get_timeseries_deaths(marin_api)[-1] == \
+            {'date': f'{YEAR}-06-03', 'deaths': 1, 'cumul_deaths': 3}
+        assert [entry['cumul_tests']
+                for entry in marin.get_timeseries_tests(marin_api)] == [100, 200, 300]
+
+    def test_demographics(self, marin_api: FakeSocrata) -> None:
+        assert marin.get_cases_by_gender(marin_api) == {'female': 20, 'male': 20}
+        assert marin.get_deaths_by_age(marin_api) == [
+            {'group': '0-18', 'raw_count': 1},
+            {'group': '19-34', 'raw_count': 1},
+        ]
+        assert marin.get_cases_by_race(marin_api)['Native_Amer'] == 20
+
+
+SANTA_CLARA_RESOURCES = {
+    santa_clara.API_IDS['cases']: [
+        {'date': f'{YEAR}-06-{day:02}T00:00:00.000', 'new_cases': '5',
+         'total_cases': str(5 * day), 'cases_7day_avg': '5.0'}
+        for day in range(1, 4)
+    ],
+    santa_clara.API_IDS['deaths']: [
+        {'date': f'{YEAR}-06-{day:02}T00:00:00.000', 'ltcf': '1', 'non_ltcf': '1',
+         'total': '2', 'cumulative': str(2 * day)}
+        for day in range(1, 4)
+    ],
+    santa_clara.API_IDS['tests']: [
+        {'collection_date': f'{YEAR}-06-{day:02}T00:00:00.000', 'total': '30',
+         'post_rslt': '3', 'neg_rslt': '27', 'pct_pos': '0.1'}
+        for day in range(1, 4)
+    ],
+    santa_clara.API_IDS['cases_by_gender']: [
+        {'gender': 'Female', 'count': '40', 'percent': '0.5'},
+        {'gender': 'Male', 'count': '40', 'percent': '0.5'},
+    ],
+    santa_clara.API_IDS['cases_by_age']: [
+        {'age_group': '0-19', 'count': '30', 'percent': '0.4'},
+        {'age_group': '20-29', 'count': '50', 'percent': '0.6'},
+    ],
+}
+
+
+class TestSantaClara:
+    @pytest.fixture
+    def api(self) -> FakeSocrata:
+        return FakeSocrata(SANTA_CLARA_RESOURCES)
+
+    def test_queries_only_columns_it_uses(self, api: FakeSocrata) -> None:
+        santa_clara.get_timeseries_cases(api)
+        santa_clara.get_timeseries_deaths(api)
+        santa_clara.get_timeseries_tests(api)
+        santa_clara.get_cases_by_gender(api)
+        santa_clara.get_cases_by_age(api)
+
+        assert api.query('6cnm-gchg') == {
+            '$select': 'date, new_cases, total_cases',
+            '$order': 'date ASC',
+        }
+        assert api.query('tg4j-23y2') == {
+            '$select': 'date, total, cumulative',
+            '$order': 'date ASC',
+        }
+        assert api.query('dvgc-tzgq') == {
+            '$select': 'collection_date, total, post_rslt, neg_rslt',
+            '$order': 'collection_date ASC',
+        }
+        assert api.query('ibdk-7rf5') == {'$select': 'gender, count'}
+        assert api.query('ige8-ixqu') == {'$select': 'age_group, count'}
+
+    def test_output(self, api: FakeSocrata) -> None:
+        assert santa_clara.get_timeseries_cases(api)[-1] == \
+            {'date': f'{YEAR}-06-03', 'cases': 5, 'cumul_cases': 15}
+        assert santa_clara.get_timeseries_deaths(api)[-1] == \
+            {'date': f'{YEAR}-06-03', 'deaths': 2, 'cumul_deaths': 6}
+        assert santa_clara.get_timeseries_tests(api)[-1]['cumul_pos'] == 9
+        assert santa_clara.get_cases_by_gender(api) == {'female': 40, 'male': 40}
+        assert santa_clara.get_cases_by_age(api) == [
+            {'group': '0-19', 'raw_count': 30},
+            {'group': '20-29', 'raw_count': 50},
+        ]
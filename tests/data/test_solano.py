@@ -0,0 +1,197 @@
+from covid19_sfbayarea.data import solano
+from covid19_sfbayarea.data.utils import get_data_model
+from covid19_sfbayarea.errors import FormatError
+import pytest
+from typing import Any, Dict, List
+
+
+# Trimmed-down versions of the dashboard's item data.
+ITEM_WITH_DISCLAIMER = {
+    'version': 4,
+    'headerPanel': {'type': 'headerPanel', 'title': 'Solano County COVID-19'},
+    'widgets': [
+        {
+            'type': 'indicatorWidget',
+            'name': 'Total cases',
+            'description': 'Cumulative confirmed cases',
+        },
+        {
+            'type': 'richTextWidget',
+            'name': 'Notes',
+            'text': '<div><p><strong>Disclaimer:</strong> Numbers are updated '
+                    'weekdays at 6:00 PM.</p><p>See the county website for '
+                    'more.</p></div>',
+        },
+    ],
+}
+
+ITEM_WITHOUT_DISCLAIMER = {
+    'version': 4,
+    'headerPanel': {'type': 'headerPanel', 'title': 'Solano County COVID-19'},
+    'widgets': [
+        {
+            'type': 'richTextWidget',
+            'name': 'Notes',
+            'text': '<p>See the county website for more.</p>',
+        },
+    ],
+}
+
+
+class FakeResponse:
+    def __init__(self, data: Dict) -> None:
+        self.data = data
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> Dict:
+        return self.data
+
+
+@pytest.fixture
+def dashboard_item(monkeypatch: pytest.MonkeyPatch) -> Dict:
+    item: Dict = {}
+
+    def get(url: str, **kwargs: Any) -> FakeResponse:
+        assert url == solano.dashboard_item_url
+        return FakeResponse(item)
+
+    monkeypatch.setattr(solano.session, 'get', get)
+    monkeypatch.delenv('SOLANO_BROWSER_NOTES', raising=False)
+    return item
+
+
+class TestGetNotes:
+    def test_reads_notes_from_dashboard_item(self, dashboard_item: Dict) -> None:
+        dashboard_item.update(ITEM_WITH_DISCLAIMER)
+        assert solano.get_notes() == ('Disclaimer: Numbers are updated '
+                                      'weekdays at 6:00 PM.')
+
+    def test_raises_if_no_notes_found(self, dashboard_item: Dict) -> None:
+        dashboard_item.update(ITEM_WITHOUT_DISCLAIMER)
+        with pytest.raises(FormatError):
+            solano.get_notes()
+
+    def test_falls_back_to_browser_if_no_notes_found(
+            self, dashboard_item: Dict, monkeypatch: pytest.MonkeyPatch) -> None:
+        dashboard_item.update(ITEM_WITHOUT_DISCLAIMER)
+        monkeypatch.setenv('SOLANO_BROWSER_NOTES', '1')
+        monkeypatch.setattr(solano, 'get_notes_from_browser',
+                            lambda: 'Disclaimer: from the browser')
+        assert solano.get_notes() == 'Disclaimer: from the browser'
+
+
+RACES = ['Asian', 'Black', 'Latinx', 'White', 'Multirace', 'NHPI', 'AIAN',
+         'Other', 'Unknown', 'Total_RE']
+AGES = ['0-17', '18-49', '50-64', '65+', 'Total_AG']
+GENDERS = ['Female', 'Male', 'Unknown', 'Total_G']
+
+
+def demographic_rows(genders: bool = True) -> List[Dict]:
+    """
+    Rows like the ones in the demographics layer, which is a join on race,
+    age, and gender (so age groups and genders are repeated).
+    """
+    return [{
+        'Race_ethnicity': race,
+        'RE_total_cases': 10 + index,
+        'RE_deaths': index,
+        'Age_group': AGES[index % len(AGES)],
+        'AG_Total_cases': 100 + index % len(AGES),
+        'AG_deaths': index % len(AGES),
+        'Gender': GENDERS[index % len(GENDERS)],
+        'G_Total_cases': (1000 + index % len(GENDERS)) if genders else 0,
+    } for index, race in enumerate(RACES)]
+
+
+@pytest.fixture
+def demographics_layer(monkeypatch: pytest.MonkeyPatch) -> Dict[str, List]:
+    """
+    Replaces the demographics layer with ``layer['days']``, the rows for each
+    day, and ``layer['latest']``, the latest day for each ``where`` filter.
+    Requests for rows are recorded in ``layer['requested']``.
+    """
+    layer: Dict[str, Any] = {'days': {}, 'latest': {}, 'requested': []}
+
+    def get_latest_day(where: str) -> str:
+        return layer['latest'].get(where, '09-18-2020')
+
+    def get_rows_for_day(day: str) -> List[Dict]:
+        layer['requested'].append(day)
+        return layer['days'][day]
+
+    monkeypatch.setattr(solano, '_get_latest_day', get_latest_day)
+    monkeypatch.setattr(solano, '_get_rows_for_day', get_rows_for_day)
+    return layer
+
+
+class TestDemographics:
+    def test_splits_one_days_rows(self, demographics_layer: Dict) -> None:
+        demographics_layer['days']['09-18-2020'] = demographic_rows()
+        demographics = solano.get_demographics()
+        assert demographics_layer['requested'] == ['09-18-2020']
+
+        out = get_data_model()
+        solano.get_age_table(out, demographics)
+        solano.get_gender_table(out, demographics)
+        solano.get_race_eth(out, demographics)
+
+        # Repeated age groups are only counted once, and the total is skipped.
+        assert out['case_totals']['age_group'] == [
+            {'group': '0-17', 'raw_count': 100},
+            {'group': '18-49', 'raw_count': 101},
+            {'group': '50-64', 'raw_count': 102},
+            {'group': '65+', 'raw_count': 103},
+        ]
+        assert out['death_totals']['age_group'][0] == {'group': '0-17',
+                                                       'raw_count': 0}
+        assert out['case_totals']['gender'] == {
+            'female': 1000, 'male': 1001, 'unknown': 1002, 'total_g': 1003
+        }
+        assert out['case_totals']['race_eth']['Asian'] == 10
+        assert out['death_totals']['race_eth']['Total_RE'] == 9
+
+    def test_uses_breakdowns_own_day_if_missing(self, demographics_layer: Dict) -> None:
+        demographics_layer['days']['09-18-2020'] = demographic_rows(genders=False)
+        demographics_layer['days']['09-17-2020'] = demographic_rows()
+        demographics_layer['latest']['G_Total_cases > 0'] = '09-17-2020'
+        demographics = solano.get_demographics()
+        assert demographics_layer['requested'] == ['09-18-2020', '09-17-2020']
+
+        out = get_data_model()
+        solano.get_gender_table(out, demographics)
+        solano.get_race_eth(out, demographics)
+        assert out['case_totals']['gender']['female'] == 1000
+        assert out['case_totals']['race_eth']['Asian'] == 10
+
+
+class TestGetRowsForDay:
+    def serve_pages(self, monkeypatch: pytest.MonkeyPatch, rows: List[Dict],
+                    page_size: int) -> List[Dict]:
+        "Serve ``rows`` at most ``page_size`` at a time, like ArcGIS does."
+        requests: List[Dict] = []
+
+        def get(url: str, params: Dict, **kwargs: Any) -> FakeResponse:
+            assert url == solano.data2_url
+            requests.append(params)
+            offset = params.get('resultOffset', 0)
+            page = rows[offset:offset + page_size]
+            return FakeResponse({
+                'features': [{'attributes': row} for row in page],
+                'exceededTransferLimit': offset + page_size < len(rows),
+            })
+
+        monkeypatch.setattr(solano.session, 'get', get)
+        return requests
+
+    def test_loads_every_page(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        rows = demographic_rows()
+        requests = self.serve_pages(monkeypatch, rows, page_size=4)
+        assert solano._get_rows_for_day('09-18-2020') == rows
+        assert [params.get('resultOffset', 0) for params in requests] == [0, 4, 8]
+
+    def test_raises_if_truncated_without_rows(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.serve_pages(monkeypatch, demographic_rows(), page_size=0)
+        with pytest.raises(FormatError):
+            solano._get_rows_for_day('09-18-2020')
@@ -0,0 +1,192 @@
+from covid19_sfbayarea.data import sonoma
+from covid19_sfbayarea.errors import FormatError
+from lxml import html  # type: ignore
+import pytest
+import requests
+from typing import Any, Callable, Dict
+
+
+# A trimmed-down copy of the county's page. It has no <meta charset>, like
+# many of the pages we scrape, and has non-ASCII text in it.
+PAGE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+<title>Coronavirus Cases – Sonoma County Emergency and Preparedness Information</title>
+<script>var nav = {"menu": "<h3>Not a header</h3>"};</script>
+</head>
+<body>
+<nav><ul><li><a href="/">Home</a></li><li><a href="/es/">Español</a></li></ul></nav>
+<div class="section">
+<h3>Cases by Date</h3>
+<table>
+<tr><th>Date</th><th>New</th><th>Active</th><th>Deaths</th></tr>
+<tr><td>1/2/2021</td><td>5</td><td>100</td><td>3</td></tr>
+</table>
+<p>Full history:</p>
+<table>
+<tr><th>Date</th><th>New</th><th>Active</th><th>Deaths</th></tr>
+<tr><td>1/3/2021</td><td>1,204</td><td>100</td><td>5</td></tr>
+<tr><td>1/2/2021</td><td>5</td><td>100</td><td>3</td></tr>
+<tr><td>1/1/2021</td><td>10</td><td>95</td><td>1</td></tr>
+</table>
+</div>
+<div class="section">
+<h3>Test Results</h3>
+<table>
+<tr><th>Results</th><th>Number</th></tr>
+<tr><td>Positive</td><td>1,219</td></tr>
+<tr><td>Negative</td><td>20,000</td></tr>
+</table>
+</div>
+<div class="section">
+<h3>Proportion of Cases Attributable to Specific Exposure Locations</h3>
+<table>
+<tr><th>Exposure Location</th><th>Last 30 Days</th><th>All Time</th></tr>
+<tr><td>Congregate Care</td><td>5%</td><td>10%</td></tr>
+<tr><td>Health Care</td><td>5%</td><td>5%</td></tr>
+<tr><td>Household</td><td>40%</td><td>30%</td></tr>
+<tr><td>Large Gathering</td><td>5%</td><td>5%</td></tr>
+<tr><td>Other</td><td>5%</td><td>5%</td></tr>
+<tr><td>Small Gathering</td><td>10%</td><td>10%</td></tr>
+<tr><td>Travel</td><td>5%</td><td>5%</td></tr>
+<tr><td>Unknown</td><td>15%</td><td>10%</td></tr>
+<tr><td>Workplace</td><td>10%</td><td>20%</td></tr>
+</table>
+</div>
+<div class="section">
+<h3>Cases by Age Group</h3>
+<table>
+<tr><th>Age Group</th><th>Cases</th></tr>
+<tr><td>0–17</td><td>200</td></tr>
+<tr><td>18–49</td><td>600</td></tr>
+<tr><td>50+</td><td>419</td></tr>
+</table>
+</div>
+<div class="section">
+<h3>Cases by Race/Ethnicity</h3>
+<table>
+<tr><th>Race/Ethnicity</th><th>Cases</th></tr>
+<tr><td>Asian, non-Hispanic</td><td>50</td></tr>
+<tr><td>Hispanic / Latino</td><td>600</td></tr>
+<tr><td>White, non-Hispanic</td><td>400</td></tr>
+<tr><td>Multi-racial, non-Hispanic</td><td>20</td></tr>
+<tr><td>Black/African American, non-Hispanic</td><td>30</td></tr>
+<tr><td>American Indian/Alaska Native, non-Hispanic</td><td>10</td></tr>
+<tr><td>Native Hawaiian and other Pacific Islander, non-Hispanic</td><td>9</td></tr>
+<tr><td>Other, non-Hispanic</td><td>50</td></tr>
+<tr><td>Unknown</td><td>50</td></tr>
+</table>
+</div>
+<div class="section">
+<h3>Definitions</h3>
+<p>Cases: people who tested positive – including “probable” cases.</p>
+<p>Deaths: people who died with COVID‑19 (días).</p>
+</div>
+</body>
+</html>
+'''
+
+# What the page parsed to with BeautifulSoup (apart from the non-ASCII text,
+# which BeautifulSoup garbled without a <meta charset>).
+EXPECTED_META = ('/Definitions/Cases: people who tested positive – including '
+                 '“probable” cases./Deaths: people who died with COVID‑19 '
+                 '(días)./')
+
+EXPECTED_CASES = [
+    {'date': '2021-01-01', 'cases': 10, 'cumul_cases': 10},
+    {'date': '2021-01-02', 'cases': 5, 'cumul_cases': 15},
+    {'date': '2021-01-03', 'cases': 1204, 'cumul_cases': 1219},
+]
+
+EXPECTED_CASE_TOTALS = {
+    'transmission_cat': {'from_contact': 850, 'community': 180, 'travel': 60,
+                         'unknown': 121},
+    'transmission_cat_orig': {'congregate_care': 121, 'health_care': 60,
+                              'household': 365, 'gathering_large': 60,
+                              'other': 60, 'gathering_small': 121,
+                              'travel': 60, 'unknown': 121, 'workplace': 243},
+    'age_group': [{'group': '0–17', 'raw_count': 200},
+                  {'group': '18–49', 'raw_count': 600},
+                  {'group': '50+', 'raw_count': 419}],
+    'race_eth': {'Asian': 50, 'Latinx_or_Hispanic': 600, 'Other': 50,
+                 'White': 400, 'Unknown': 50, 'Multiple_Race': 20,
+                 'African_Amer': 30, 'Native_Amer': 10, 'Pacific_Islander': 9},
+    'gender': {'male': -1, 'female': -1},
+}
+
+
+def make_response(content: bytes, content_type: str = 'text/html') -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = content_type
+    response._content = content
+    return response
+
+
+@pytest.fixture
+def serve_page(monkeypatch: pytest.MonkeyPatch) -> Callable[..., None]:
+    "Set the response the scraper gets for the county's page."
+    def serve(content: bytes, content_type: str = 'text/html') -> None:
+        def get(url: str, **kwargs: Any) -> requests.Response:
+            return make_response(content, content_type)
+
+        monkeypatch.setattr(sonoma.session, 'get', get)
+
+    return serve
+
+
+@pytest.fixture
+def sections() -> Dict[str, sonoma.Section]:
+    return sonoma.index_sections(html.fromstring(PAGE))
+
+
+class TestSections:
+    def test_indexes_every_header(self, sections: Dict[str, sonoma.Section]) -> None:
+        assert list(sections) == [
+            'Cases by Date',
+            'Test Results',
+            'Proportion of Cases Attributable to Specific Exposure Locations',
+            'Cases by Age Group',
+            'Cases by Race/Ethnicity',
+            'Definitions',
+        ]
+
+    def test_get_table_gets_last_table_in_section(self, sections: Dict[str, sonoma.Section]) -> None:
+        rows = sonoma.parse_table(sonoma.get_table('Cases by Date', sections))
+        assert [row['Date'] for row in rows] == ['1/3/2021', '1/2/2021', '1/1/2021']
+
+    def test_get_table_matches_part_of_header(self, sections: Dict[str, sonoma.Section]) -> None:
+        rows = sonoma.parse_table(sonoma.get_table('Cases by Race', sections))
+        assert rows[0] == {'Race/Ethnicity': 'Asian, non-Hispanic', 'Cases': '50'}
+
+    def test_get_table_fails_for_missing_header(self, sections: Dict[str, sonoma.Section]) -> None:
+        with pytest.raises(FormatError):
+            sonoma.get_table('Cases by Gender', sections)
+
+    def test_get_source_meta(self, sections: Dict[str, sonoma.Section]) -> None:
+        assert sonoma.get_source_meta(sections) == EXPECTED_META
+
+
+class TestGetCounty:
+    def test_output(self, serve_page: Callable[..., None]) -> None:
+        serve_page(PAGE.encode('utf-8'))
+        data = sonoma.get_county()
+        assert data['meta_from_source'] == EXPECTED_META
+        assert data['series']['cases'] == EXPECTED_CASES
+        assert data['series']['deaths'][-1] == \
+            {'date': '2021-01-03', 'deaths': 2, 'cumul_deaths': 5}
+        assert data['case_totals'] == EXPECTED_CASE_TOTALS
+        assert data['tests_totals'] == {'tests': {'positive': 1219, 'negative': 20000}}
+
+    def test_uses_meta_charset(self, serve_page: Callable[..., None]) -> None:
+        page = PAGE.replace('<head>', '<head><meta charset="windows-1252">')
+        serve_page(page.replace('‑', '-').encode('windows-1252'))
+        data = sonoma.get_county()
+        assert data['case_totals']['age_group'][0]['group'] == '0–17'
+        assert '“probable”' in data['meta_from_source']
+
+    def test_uses_charset_from_headers(self, serve_page: Callable[..., None]) -> None:
+        serve_page(PAGE.replace('‑', '-').encode('windows-1252'),
+                   'text/html; charset=windows-1252')
+        data = sonoma.get_county()
+        assert data['case_totals']['age_group'][0]['group'] == '0–17'
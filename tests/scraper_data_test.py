@@ -0,0 +1,89 @@
+from click.testing import CliRunner
+from covid19_sfbayarea import data as data_scrapers
+import json
+from pathlib import Path
+import pytest
+from scraper_data import main
+from threading import Lock
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict
+
+
+class Running:
+    "Counts how many stub scrapers are running at once."
+    def __init__(self) -> None:
+        self.now = 0
+        self.most = 0
+        self.lock = Lock()
+
+    def stub_scraper(self, name: str, delay: float,
+                     error: bool = False) -> SimpleNamespace:
+        def get_county() -> Dict:
+            with self.lock:
+                self.now += 1
+                self.most = max(self.most, self.now)
+            time.sleep(delay)
+            with self.lock:
+                self.now -= 1
+            if error:
+                raise ValueError(f'{name} page changed')
+            return {'name': name}
+
+        return SimpleNamespace(get_county=get_county)
+
+
+@pytest.fixture
+def running() -> Running:
+    return Running()
+
+
+@pytest.fixture
+def stub_scrapers(monkeypatch: pytest.MonkeyPatch,
+                  running: Running) -> Callable[..., None]:
+    "Replace county scrapers with stubs. Later counties finish first."
+    def stub(*counties: str, failing: str = None) -> None:
+        for index, county in enumerate(counties):
+            delay = 0.05 * (len(counties) - index)
+            scraper = running.stub_scraper(county, delay, county == failing)
+            monkeypatch.setitem(data_scrapers.scrapers, county, scraper)
+
+    return stub
+
+
+def run(tmp_path: Path, *args: str) -> Dict:
+    result = CliRunner().invoke(main, ['--output', str(tmp_path), *args])
+    with (tmp_path / 'data.json').open(encoding='utf-8') as f:
+        output = json.load(f)
+    return {'exit_code': result.exit_code, 'counties': list(output)}
+
+
+@pytest.mark.parametrize('jobs', [1, 4])
+def test_outputs_counties_in_order(tmp_path: Path, stub_scrapers: Callable[..., None],
+                                   running: Running, jobs: int) -> None:
+    stub_scrapers('marin', 'napa', 'sonoma', 'solano')
+    assert run(tmp_path, '--jobs', str(jobs), 'marin', 'napa', 'sonoma', 'solano') == {
+        'exit_code': 0,
+        'counties': ['marin', 'napa', 'sonoma', 'solano'],
+    }
+    assert running.most == jobs
+
+
+@pytest.mark.parametrize('jobs', [1, 4])
+def test_exits_1_if_some_counties_fail(tmp_path: Path, stub_scrapers: Callable[..., None],
+                                       jobs: int) -> None:
+    stub_scrapers('marin', 'napa', 'sonoma', failing='napa')
+    assert run(tmp_path, '--jobs', str(jobs), 'marin', 'napa', 'sonoma') == {
+        'exit_code': 1,
+        'counties': ['marin', 'sonoma'],
+    }
+
+
+@pytest.mark.parametrize('jobs', [1, 4])
+def test_exits_70_if_all_counties_fail(tmp_path: Path, stub_scrapers: Callable[..., None],
+                                       jobs: int) -> None:
+    stub_scrapers('napa', failing='napa')
+    assert run(tmp_path, '--jobs', str(jobs), 'napa') == {
+        'exit_code': 70,
+        'counties': [],
+    }
@@ -0,0 +1,77 @@
+import json
+import pytest
+from scraper import get_county_data, iter_json_list
+from typing import Any, Iterator, List
+
+
+def chunked(text: str, size: int) -> List[bytes]:
+    data = text.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+LOCATIONS = [
+    {'name': 'Marin County, California, United States',
+     'countyName': 'Marin County',
+     'population': 258826,
+     'dates': {'2020-08-01': {'cases': 5}}},
+    {'name': 'Montréal, Québec, Canada', 'dates': {}},
+    [1, 2.5, -30, None, True, 'text with ] and , and "quotes"',
+     'a \\ backslash, a \\"quoted\\" one, and {braces}'],
+    12345,
+]
+
+
+class TestIterJsonList:
+    @pytest.mark.parametrize('size', [1, 2, 7, 1000])
+    def test_parses_items_split_across_chunks(self, size: int) -> None:
+        text = json.dumps(LOCATIONS, indent=2, ensure_ascii=False)
+        assert list(iter_json_list(chunked(text, size))) == LOCATIONS
+
+    def test_parses_empty_list(self) -> None:
+        assert list(iter_json_list(chunked(' [ ] ', 1))) == []
+
+    def test_raises_for_non_list(self) -> None:
+        with pytest.raises(ValueError):
+            list(iter_json_list(chunked('{"a": 1}', 3)))
+
+    def test_raises_for_incomplete_list(self) -> None:
+        with pytest.raises(ValueError):
+            list(iter_json_list(chunked('[{"a": 1}, {"b"', 3)))
+
+    @pytest.mark.parametrize('text', ['[{"a": 1]', '[{"a" 1}', '[12a,'])
+    def test_raises_for_invalid_item_without_reading_further(self, text: str) -> None:
+        def chunks() -> Iterator[bytes]:
+            yield from chunked(text, 2)
+            raise AssertionError('Read past the invalid item')
+
+        with pytest.raises(ValueError):
+            list(iter_json_list(chunks()))
+
+    def test_decodes_large_item_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        item = {f'key{index}': list(range(10)) for index in range(1000)}
+        decoded: List[int] = []
+        raw_decode = json.JSONDecoder.raw_decode
+
+        def counting_raw_decode(self: json.JSONDecoder, text: str, index: int = 0) -> Any:
+            decoded.append(index)
+            return raw_decode(self, text, index)
+
+        monkeypatch.setattr(json.JSONDecoder, 'raw_decode', counting_raw_decode)
+        chunks = chunked(json.dumps([item]), 100)
+        assert list(iter_json_list(chunks)) == [item]
+        # One attempt with the first chunk, and one once it has all arrived.
+        assert len(chunks) > 100
+        assert len(decoded) == 2
+
+
+def test_get_county_data_filters_locations() -> None:
+    text = json.dumps(LOCATIONS[:2])
+    data = get_county_data(['Marin County, California, United States'],
+                           iter_json_list(chunked(text, 10)))
+    assert data == {
+        'Marin County': {
+            'name': 'Marin County',
+            'population': 258826,
+            'cases': [{'cases': 5, 'date': '2020-08-01'}],
+        }
+    }
@@ -1,7 +1,8 @@
 from datetime import datetime, timezone
 import dateutil.tz
 import pytest
-from covid19_sfbayarea.utils import parse_datetime
+from covid19_sfbayarea.utils import (PACIFIC_TIME, date_cache_stats, parse_datetime,
+                                      timestamp_to_date)
 
 
 class TestParseDatetime:
@@ -39,3 +40,42 @@ class TestParseDatetime:
     def test_does_not_corrects_century_based_on_args(self) -> None:
         with pytest.raises(ValueError):
             parse_datetime('1921-09-10T00:00:00Z', correct_century=False)
+
+    def test_socrata_dates(self) -> None:
+        result = parse_datetime('2021-05-01T00:00:00.000')
+        assert result == datetime(2021, 5, 1, tzinfo=PACIFIC_TIME)
+
+    def test_iso8601_dates_with_fractional_seconds(self) -> None:
+        result = parse_datetime('2021-03-05T17:20:11.250Z')
+        assert result == datetime(2021, 3, 5, 17, 20, 11, 250000,
+                                  tzinfo=timezone.utc)
+
+    def test_us_short_dates(self) -> None:
+        result = parse_datetime('5/1/2021')
+        assert result == datetime(2021, 5, 1, tzinfo=PACIFIC_TIME)
+
+    def test_other_formats(self) -> None:
+        result = parse_datetime('Sept. 10, 2021 4:15 PM')
+        assert result == datetime(2021, 9, 10, 16, 15, tzinfo=PACIFIC_TIME)
+
+
+class TestDateCaching:
+    def test_parse_datetime_is_memoized(self) -> None:
+        before = date_cache_stats()['parse_datetime']
+        first = parse_datetime('2021-06-15T12:00:00')
+        second = parse_datetime('2021-06-15T12:00:00')
+        after = date_cache_stats()['parse_datetime']
+        assert first is second
+        assert after.hits - before.hits >= 1
+
+    def test_cache_is_keyed_on_timezone(self) -> None:
+        chicago = dateutil.tz.gettz('America/Chicago')
+        pacific = parse_datetime('2021-06-16T12:00:00')
+        central = parse_datetime('2021-06-16T12:00:00', timezone=chicago)
+        assert pacific.tzinfo is PACIFIC_TIME
+        assert central.tzinfo is chicago
+
+    def test_timestamp_to_date(self) -> None:
+        assert timestamp_to_date(1588291200000) == '2020-05-01'
+        assert timestamp_to_date(1588291200000) == '2020-05-01'
+        assert date_cache_stats()['timestamp_to_date'].hits >= 1
@@ -0,0 +1,252 @@
+from contextlib import contextmanager
+import pytest
+from selenium.common.exceptions import WebDriverException  # type: ignore
+from threading import Thread
+from typing import Dict, Iterator, List
+from covid19_sfbayarea.webdriver import BrowserPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver: 'FakeDriver'):
+        self.driver = driver
+
+    def window(self, handle: str) -> None:
+        self.driver.current_window = handle
+
+
+class FakeDriver:
+    """
+    Stands in for a Selenium webdriver. Like a real one, it can only clear
+    cookies and storage for the site it is currently on.
+    """
+    def __init__(self) -> None:
+        # Cookies and storage for each site, keyed by origin.
+        self.cookies: Dict[str, Dict[str, str]] = {}
+        self.storage: Dict[str, Dict[str, str]] = {}
+        self.urls = {'main': 'about:blank'}
+        self.current_window = 'main'
+        self.switch_to = FakeSwitchTo(self)
+        self.quit_called = False
+        self.broken = False
+
+    @property
+    def window_handles(self) -> List[str]:
+        return list(self.urls)
+
+    @property
+    def current_url(self) -> str:
+        return self.urls[self.current_window]
+
+    @property
+    def origin(self) -> str:
+        return '/'.join(self.current_url.split('/')[:3]) + '/'
+
+    def get(self, url: str) -> None:
+        if self.broken:
+            raise WebDriverException('Browser crashed')
+        self.urls[self.current_window] = url
+
+    def visit(self, url: str) -> None:
+        "Go to a page that sets a cookie and stores some data."
+        self.get(url)
+        self.cookies.setdefault(self.origin, {})['session'] = 'abc'
+        self.storage.setdefault(self.origin, {})['key'] = 'value'
+
+    def open_window(self, url: str) -> None:
+        "Open a new window (e.g. a popup) without calling ``get()``."
+        handle = f'window-{len(self.urls)}'
+        self.urls[handle] = url
+        self.current_window = handle
+        self.cookies.setdefault(self.origin, {})['popup'] = 'xyz'
+
+    def delete_all_cookies(self) -> None:
+        if self.broken:
+            raise WebDriverException('Browser crashed')
+        self.cookies.pop(self.origin, None)
+
+    def execute_script(self, script: str) -> None:
+        if 'localStorage.clear()' in script:
+            self.storage.pop(self.origin, None)
+
+    def implicitly_wait(self, seconds: float) -> None:
+        pass
+
+    def close(self) -> None:
+        del self.urls[self.current_window]
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+class FakeFirefox(FakeDriver):
+    "A ``FakeDriver`` that supports Firefox's privileged chrome context."
+    CONTEXT_CHROME = 'chrome'
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_chrome = False
+        self.visited_after_use: List[str] = []
+
+    @contextmanager
+    def context(self, name: str) -> Iterator[None]:
+        self.in_chrome = True
+        try:
+            yield
+        finally:
+            self.in_chrome = False
+
+    def get(self, url: str) -> None:
+        self.visited_after_use.append(url)
+        super().get(url)
+
+    def execute_script(self, script: str) -> None:
+        if self.in_chrome and 'Services.cookies.removeAll()' in script:
+            self.cookies.clear()
+            self.storage.clear()
+        else:
+            super().execute_script(script)
+
+
+@pytest.fixture
+def launched() -> List[FakeDriver]:
+    return []
+
+
+@pytest.fixture
+def pool(launched: List[FakeDriver]) -> BrowserPool[FakeDriver]:
+    def launch() -> FakeDriver:
+        driver = FakeDriver()
+        launched.append(driver)
+        return driver
+
+    return BrowserPool(launch, max_size=2, max_uses=3)
+
+
+def test_reuses_browsers(pool: BrowserPool[FakeDriver],
+                         launched: List[FakeDriver]) -> None:
+    with pool.acquire() as first:
+        pass
+    with pool.acquire() as second:
+        pass
+
+    assert first is second
+    assert len(launched) == 1
+    stats = pool.stats()
+    assert stats.launches == 1
+    assert stats.reuses == 1
+
+
+def test_resets_browsers_between_uses(pool: BrowserPool[FakeDriver]) -> None:
+    with pool.acquire() as driver:
+        driver.visit('https://one.example.com/page')
+        driver.visit('https://two.example.com/page')
+        driver.open_window('https://three.example.com/popup')
+
+    assert driver.cookies == {}
+    assert driver.storage == {}
+    assert driver.window_handles == ['main']
+    assert driver.current_url == 'about:blank'
+
+
+def test_resets_sites_from_earlier_uses(pool: BrowserPool[FakeDriver]) -> None:
+    with pool.acquire() as driver:
+        driver.visit('https://one.example.com/page')
+
+    with pool.acquire() as driver:
+        # Sites can set cookies for other sites, e.g. through iframes.
+        driver.cookies['https://one.example.com/'] = {'tracking': 'xyz'}
+        driver.visit('https://two.example.com/page')
+
+    assert driver.cookies == {}
+
+
+def test_clears_all_sites_at_once_in_firefox() -> None:
+    firefox = FakeFirefox()
+    pool = BrowserPool(lambda: firefox)
+    with pool.acquire() as driver:
+        driver.visit('https://one.example.com/page')
+        driver.visit('https://two.example.com/page')
+        driver.visited_after_use.clear()
+
+    assert driver.cookies == {}
+    assert driver.storage == {}
+    # It shouldn't have needed to go back to each site.
+    assert driver.visited_after_use == ['about:blank']
+
+
+def test_replaces_browsers_after_max_uses(pool: BrowserPool[FakeDriver],
+                                          launched: List[FakeDriver]) -> None:
+    for _ in range(4):
+        with pool.acquire():
+            pass
+
+    assert len(launched) == 2
+    assert launched[0].quit_called
+    assert not launched[1].quit_called
+    assert pool.stats().recycled == 1
+
+
+def test_replaces_crashed_browsers(pool: BrowserPool[FakeDriver],
+                                   launched: List[FakeDriver]) -> None:
+    with pytest.raises(WebDriverException):
+        with pool.acquire() as driver:
+            driver.broken = True
+            driver.get('https://example.com/page')
+
+    with pool.acquire() as driver:
+        pass
+
+    assert driver is launched[1]
+    assert launched[0].quit_called
+
+
+def test_replaces_browsers_that_fail_to_reset(pool: BrowserPool[FakeDriver],
+                                              launched: List[FakeDriver]) -> None:
+    with pool.acquire() as driver:
+        driver.broken = True
+
+    with pool.acquire() as driver:
+        pass
+
+    assert driver is launched[1]
+    assert launched[0].quit_called
+
+
+def test_reuses_browsers_after_other_errors(pool: BrowserPool[FakeDriver],
+                                            launched: List[FakeDriver]) -> None:
+    with pytest.raises(ValueError):
+        with pool.acquire():
+            raise ValueError('Page did not load properly')
+
+    with pool.acquire():
+        pass
+
+    assert len(launched) == 1
+
+
+def test_limits_number_of_browsers(pool: BrowserPool[FakeDriver],
+                                   launched: List[FakeDriver]) -> None:
+    in_use: List[FakeDriver] = []
+
+    def use_browser() -> None:
+        with pool.acquire() as driver:
+            in_use.append(driver)
+            assert len(set(in_use)) <= 2
+            in_use.remove(driver)
+
+    threads = [Thread(target=use_browser) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(launched) <= 2
+
+
+def test_close_quits_idle_browsers(pool: BrowserPool[FakeDriver],
+                                   launched: List[FakeDriver]) -> None:
+    with pool.acquire():
+        pass
+
+    pool.close()
+    assert launched[0].quit_called